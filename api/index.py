@@ -1,12 +1,90 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Body, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-import requests
-from bs4 import BeautifulSoup
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+import httpx
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
+import soupsieve
+import os
 import re
+import sys
 import base64
-from urllib.parse import urljoin
+import contextvars
+import functools
+import bisect
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict, deque
+from abc import abstractmethod
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit
 
-app = FastAPI(title="Anichin Moe Scraper API (Paged)")
+# opsional: tanpa orjson pakai json stdlib, tanpa brotli cuma gzip
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, warm_from_disk)
+    if parse_pool.enabled:
+        await loop.run_in_executor(None, parse_pool.warm)
+    background = []
+    if SCHEDULE_REFRESH > 0:
+        background.append(asyncio.create_task(schedule_loop()))
+    if CATALOG_ENABLED:
+        await loop.run_in_executor(None, catalog.load)
+        background.append(asyncio.create_task(catalog_loop()))
+    yield
+    for task in background:
+        task.cancel()
+    prefetcher.cancel()
+    await close_clients()
+    parse_pool.shutdown()
+
+
+def json_default(obj):
+    """Record ringkas (CompactRecord) di dalam payload di-encode sebagai dict aslinya."""
+    if isinstance(obj, CompactRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj) -> bytes:
+    with timed("serialize"):
+        if orjson is not None:
+            return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=json_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse pakai orjson; content bytes dianggap JSON yang sudah jadi (lihat encoded_json)."""
+
+    def render(self, content) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return json_dumps(content)
+
+
+app = FastAPI(title="Anichin Moe Scraper API (Paged)", lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # --- CORS ---
 app.add_middleware(
@@ -17,8 +95,194 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- ETag / 304 ---
+class ETagMiddleware:
+    """
+    ETag kuat (hash body) untuk respons GET 200 yang body-nya satu potong (JSON biasa),
+    dan 304 tanpa body kalau If-None-Match cocok. Respons streaming (NDJSON) dilewati.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        if_none_match = next((v for k, v in scope["headers"] if k == b"if-none-match"), b"")
+        start = None
+
+        async def send_with_etag(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                return await send(message)
+            head, start = start, None
+            headers = head.get("headers", [])
+            if head["status"] != 200 or message.get("more_body") or any(k == b"etag" for k, _ in headers):
+                await send(head)
+                return await send(message)
+            etag = b'"' + hashlib.blake2b(message.get("body", b""), digest_size=16).hexdigest().encode() + b'"'
+            if etag_matches(if_none_match, etag):
+                keep = [(k, v) for k, v in headers if k not in (b"content-length", b"content-type")]
+                await send({"type": "http.response.start", "status": 304, "headers": keep + [(b"etag", etag)]})
+                return await send({"type": "http.response.body", "body": b""})
+            await send({**head, "headers": list(headers) + [(b"etag", etag)]})
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    # If-None-Match pakai perbandingan weak (RFC 9110): W/ diabaikan
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == b"*":
+        return True
+    return any(tag.strip().removeprefix(b"W/") == etag for tag in if_none_match.split(b","))
+
+
+# --- gzip / brotli ---
+class CompressionMiddleware:
+    """
+    Kompres body satu potong >= COMPRESS_MIN_BYTES sesuai Accept-Encoding (br > gzip).
+    Hasilnya di-cache per (hash body, encoding), jadi respons dari cache tidak dikompres ulang.
+    Dipasang di dalam ETagMiddleware: ETag dihitung dari body terkompres (beda per encoding).
+    """
+
+    TYPES = (b"application/json", b"text/")
+
+    def __init__(self, app):
+        self.app = app
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        with self.lock:
+            out = self.cache.get(key)
+            if out is not None:
+                self.cache.move_to_end(key)
+                return out
+        if encoding == "br":
+            out = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            out = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        with self.lock:
+            self.cache[key] = out
+            while len(self.cache) > COMPRESS_CACHE_MAX:
+                self.cache.popitem(last=False)
+        return out
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = pick_encoding(next((v for k, v in scope["headers"] if k == b"accept-encoding"), b""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                return await send(message)
+            head, start = start, None
+            headers = head.get("headers", [])
+            body = message.get("body", b"")
+            ctype = next((v for k, v in headers if k == b"content-type"), b"")
+            if (
+                message.get("more_body")
+                or len(body) < COMPRESS_MIN_BYTES
+                or not ctype.startswith(self.TYPES)
+                or any(k == b"content-encoding" for k, _ in headers)
+            ):
+                await send(head)
+                return await send(message)
+            with timed("compress"):
+                body = self.compress(body, encoding)
+            headers = [(k, v) for k, v in headers if k != b"content-length"] + [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send({**head, "headers": headers})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+def pick_encoding(accept: bytes):
+    """br kalau diterima & modul brotli ada, lalu gzip; q=0 berarti ditolak."""
+    accepted = set()
+    for part in accept.decode("latin-1").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+# --- Server-Timing / metrics ---
+class TimingMiddleware:
+    """
+    Tiap request dapat RequestTimings (contextvar) yang diisi timed(): cache, fetch, soup,
+    parse-<kind>, downloads, serialize, compress. Hasilnya jadi header Server-Timing dan
+    masuk ke metrics (/metrics). Dipasang paling luar supaya kompresi ikut terhitung.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (SERVER_TIMING or METRICS_ENABLED):
+            return await self.app(scope, receive, send)
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    value = timings.header(time.perf_counter() - start).encode("latin-1")
+                    message = {**message, "headers": list(message.get("headers", [])) + [(b"server-timing", value)]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _timings.reset(token)
+            if METRICS_ENABLED:
+                metrics.observe_request(route_label(scope), status, time.perf_counter() - start, timings)
+
+
+def route_label(scope) -> str:
+    # template route ("/api/genres/{slug}"), bukan path asli, supaya label tidak meledak
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ETagMiddleware)
+app.add_middleware(TimingMiddleware)
+
 # --- CONFIG ---
-BASE_URL = "https://anichin.moe"
+BASE_URL = os.environ.get("ANICHIN_BASE_URL", "https://anichin.moe").rstrip("/")
 CREATOR = "Sanka Vollerei"
 
 HEADERS = {
@@ -32,17 +296,1001 @@ HEADERS = {
     "Accept-Language": "id,en-US;q=0.9,en;q=0.8",
 }
 
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def env_flag(name: str, default: bool) -> bool:
+    v = os.environ.get(name)
+    if v is None:
+        return default
+    return v.strip().lower() in ("1", "true", "yes", "on")
+
+
+# upstream connection pool (satu client dipakai ulang, keep-alive)
+POOL_SIZE = env_int("ANICHIN_POOL_SIZE", 256)
+POOL_PER_HOST = env_int("ANICHIN_POOL_PER_HOST", 128)
+KEEPALIVE_EXPIRY = env_float("ANICHIN_KEEPALIVE_EXPIRY", 30.0)
+CONNECT_TIMEOUT = env_float("ANICHIN_CONNECT_TIMEOUT", 5.0)
+READ_TIMEOUT = env_float("ANICHIN_READ_TIMEOUT", 20.0)
+USE_HTTP2 = env_flag("ANICHIN_HTTP2", True)
+
+# backend parser: "html.parser" (default), "lxml", "html5lib", "auto" (lxml kalau ada).
+# lxml baru jadi default setelah parity-nya terbukti di halaman asli hasil bench/record.py
+PARSER_BACKEND = os.environ.get("ANICHIN_PARSER", "html.parser").strip().lower()
+# list/search/schedule/genres cuma bangun subtree yang dipakai parser-nya
+PARTIAL_PARSE = env_flag("ANICHIN_PARTIAL_PARSE", True)
+
+# parsing HTML jalan di thread pool sendiri, bukan di event loop
+PARSE_WORKERS = env_int("ANICHIN_PARSE_WORKERS", min(8, (os.cpu_count() or 1) + 2))
+# opsional: parse (bangun soup + parser) di proses terpisah supaya semua core kepakai; 0 = mati.
+# antrian dibatasi, lewat dari itu parse jalan di thread pool biasa; worker diganti tiap N task
+PARSE_PROCESSES = env_int("ANICHIN_PARSE_PROCESSES", 0)
+PARSE_PROCESS_QUEUE = env_int("ANICHIN_PARSE_PROCESS_QUEUE", 4 * max(PARSE_PROCESSES, 1))
+PARSE_MAX_TASKS_PER_CHILD = env_int("ANICHIN_PARSE_MAX_TASKS_PER_CHILD", 500)
+
+# response cache: TTL per kelas, lalu masih boleh dipakai (stale) selama SWR detik
+CACHE_MAX_ENTRIES = env_int("ANICHIN_CACHE_MAX_ENTRIES", 2048)
+CACHE_TTL_CLASSES = {
+    "long": env_int("ANICHIN_CACHE_TTL_LONG", 3600),
+    "medium": env_int("ANICHIN_CACHE_TTL_MEDIUM", 600),
+    "short": env_int("ANICHIN_CACHE_TTL_SHORT", 60),
+}
+CACHE_SWR = env_int("ANICHIN_CACHE_SWR", 300)
+# disk cache (SQLite WAL, dipakai bareng semua worker, tetap ada setelah cold start)
+# ANICHIN_DISK_CACHE="" untuk mematikan
+DISK_CACHE_PATH = os.environ.get("ANICHIN_DISK_CACHE", os.path.join(tempfile.gettempdir(), "anichin-cache.sqlite3"))
+DISK_CACHE_MAX_MB = env_int("ANICHIN_DISK_CACHE_MAX_MB", 256)
+DISK_CACHE_WARM = env_int("ANICHIN_DISK_CACHE_WARM", 512)
+# HTML yang sama (setelah buang nonce/iklan/script) tidak di-parse ulang setelah TTL habis
+PARSE_MEMO = env_flag("ANICHIN_PARSE_MEMO", True)
+PARSE_MEMO_MAX = env_int("ANICHIN_PARSE_MEMO_MAX", 4096)
+# upstream error/sibuk: hasil parse terakhir masih boleh dipakai kalau umurnya di bawah ini (detik)
+LAST_KNOWN_MAX_AGE = env_int("ANICHIN_LAST_KNOWN_MAX_AGE", 6 * 3600)
+
+# katalog lokal: sync order=update di background, list/ongoing/completed/rating/genre dilayani lokal
+CATALOG_ENABLED = env_flag("ANICHIN_CATALOG", False)
+CATALOG_PATH = os.environ.get("ANICHIN_CATALOG_PATH", DISK_CACHE_PATH) or os.path.join(
+    tempfile.gettempdir(), "anichin-cache.sqlite3"
+)
+CATALOG_SYNC_INTERVAL = env_int("ANICHIN_CATALOG_SYNC_INTERVAL", 300)
+CATALOG_SYNC_MAX_PAGES = env_int("ANICHIN_CATALOG_SYNC_MAX_PAGES", 500)
+CATALOG_DETAIL_BATCH = env_int("ANICHIN_CATALOG_DETAIL_BATCH", 50)
+CATALOG_DETAIL_MAX_AGE = env_int("ANICHIN_CATALOG_DETAIL_MAX_AGE", 86400)
+CATALOG_MIN_COVERAGE = env_float("ANICHIN_CATALOG_MIN_COVERAGE", 0.95)
+CATALOG_GENRES_REFRESH = env_int("ANICHIN_CATALOG_GENRES_REFRESH", 6 * 3600)
+# /api/search dari index lokal (butuh katalog siap); upstream ?s= tetap jadi fallback
+SEARCH_LOCAL = env_flag("ANICHIN_SEARCH_LOCAL", True)
+SEARCH_LIMIT = env_int("ANICHIN_SEARCH_LIMIT", 24)
+
+# jadwal di-refresh di background tiap N detik (0 = tanpa loop, diisi dari cache saat request)
+SCHEDULE_REFRESH = env_int("ANICHIN_SCHEDULE_REFRESH", 900)
+SCHEDULE_TZ_OFFSET = env_float("ANICHIN_SCHEDULE_TZ_OFFSET", 7)  # jam situs (WIB) buat day=today / from=now
+
+# respons: kompres kalau body >= N byte; bytes JSON hasil encode di-cache per objek data
+COMPRESS_MIN_BYTES = env_int("ANICHIN_COMPRESS_MIN_BYTES", 1024)
+GZIP_LEVEL = env_int("ANICHIN_GZIP_LEVEL", 6)
+BROTLI_QUALITY = env_int("ANICHIN_BROTLI_QUALITY", 5)
+COMPRESS_CACHE_MAX = env_int("ANICHIN_COMPRESS_CACHE_MAX", 512)
+ENCODED_CACHE_MAX = env_int("ANICHIN_ENCODED_CACHE_MAX", CACHE_MAX_ENTRIES)
+
+# instrumentasi: header Server-Timing per request dan /metrics (format Prometheus)
+SERVER_TIMING = env_flag("ANICHIN_SERVER_TIMING", True)
+METRICS_ENABLED = env_flag("ANICHIN_METRICS", True)
+
+# upstream governor: batas request in-flight adaptif (AIMD dari latency), circuit breaker,
+# dan hedged request (opsional: kirim duplikat kalau fetch sudah lewat p95).
+# Governor opt-in: upstream biasa 1-2 detik/halaman, jadi target & antrean harus jauh di atas itu.
+GOVERNOR = env_flag("ANICHIN_GOVERNOR", False)
+GOVERNOR_MAX = env_int("ANICHIN_GOVERNOR_MAX", POOL_PER_HOST)
+GOVERNOR_INITIAL = env_int("ANICHIN_GOVERNOR_INITIAL", GOVERNOR_MAX)
+GOVERNOR_MIN = env_int("ANICHIN_GOVERNOR_MIN", 2)
+GOVERNOR_TARGET = env_float("ANICHIN_GOVERNOR_TARGET", 5.0)  # detik; lebih lambat dari ini = limit turun
+GOVERNOR_BACKOFF = env_float("ANICHIN_GOVERNOR_BACKOFF", 0.7)
+GOVERNOR_QUEUE_TIMEOUT = env_float("ANICHIN_GOVERNOR_QUEUE_TIMEOUT", 15.0)
+BREAKER = env_flag("ANICHIN_BREAKER", True)
+BREAKER_WINDOW = env_int("ANICHIN_BREAKER_WINDOW", 20)
+BREAKER_MIN_CALLS = env_int("ANICHIN_BREAKER_MIN_CALLS", 10)
+BREAKER_THRESHOLD = env_float("ANICHIN_BREAKER_THRESHOLD", 0.5)
+BREAKER_COOLDOWN = env_float("ANICHIN_BREAKER_COOLDOWN", 15.0)
+HEDGE = env_flag("ANICHIN_HEDGE", False)
+HEDGE_MIN_DELAY = env_float("ANICHIN_HEDGE_MIN_DELAY", 0.05)
+
+# prefetch (opsional): setelah /api/episode ambil episode berikutnya, setelah /api/update
+# halaman 1 ambil N series teratas. Budget fetch per menit + paralel, dan cuma pakai
+# sisa slot governor (in-flight < limit * headroom)
+PREFETCH = env_flag("ANICHIN_PREFETCH", False)
+PREFETCH_SERIES = env_int("ANICHIN_PREFETCH_SERIES", 5)
+PREFETCH_BUDGET = env_int("ANICHIN_PREFETCH_BUDGET", 120)
+PREFETCH_CONCURRENCY = env_int("ANICHIN_PREFETCH_CONCURRENCY", 2)
+PREFETCH_QUEUE = env_int("ANICHIN_PREFETCH_QUEUE", 32)
+PREFETCH_HEADROOM = env_float("ANICHIN_PREFETCH_HEADROOM", 0.5)
+
+# range mode (?pages=1-20): berapa halaman diambil barengan, dan batas maksimal
+RANGE_FANOUT = env_int("ANICHIN_RANGE_FANOUT", 4)
+RANGE_MAX_PAGES = env_int("ANICHIN_RANGE_MAX_PAGES", 50)
+
+# batch detail: item maksimal per request dan fetch paralel per batch
+BATCH_MAX_ITEMS = env_int("ANICHIN_BATCH_MAX_ITEMS", 100)
+BATCH_CONCURRENCY = env_int("ANICHIN_BATCH_CONCURRENCY", 8)
+
+KIND_TTL_CLASS = {
+    "schedule": "long",
+    "genres": "long",
+    "list": "short",
+    "search": "short",
+    "series": "medium",
+    "episode": "medium",
+    "detail": "medium",
+}
+
+GENRES_PARAMS = {"status": "", "order": ""}
+
+# --------------------------
+# TIMING / METRICS
+# --------------------------
+class RequestTimings:
+    """Durasi per tahap + hasil lookup cache selama satu request (dibagi ke thread parse)."""
+
+    __slots__ = ("stages", "cache")
+
+    def __init__(self):
+        self.stages = []  # (nama, detik); list.append aman dari thread lain
+        self.cache = []  # "hit" / "stale" / "disk" / "disk_stale" / "miss"
+
+    def totals(self) -> dict:
+        out = {}
+        for name, dur in self.stages:
+            total, n = out.get(name, (0.0, 0))
+            out[name] = (total + dur, n + 1)
+        return out
+
+    def header(self, total: float) -> str:
+        parts = []
+        for name, (dur, n) in self.totals().items():
+            part = f"{name};dur={dur * 1000:.1f}"
+            parts.append(part + f';desc="x{n}"' if n > 1 else part)
+        parts.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_timings = contextvars.ContextVar("anichin_timings", default=None)
+
+
+class timed:
+    """with timed("fetch"): ... -> masuk ke RequestTimings request yang sedang jalan (kalau ada)."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        timings = _timings.get()
+        if timings is not None:
+            timings.stages.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+def note_cache(result: str):
+    timings = _timings.get()
+    if timings is not None:
+        timings.cache.append(result)
+
+
+class Histogram:
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0)
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(self.BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.BUCKETS, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str):
+        acc = 0
+        for le, n in zip(self.BUCKETS, self.counts):
+            acc += n
+            yield f'{name}_bucket{{{labels},le="{le}"}} {acc}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.sum:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+def prom_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Agregat per proses: latency per route & tahap, status upstream, cache hit per route."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}  # (route, status) -> n
+        self.latency = {}  # route -> Histogram
+        self.stages = {}  # (route, stage) -> Histogram
+        self.cache = {}  # (route, result) -> n
+        self.upstream = {}  # status code -> n
+        self.upstream_errors = {}  # nama exception -> n
+        self.upstream_latency = Histogram()
+
+    def observe_request(self, route: str, status: int, seconds: float, timings: RequestTimings):
+        totals = timings.totals()
+        with self.lock:
+            self.requests[(route, status)] = self.requests.get((route, status), 0) + 1
+            hist = self.latency.get(route) or self.latency.setdefault(route, Histogram())
+            hist.observe(seconds)
+            for stage, (dur, _) in totals.items():
+                hist = self.stages.get((route, stage)) or self.stages.setdefault((route, stage), Histogram())
+                hist.observe(dur)
+            for result in timings.cache:
+                self.cache[(route, result)] = self.cache.get((route, result), 0) + 1
+
+    def observe_upstream(self, status: int | None, seconds: float, error: Exception | None = None):
+        with self.lock:
+            if status is not None:
+                self.upstream[status] = self.upstream.get(status, 0) + 1
+                self.upstream_latency.observe(seconds)
+            if error is not None:
+                name = type(error).__name__
+                self.upstream_errors[name] = self.upstream_errors.get(name, 0) + 1
+
+    def render(self) -> str:
+        out = []
+        with self.lock:
+            out += [
+                "# HELP anichin_requests_total Request yang sudah dijawab, per route dan status.",
+                "# TYPE anichin_requests_total counter",
+            ]
+            for (route, status), n in sorted(self.requests.items()):
+                out.append(f'anichin_requests_total{{route="{prom_label(route)}",status="{status}"}} {n}')
+
+            out += [
+                "# HELP anichin_request_duration_seconds Latency request end-to-end per route.",
+                "# TYPE anichin_request_duration_seconds histogram",
+            ]
+            for route, hist in sorted(self.latency.items()):
+                out += hist.lines("anichin_request_duration_seconds", f'route="{prom_label(route)}"')
+
+            out += [
+                "# HELP anichin_stage_duration_seconds Waktu per tahap (total per request) per route.",
+                "# TYPE anichin_stage_duration_seconds histogram",
+            ]
+            for (route, stage), hist in sorted(self.stages.items()):
+                labels = f'route="{prom_label(route)}",stage="{prom_label(stage)}"'
+                out += hist.lines("anichin_stage_duration_seconds", labels)
+
+            out += [
+                "# HELP anichin_cache_lookups_total Lookup response cache per route dan hasil.",
+                "# TYPE anichin_cache_lookups_total counter",
+            ]
+            for (route, result), n in sorted(self.cache.items()):
+                out.append(f'anichin_cache_lookups_total{{route="{prom_label(route)}",result="{result}"}} {n}')
+
+            out += [
+                "# HELP anichin_cache_hit_ratio Porsi lookup yang tidak perlu ke upstream, per route.",
+                "# TYPE anichin_cache_hit_ratio gauge",
+            ]
+            by_route = {}
+            for (route, result), n in self.cache.items():
+                hits, total = by_route.get(route, (0, 0))
+                by_route[route] = (hits + (n if result != "miss" else 0), total + n)
+            for route, (hits, total) in sorted(by_route.items()):
+                out.append(f'anichin_cache_hit_ratio{{route="{prom_label(route)}"}} {hits / total:.4f}')
+
+            out += [
+                "# HELP anichin_upstream_responses_total Respons upstream per status HTTP.",
+                "# TYPE anichin_upstream_responses_total counter",
+            ]
+            for status, n in sorted(self.upstream.items()):
+                out.append(f'anichin_upstream_responses_total{{status="{status}"}} {n}')
+
+            out += [
+                "# HELP anichin_upstream_errors_total Fetch upstream yang gagal, per jenis error.",
+                "# TYPE anichin_upstream_errors_total counter",
+            ]
+            for name, n in sorted(self.upstream_errors.items()):
+                out.append(f'anichin_upstream_errors_total{{error="{prom_label(name)}"}} {n}')
+
+            out += [
+                "# HELP anichin_upstream_duration_seconds Latency fetch upstream (yang dapat respons).",
+                "# TYPE anichin_upstream_duration_seconds histogram",
+            ]
+            out += self.upstream_latency.lines("anichin_upstream_duration_seconds", 'host="upstream"')
+
+        gov, brk = governor.stats(), breaker.stats()
+        state = {"closed": 0, "half_open": 0.5, "open": 1}[brk["state"]]
+        out += [
+            "# HELP anichin_upstream_limit Batas request upstream in-flight saat ini (AIMD).",
+            "# TYPE anichin_upstream_limit gauge",
+            f"anichin_upstream_limit {gov['limit']}",
+            "# HELP anichin_upstream_in_flight Request upstream yang sedang jalan.",
+            "# TYPE anichin_upstream_in_flight gauge",
+            f"anichin_upstream_in_flight {gov['in_flight']}",
+            "# HELP anichin_upstream_shed_total Fetch yang ditolak governor (tidak dapat slot).",
+            "# TYPE anichin_upstream_shed_total counter",
+            f"anichin_upstream_shed_total {gov['shed']}",
+            "# HELP anichin_upstream_hedges_total Hedged request yang dikirim / yang menang.",
+            "# TYPE anichin_upstream_hedges_total counter",
+            f'anichin_upstream_hedges_total{{result="sent"}} {gov["hedges"]}',
+            f'anichin_upstream_hedges_total{{result="won"}} {gov["hedge_wins"]}',
+            "# HELP anichin_breaker_state Circuit breaker upstream: 0 closed, 0.5 half-open, 1 open.",
+            "# TYPE anichin_breaker_state gauge",
+            f"anichin_breaker_state {state}",
+            "# HELP anichin_breaker_rejected_total Fetch yang tidak dikirim karena circuit open.",
+            "# TYPE anichin_breaker_rejected_total counter",
+            f"anichin_breaker_rejected_total {brk['rejected']}",
+        ]
+        if prefetcher.enabled:
+            pf = prefetcher.stats()
+            out += [
+                "# HELP anichin_prefetch_total Prefetch per hasil (done/failed) dan yang dilewati per alasan.",
+                "# TYPE anichin_prefetch_total counter",
+                f'anichin_prefetch_total{{result="done"}} {pf["done"]}',
+                f'anichin_prefetch_total{{result="failed"}} {pf["failed"]}',
+            ]
+            out += [f'anichin_prefetch_total{{result="skipped_{k}"}} {n}' for k, n in sorted(pf["skipped"].items())]
+            out += [
+                "# HELP anichin_prefetch_hits_total Request user ke halaman yang sudah di-prefetch, per jenis.",
+                "# TYPE anichin_prefetch_hits_total counter",
+            ]
+            out += [f'anichin_prefetch_hits_total{{kind="{k}"}} {n}' for k, n in sorted(pf["hits"].items())]
+            out += [
+                "# HELP anichin_prefetch_hit_ratio Porsi prefetch yang kemudian diminta user.",
+                "# TYPE anichin_prefetch_hit_ratio gauge",
+                f"anichin_prefetch_hit_ratio {pf['hit_rate']}",
+            ]
+        return "\n".join(out) + "\n"
+
+
+metrics = Metrics()
+
+
+# --------------------------
+# UPSTREAM GOVERNOR
+# --------------------------
+class UpstreamGovernor:
+    """
+    Batas request upstream yang sedang jalan, diatur AIMD dari latency yang teramati: fetch
+    sukses di bawah target -> limit += 1/limit (kira-kira +1 per putaran), lambat/gagal ->
+    limit *= GOVERNOR_BACKOFF (paling sering sekali per target detik, supaya satu gelombang
+    lambat tidak menjatuhkan limit sampai minimum). Yang tidak dapat slot dalam
+    GOVERNOR_QUEUE_TIMEOUT ditolak (UPSTREAM_BUSY): caller pakai hasil lama, kalau tidak ada 503.
+    """
+
+    def __init__(self, initial: int = GOVERNOR_INITIAL, lo: int = GOVERNOR_MIN, hi: int = GOVERNOR_MAX,
+                 target: float = GOVERNOR_TARGET, queue_timeout: float = GOVERNOR_QUEUE_TIMEOUT):
+        self.enabled = GOVERNOR
+        self.limit = float(max(lo, min(initial, hi)))
+        self.min = lo
+        self.max = hi
+        self.target = target
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._waiters = deque()  # (loop, future) caller async yang menunggu slot
+        self._latencies = deque(maxlen=256)
+        self._p95 = None
+        self._backoff_until = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.shed = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _take(self) -> bool:
+        if not self.enabled or self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return True
+        return False
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            return self._take()
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        with self._cond:
+            if self._cond.wait_for(self._take, self.queue_timeout if timeout is None else timeout):
+                return True
+            self.shed += 1
+            return False
+
+    async def acquire_async(self, timeout: float | None = None) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.queue_timeout if timeout is None else timeout)
+        while True:
+            with self._lock:
+                if self._take():
+                    return True
+                fut = loop.create_future()
+                waiter = (loop, fut)
+                self._waiters.append(waiter)
+            try:
+                # dibangunkan tiap ada slot lepas, lalu coba ambil lagi
+                await asyncio.wait_for(fut, max(deadline - loop.time(), 0))
+            except asyncio.TimeoutError:
+                with self._lock:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        pass
+                    if self._take():
+                        return True
+                    self.shed += 1
+                    return False
+
+    def release(self, seconds: float | None = None, ok: bool = True):
+        """seconds=None: slot hedge, lepas tanpa ikut menyetel limit."""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if seconds is not None:
+                if ok:
+                    self._latencies.append(seconds)
+                    self._p95 = None
+                if ok and seconds <= self.target:
+                    if self.limit < self.max:
+                        self.limit = min(self.max, self.limit + 1 / self.limit)
+                        self.increases += 1
+                elif now >= self._backoff_until:
+                    self.limit = max(self.min, self.limit * GOVERNOR_BACKOFF)
+                    self._backoff_until = now + self.target
+                    self.decreases += 1
+            free = max(int(self.limit) - self.in_flight, 1)
+            self._cond.notify(free)
+            while free and self._waiters:
+                loop, fut = self._waiters.popleft()
+                if fut.done():
+                    continue
+                loop.call_soon_threadsafe(_wake, fut)
+                free -= 1
+
+    def p95(self):
+        with self._lock:
+            if self._p95 is None and len(self._latencies) >= 20:
+                xs = sorted(self._latencies)
+                self._p95 = xs[int(len(xs) * 0.95)]
+            return self._p95
+
+    def hedge_delay(self):
+        """Kapan duplikat dikirim (p95 fetch sukses terakhir), None = tidak hedge."""
+        if not HEDGE:
+            return None
+        p95 = self.p95()
+        return None if p95 is None else max(HEDGE_MIN_DELAY, p95)
+
+    def stats(self) -> dict:
+        p95 = self.p95()
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "waiting": len(self._waiters),
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "shed": self.shed,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+            }
+
+
+def _wake(fut):
+    if not fut.done():
+        fut.set_result(None)
+
+
+class CircuitBreaker:
+    """
+    closed -> open kalau >= BREAKER_THRESHOLD dari BREAKER_WINDOW fetch terakhir gagal
+    (5xx/429/timeout/koneksi, minimal BREAKER_MIN_CALLS). Selama open tidak ada request ke
+    upstream; semua dijawab dari cache/stale. Setelah BREAKER_COOLDOWN jadi half-open: satu
+    probe dilewatkan, sukses -> closed, gagal -> open lagi.
+    """
+
+    def __init__(self, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 threshold: float = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.enabled = BREAKER
+        self.min_calls = min_calls
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self._outcomes = deque(maxlen=window)
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+        self.opens = 0
+        self.rejected = 0
+        self.fallbacks = 0  # upstream gagal/ditolak, dijawab dari hasil parse terakhir
+
+    def allow(self) -> bool:
+        if not self.enabled:
+            return True
+        with self._lock:
+            if self.state == "closed":
+                return True
+            now = time.monotonic()
+            if now < self._probe_at:
+                self.rejected += 1
+                return False
+            self.state = "half_open"
+            self._probe_at = now + self.cooldown
+            return True
+
+    def record(self, ok: bool):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state == "open":
+                return  # respons telat dari sebelum open, abaikan
+            if self.state == "half_open":
+                if ok:
+                    self.state = "closed"
+                    self._outcomes.clear()
+                    print("[breaker] upstream pulih, circuit closed")
+                else:
+                    self._open()
+                return
+            self._outcomes.append(ok)
+            n = len(self._outcomes)
+            if n >= self.min_calls and self._outcomes.count(False) / n >= self.threshold:
+                self._open()
+
+    def _open(self):
+        self.state = "open"
+        self._probe_at = time.monotonic() + self.cooldown
+        self._outcomes.clear()
+        self.opens += 1
+        print(f"[breaker] upstream error spike, circuit open {self.cooldown:g}s")
+
+    def retry_after(self) -> int:
+        """Detik sampai probe berikutnya selama open (untuk header Retry-After), minimal 1."""
+        with self._lock:
+            if self.state == "closed":
+                return 1
+            return max(1, int(self._probe_at - time.monotonic()) + 1)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "state": self.state,
+                "opens": self.opens,
+                "rejected": self.rejected,
+                "fallbacks": self.fallbacks,
+            }
+
+
+governor = UpstreamGovernor()
+breaker = CircuitBreaker()
+
+
+class UpstreamBusy(Exception):
+    """Fetch ditolak governor/circuit breaker dan belum ada hasil lama: 503, bukan 404."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Upstream sedang sibuk, coba lagi nanti")
+        self.retry_after = retry_after
+
+
+@app.exception_handler(UpstreamBusy)
+async def upstream_busy_handler(request, exc: UpstreamBusy):
+    return FastJSONResponse(
+        {"detail": str(exc)}, status_code=503, headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+def upstream_ok(req) -> bool:
+    # 404 dsb. bukan tanda upstream sakit; 5xx, 429 dan exception iya
+    return req is not None and req.status_code < 500 and req.status_code != 429
+
+
+def is_upstream(url: str) -> bool:
+    """url ada di host BASE_URL (cuma itu yang dihitung breaker / boleh di-fetch dari ?url=)."""
+    return urlsplit(url).netloc == urlsplit(BASE_URL).netloc
+
+
 # --------------------------
 # HELPERS
 # --------------------------
-def get_soup(url: str, params=None):
+_client = None
+_client_lock = threading.Lock()
+_host_slots = {}
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def upstream_limits():
+    return httpx.Limits(
+        max_connections=POOL_SIZE,
+        max_keepalive_connections=POOL_SIZE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def upstream_timeout():
+    return httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+
+
+def http_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    headers=HEADERS,
+                    limits=upstream_limits(),
+                    timeout=upstream_timeout(),
+                    http2=USE_HTTP2 and http2_available(),
+                    follow_redirects=True,
+                )
+    return _client
+
+
+def host_slot(url: str) -> threading.BoundedSemaphore:
+    # batas koneksi per host (pool-nya sendiri dibagi semua host)
+    host = urlsplit(url).netloc
+    slot = _host_slots.get(host)
+    if slot is None:
+        with _client_lock:
+            slot = _host_slots.setdefault(host, threading.BoundedSemaphore(POOL_PER_HOST))
+    return slot
+
+
+def fetch_html(url: str, params=None, key: str | None = None):
+    """
+    HTML halaman; None kalau upstream menjawab 4xx (404 dsb.), UPSTREAM_FAILED kalau error
+    koneksi/timeout/5xx/429, UPSTREAM_BUSY kalau ditolak governor/circuit breaker.
+    Dengan `key` (cache key), validator upstream yang pernah disimpan ikut dikirim dan 304
+    dibalikin sebagai NOT_MODIFIED.
+    """
+    if not breaker.allow() or not governor.acquire():
+        return UPSTREAM_BUSY
+    start = time.perf_counter()
+    req = None
     try:
-        req = requests.get(url, headers=HEADERS, params=params, timeout=25)
+        with host_slot(url), timed("fetch"):
+            req = http_client().get(url, params=params, headers=upstream_validators.headers(key))
+        metrics.observe_upstream(req.status_code, time.perf_counter() - start)
+        if req.status_code == 304 and key:
+            return NOT_MODIFIED
         req.raise_for_status()
-        return BeautifulSoup(req.text, "html.parser")
+        upstream_validators.remember(key, req.headers)
+        return req.text
     except Exception as e:
-        print(f"[get_soup] Error {url}: {e}")
-        return None
+        if req is None:
+            metrics.observe_upstream(None, 0, e)
+        print(f"[fetch_html] Error {url}: {e}")
+        return None if upstream_ok(req) else UPSTREAM_FAILED
+    finally:
+        governor.release(time.perf_counter() - start, upstream_ok(req))
+        if is_upstream(url):
+            breaker.record(upstream_ok(req))
+
+
+# backend -> modul yang harus ada
+PARSER_BACKENDS = {
+    "lxml": "lxml",
+    "html.parser": None,
+    "html5lib": "html5lib",
+}
+_parser_features = {}
+
+
+def backend_available(name: str) -> bool:
+    if name not in PARSER_BACKENDS:
+        return False
+    mod = PARSER_BACKENDS[name]
+    if mod is None:
+        return True
+    try:
+        __import__(mod)
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_parser(name: str | None = None) -> str:
+    name = (name or PARSER_BACKEND).strip().lower()
+    cached = _parser_features.get(name)
+    if cached:
+        return cached
+    if name == "auto":
+        feature = "lxml" if backend_available("lxml") else "html.parser"
+    elif backend_available(name):
+        feature = name
+    else:
+        print(f"[resolve_parser] backend {name!r} tidak tersedia, pakai html.parser")
+        feature = "html.parser"
+    _parser_features[name] = feature
+    return feature
+
+
+# kind -> region yang benar-benar dibaca parser (sisanya: sidebar, komentar, script dibuang)
+def class_re(name: str):
+    # pas parsing, class masih string utuh ("bixbox schedulepage ..."), bukan list
+    return re.compile(rf"(?:^|\s){re.escape(name)}(?:\s|$)")
+
+
+PAGE_STRAINERS = {
+    "list": SoupStrainer("div", class_=class_re("listupd")),
+    "search": SoupStrainer("div", class_=class_re("listupd")),
+    "schedule": SoupStrainer("div", class_=class_re("bixbox")),
+    "genres": SoupStrainer(["input", "label", "select"]),
+}
+
+
+def make_soup(html: str, backend: str | None = None, kind: str | None = None):
+    feature = resolve_parser(backend)
+    strainer = PAGE_STRAINERS.get(kind) if PARTIAL_PARSE else None
+    # html5lib tidak support parse_only
+    if strainer is not None and feature != "html5lib":
+        return BeautifulSoup(html, feature, parse_only=strainer)
+    return BeautifulSoup(html, feature)
+
+
+# --- async upstream (satu AsyncClient per event loop) ---
+_async_client = None
+_async_loop = None
+_async_host_slots = {}
+
+
+def async_http_client() -> httpx.AsyncClient:
+    global _async_client, _async_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            headers=HEADERS,
+            limits=upstream_limits(),
+            timeout=upstream_timeout(),
+            http2=USE_HTTP2 and http2_available(),
+            follow_redirects=True,
+        )
+        _async_loop = loop
+        _async_host_slots.clear()
+    return _async_client
+
+
+def async_host_slot(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    slot = _async_host_slots.get(host)
+    if slot is None:
+        slot = _async_host_slots[host] = asyncio.Semaphore(POOL_PER_HOST)
+    return slot
+
+
+async def fetch_html_async(url: str, params=None, key: str | None = None):
+    if not breaker.allow() or not await governor.acquire_async():
+        return UPSTREAM_BUSY
+    start = time.perf_counter()
+    req = None
+    try:
+        client = async_http_client()
+        with timed("fetch"):
+            req = await hedged_get(client, url, params, upstream_validators.headers(key))
+        metrics.observe_upstream(req.status_code, time.perf_counter() - start)
+        if req.status_code == 304 and key:
+            return NOT_MODIFIED
+        req.raise_for_status()
+        upstream_validators.remember(key, req.headers)
+        return req.text
+    except Exception as e:
+        if req is None:
+            metrics.observe_upstream(None, 0, e)
+        print(f"[fetch_html_async] Error {url}: {e}")
+        return None if upstream_ok(req) else UPSTREAM_FAILED
+    finally:
+        governor.release(time.perf_counter() - start, upstream_ok(req))
+        if is_upstream(url):
+            breaker.record(upstream_ok(req))
+
+
+async def get_once(client, url: str, params, headers):
+    async with async_host_slot(url):
+        return await client.get(url, params=params, headers=headers)
+
+
+async def hedged_get(client, url: str, params, headers):
+    """
+    GET biasa; dengan ANICHIN_HEDGE, kalau belum selesai setelah p95 dikirim duplikat (selama
+    governor masih punya slot) dan yang pertama sukses dipakai, sisanya dibatalkan.
+    """
+    delay = governor.hedge_delay()
+    if delay is None:
+        return await get_once(client, url, params, headers)
+    first = asyncio.ensure_future(get_once(client, url, params, headers))
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done or not governor.try_acquire():
+        return await first
+    governor.hedges += 1
+    second = asyncio.ensure_future(get_once(client, url, params, headers))
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None and upstream_ok(task.result()):
+                    if task is second:
+                        governor.hedge_wins += 1
+                    return task.result()
+        return first.result()
+    finally:
+        for task in (first, second):
+            if not task.done():
+                task.cancel()
+        governor.release()
+
+
+async def close_clients():
+    global _client, _async_client, _async_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = _async_loop = None
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+_parse_executor = None
+
+
+def parse_executor() -> ThreadPoolExecutor:
+    global _parse_executor
+    if _parse_executor is None:
+        with _client_lock:
+            if _parse_executor is None:
+                _parse_executor = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+    return _parse_executor
+
+
+async def run_parse(fn, *args):
+    loop = asyncio.get_running_loop()
+    # context ikut ke thread parse, supaya timed() di parser masuk ke request yang sama
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(parse_executor(), functools.partial(ctx.run, fn, *args))
+
+
+class ParsePool:
+    """
+    HTML mentah masuk, dict hasil parse_page keluar, di proses worker (ProcessPoolExecutor,
+    spawn). Cache/memo/disk tetap di proses utama; worker cuma parse.
+
+    - antrian dibatasi max_pending: kalau penuh, parse jalan in-process (thread pool)
+    - worker diganti tiap max_tasks_per_child task (memori lxml/bs4 tidak numpuk)
+    - pool rusak (worker mati) -> dibuat ulang, task itu di-parse in-process
+
+    Worker di-spawn (bukan fork) dan meng-import modul ini lagi; script yang menjalankan app
+    sendiri harus punya guard `if __name__ == "__main__"`.
+    """
+
+    def __init__(self, workers: int = PARSE_PROCESSES, max_pending: int = PARSE_PROCESS_QUEUE,
+                 max_tasks_per_child: int = PARSE_MAX_TASKS_PER_CHILD):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.max_tasks_per_child = max_tasks_per_child
+        self.pending = 0
+        self._pool = None
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.fallback_full = 0
+        self.fallback_broken = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # import di sini: multiprocessing cuma dibayar kalau pool dipakai
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+
+                    # spawn eksplisit: tanpa max_tasks_per_child default-nya fork di Linux
+                    # (fork dari proses yang punya thread & event loop bisa deadlock)
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        max_tasks_per_child=self.max_tasks_per_child or None,
+                    )
+        return self._pool
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.fallback_full += 1
+                return False
+            self.pending += 1
+            self.submitted += 1
+            return True
+
+    def _done(self):
+        with self._lock:
+            self.pending -= 1
+
+    async def parse(self, kind: str, html: str, url: str, fields=None):
+        if not self._reserve():
+            return await run_parse(parse_page, kind, html, url, None, fields)
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            with timed(f"parse-{kind}-pool"):
+                return await asyncio.wrap_future(self.pool().submit(parse_page, kind, html, url, None, fields))
+        except BrokenProcessPool as e:
+            print(f"[parse_pool] Error worker mati, pool dibuat ulang: {e}")
+            self.fallback_broken += 1
+            self.reset()
+            return await run_parse(parse_page, kind, html, url, None, fields)
+        finally:
+            self._done()
+
+    def warm(self) -> int:
+        """Start semua worker sekarang (spawn + import modul), bukan di request pertama."""
+        if not self.enabled:
+            return 0
+        futures = [self.pool().submit(parse_page, "genres", "<html></html>", "") for _ in range(self.workers)]
+        for f in futures:
+            f.result()
+        return len(futures)
+
+    def reset(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "started": self._pool is not None,
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "max_tasks_per_child": self.max_tasks_per_child,
+                "submitted": self.submitted,
+                "fallback_full": self.fallback_full,
+                "fallback_broken": self.fallback_broken,
+            }
+
+
+parse_pool = ParsePool()
 
 
 def abs_url(u: str) -> str:
@@ -51,6 +1299,15 @@ def abs_url(u: str) -> str:
     return urljoin(BASE_URL, u)
 
 
+def page_url(url: str) -> str:
+    """url dari query (?url=, path atau absolut) -> url upstream; host selain BASE_URL ditolak 400."""
+    if not url.startswith("http"):
+        url = abs_url(url)
+    if not is_upstream(url):
+        raise HTTPException(status_code=400, detail="url harus halaman dari host anichin")
+    return url
+
+
 def extract_slug(url: str) -> str:
     try:
         url = (url or "").split("?")[0].strip("/")
@@ -59,8 +1316,12 @@ def extract_slug(url: str) -> str:
         return ""
 
 
+WS_RE = re.compile(r"\s+")
+IFRAME_SRC_RE = re.compile(r'src="([^"]+)"')
+
+
 def normalize_label(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+    return WS_RE.sub(" ", (s or "").strip())
 
 
 def safe_text(el) -> str:
@@ -91,7 +1352,7 @@ def decode_url(raw_url: str) -> str:
 
     try:
         decoded = base64.b64decode(raw_url).decode("utf-8", errors="ignore")
-        m = re.search(r'src="([^"]+)"', decoded)
+        m = IFRAME_SRC_RE.search(decoded)
         if m:
             return m.group(1)
         return decoded.strip()
@@ -99,17 +1360,636 @@ def decode_url(raw_url: str) -> str:
         return raw_url
 
 
-def build_list_params(
-    page: int,
-    status: str | None,
-    type_: str | None,
-    sub: str | None,
-    order: str | None,
-    genres: list[str] | None,
-):
-    """
-    Anichin list query contoh:
-    /anime/?page=2&order=update&status=&type=&sub=
+def cache_key(kind: str, url: str, params=None, fields=None) -> str:
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    for k, v in (params or {}).items():
+        if isinstance(v, (list, tuple)):
+            query += [(k, str(x)) for x in v]
+        else:
+            query.append((k, str(v)))
+    base = f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path or '/'}"
+    return fields_key(f"{kind} {base}?{urlencode(sorted(query))}", fields)
+
+
+def fields_key(key: str, fields=None) -> str:
+    # fields= tidak dikirim ke upstream, tapi hasil parse-nya beda
+    return f"{key} fields={','.join(sorted(fields))}" if fields else key
+
+
+class ResponseCache:
+    """LRU cache hasil parse, dengan TTL per kelas + jendela stale-while-revalidate."""
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        """Return (value, fresh) or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, stale_until = entry
+            if now < expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value, True
+            if now < stale_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                return value, False
+            del self._data[key]
+            self.misses += 1
+            return None
+
+    def is_fresh(self, key: str) -> bool:
+        """Ada dan belum lewat TTL; tanpa hitung hit/miss dan tanpa geser LRU."""
+        with self._lock:
+            entry = self._data.get(key)
+        return entry is not None and time.monotonic() < entry[1]
+
+    def set(self, key: str, value, ttl_class: str = "short", ttl: float | None = None):
+        if ttl is None:
+            ttl = CACHE_TTL_CLASSES.get(ttl_class, CACHE_TTL_CLASSES["short"])
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = (value, now + ttl, now + ttl + CACHE_SWR)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def set_like(self, key: str, base: str, value) -> bool:
+        """Simpan value dengan umur yang sama dengan entry base (turunannya tidak hidup lebih lama)."""
+        with self._lock:
+            entry = self._data.get(base)
+            if entry is None or self.max_entries <= 0:
+                return False
+            self._data[key] = (value, entry[1], entry[2])
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._data)
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+response_cache = ResponseCache()
+
+
+class EncodedCache:
+    """
+    Objek data dari cache (id) -> bytes JSON-nya. Objeknya ikut dipegang supaya id tidak
+    dipakai ulang selama entry masih ada; data cache tidak pernah dimutasi setelah disimpan.
+    """
+
+    def __init__(self, max_entries: int = ENCODED_CACHE_MAX):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, obj) -> bytes:
+        key = id(obj)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] is obj:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        raw = json_dumps(obj)
+        with self._lock:
+            self.misses += 1
+            if self.max_entries > 0:
+                self._data[key] = (obj, raw)
+                self._data.move_to_end(key)
+                while len(self._data) > self.max_entries:
+                    self._data.popitem(last=False)
+        return raw
+
+    def stats(self) -> dict:
+        return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+encoded_cache = EncodedCache()
+HAS_FRAGMENT = orjson is not None and hasattr(orjson, "Fragment")
+
+
+def encoded_json(obj) -> bytes:
+    return encoded_cache.get(obj)
+
+
+def cached_json(obj):
+    """
+    Data dari cache untuk ditaruh di dalam payload respons: dengan orjson >= 3.9 jadi
+    orjson.Fragment (bytes yang sudah di-encode disisipkan apa adanya), kalau tidak objeknya sendiri.
+    """
+    if not obj or not HAS_FRAGMENT:
+        return obj
+    return orjson.Fragment(encoded_cache.get(obj))
+
+
+def reply(payload):
+    """Respons JSON tanpa lewat jsonable_encoder FastAPI."""
+    return FastJSONResponse(payload)
+
+
+class SingleFlight:
+    """Gabungkan fetch+parse yang identik dan sedang jalan jadi satu panggilan."""
+
+    class _Call:
+        __slots__ = ("event", "result", "error")
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key: str, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result
+
+    async def do_async(self, key: str, fn):
+        task = self._tasks.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            # task sendiri, jadi kalau caller pertama disconnect yang lain tetap dapat hasil
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self.leaders += 1
+            task.add_done_callback(lambda t: self._tasks.pop(key, None) if self._tasks.get(key) is t else None)
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {"leaders": self.leaders, "shared": self.shared}
+
+
+flights = SingleFlight()
+
+
+class DiskCache:
+    """
+    Tier kedua di bawah ResponseCache: SQLite (WAL) di disk, aman dipakai banyak proses.
+
+    Simpan HTML mentah + JSON hasil parse (zlib), dengan waktu kadaluarsa wall-clock
+    supaya bisa dibaca worker lain / proses setelah cold start.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entries ("
+        " key TEXT PRIMARY KEY, kind TEXT, html BLOB, data BLOB, size INTEGER,"
+        " fetched_at REAL, expires_at REAL, stale_until REAL, accessed_at REAL, digest TEXT)",
+        "CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)",
+    )
+    # kolom yang ditambah belakangan: file cache lama di-ALTER saat dibuka
+    COLUMNS = {"digest": "TEXT"}
+    EVICT_EVERY = 64
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.disabled = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._since_evict = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout=10000")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for stmt in self.SCHEMA:
+                conn.execute(stmt)
+            have = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            for name, decl in self.COLUMNS.items():
+                if name not in have:
+                    try:
+                        conn.execute(f"ALTER TABLE entries ADD COLUMN {name} {decl}")
+                    except sqlite3.OperationalError as e:
+                        if "duplicate column" not in str(e):  # worker lain duluan
+                            raise
+            self._local.conn = conn
+        return conn
+
+    def _fail(self, where: str, e: Exception):
+        self.errors += 1
+        print(f"[DiskCache.{where}] Error {self.path}: {e}")
+        if isinstance(e, (sqlite3.OperationalError, OSError)) and "locked" not in str(e):
+            # path tidak bisa ditulis dsb: matikan tier ini, jangan ganggu request
+            self.disabled = True
+
+    def get(self, key: str):
+        """Return (data, expires_at, stale_until) or None."""
+        if self.disabled:
+            return None
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT data, expires_at, stale_until, accessed_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[2] <= now or row[0] is None:
+                self.misses += 1
+                return None
+            if now - row[3] > 60:
+                conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            data = json.loads(zlib.decompress(row[0]))
+        except Exception as e:
+            self._fail("get", e)
+            return None
+        if row[1] > now:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return data, row[1], row[2]
+
+    def get_html(self, key: str):
+        if self.disabled:
+            return None
+        try:
+            row = self._conn().execute("SELECT html FROM entries WHERE key = ?", (key,)).fetchone()
+            return zlib.decompress(row[0]).decode("utf-8") if row and row[0] else None
+        except Exception as e:
+            self._fail("get_html", e)
+            return None
+
+    def get_parsed(self, key: str, digest: str):
+        """Hasil parse tersimpan kalau HTML-nya (digest) sama, walau entry sudah kadaluarsa."""
+        if self.disabled or not digest:
+            return None
+        try:
+            row = self._conn().execute(
+                "SELECT data FROM entries WHERE key = ? AND digest = ?", (key, digest)
+            ).fetchone()
+            return json.loads(zlib.decompress(row[0])) if row and row[0] else None
+        except Exception as e:
+            self._fail("get_parsed", e)
+            return None
+
+    def set(self, key: str, kind: str, html: str | None, data, ttl: float, digest: str | None = None):
+        if self.disabled or ttl <= 0 or self.max_bytes <= 0:
+            return
+        now = time.time()
+        try:
+            html_z = zlib.compress(html.encode("utf-8")) if html is not None else None
+            data_z = zlib.compress(json.dumps(data, ensure_ascii=False, default=json_default).encode("utf-8"))
+            size = len(data_z) + (len(html_z) if html_z else 0)
+            self._conn().execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, kind, html, data, size, fetched_at, expires_at, stale_until, accessed_at, digest)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, html_z, data_z, size, now, now + ttl, now + ttl + CACHE_SWR, now, digest),
+            )
+            self.writes += 1
+        except Exception as e:
+            self._fail("set", e)
+            return
+        with self._lock:
+            self._since_evict += 1
+            due = self._since_evict >= self.EVICT_EVERY
+            if due:
+                self._since_evict = 0
+        if due:
+            self.evict()
+
+    def touch(self, key: str, ttl: float):
+        """Upstream bilang belum berubah: perpanjang umur entry tanpa tulis ulang isinya."""
+        if self.disabled or ttl <= 0:
+            return
+        now = time.time()
+        try:
+            self._conn().execute(
+                "UPDATE entries SET fetched_at = ?, expires_at = ?, stale_until = ?, accessed_at = ? WHERE key = ?",
+                (now, now + ttl, now + ttl + CACHE_SWR, now, key),
+            )
+        except Exception as e:
+            self._fail("touch", e)
+
+    def evict(self):
+        """Buang entry yang sudah lewat jendela stale, lalu yang paling lama tidak diakses sampai muat."""
+        if self.disabled:
+            return
+        try:
+            conn = self._conn()
+            cur = conn.execute("DELETE FROM entries WHERE stale_until <= ?", (time.time(),))
+            self.evictions += max(cur.rowcount, 0)
+            total, count = conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries").fetchone()
+            while total > self.max_bytes and count:
+                avg = total / count
+                n = max(1, int((total - self.max_bytes) / avg) + 1)
+                cur = conn.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)", (n,)
+                )
+                self.evictions += max(cur.rowcount, 0)
+                total, count = conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries").fetchone()
+        except Exception as e:
+            self._fail("evict", e)
+
+    def warm(self, limit: int):
+        """Entry yang masih fresh, paling baru diakses dulu: [(key, data, expires_at)]."""
+        if self.disabled or limit <= 0:
+            return []
+        try:
+            rows = self._conn().execute(
+                "SELECT key, data, expires_at FROM entries WHERE expires_at > ? AND data IS NOT NULL"
+                " ORDER BY accessed_at DESC LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+            return [(k, json.loads(zlib.decompress(d)), exp) for k, d, exp in rows]
+        except Exception as e:
+            self._fail("warm", e)
+            return []
+
+    def stats(self) -> dict:
+        out = {
+            "path": self.path,
+            "enabled": not self.disabled,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+        if not self.disabled:
+            try:
+                out["bytes"], out["entries"] = self._conn().execute(
+                    "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries"
+                ).fetchone()
+            except Exception as e:
+                self._fail("stats", e)
+        return out
+
+
+disk_cache = DiskCache(DISK_CACHE_PATH, DISK_CACHE_MAX_MB * 1024 * 1024) if DISK_CACHE_PATH else None
+
+
+def lookup_disk(key: str):
+    entry = disk_cache.get(key)
+    if entry is None:
+        return None
+    data, expires_at, _ = entry
+    data = compact_parsed(data)
+    remaining = expires_at - time.time()
+    if remaining > 0:
+        response_cache.set(key, data, ttl=remaining)
+        return data, True
+    return data, False
+
+
+def warm_from_disk():
+    if disk_cache is None:
+        return 0
+    entries = disk_cache.warm(min(DISK_CACHE_WARM, response_cache.max_entries))
+    # urutan: paling baru diakses terakhir di-set, supaya paling "hangat" di LRU
+    for key, data, expires_at in reversed(entries):
+        response_cache.set(key, compact_parsed(data), ttl=expires_at - time.time())
+    return len(entries)
+
+
+# bagian HTML yang berubah tiap fetch tapi tidak pernah dibaca parser: komentar cache plugin,
+# script/style (nonce, iklan, tracking), blok iklan <ins>, nonce & ?ver= di atribut
+VOLATILE_HTML_RE = re.compile(
+    r"<!--.*?-->"
+    r"|<script\b[^>]*>.*?</script\s*>"
+    r"|<style\b[^>]*>.*?</style\s*>"
+    r"|<ins\b[^>]*>.*?</ins\s*>"
+    r"|\snonce=(?:\"[^\"]*\"|'[^']*')"
+    r"|(?<=[?&])ver=[\w.-]+",
+    re.S | re.I,
+)
+
+
+def html_digest(html: str) -> str:
+    """Hash HTML setelah bagian volatile dibuang: sama berarti hasil parse pasti sama."""
+    return hashlib.blake2b(VOLATILE_HTML_RE.sub("", html).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ParseMemo:
+    """
+    key cache -> (digest HTML, hasil parse) terakhir. Dipakai setelah TTL habis dan halaman
+    di-fetch ulang: kalau digest sama, hasil lama dipakai lagi tanpa bangun soup.
+    Lebih awet dari ResponseCache (tidak ada TTL, cuma LRU).
+    """
+
+    def __init__(self, max_entries: int = PARSE_MEMO_MAX):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.skipped = {}  # kind -> parse yang dilewati
+        self.parsed = {}  # kind -> parse yang benar-benar jalan
+        self.disk_hits = 0
+
+    def get(self, key: str, digest: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] != digest:
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def last(self, key: str, max_age: float):
+        """
+        Hasil parse terakhir apa pun digest-nya (cadangan kalau upstream tidak bisa dipakai),
+        asal terakhir dikonfirmasi upstream (parse / 304) kurang dari max_age detik lalu.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or time.monotonic() - entry[2] > max_age:
+            return None
+        return entry[1]
+
+    def put(self, key: str, digest: str, data):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = (digest, data, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def count(self, kind: str, skipped: bool):
+        with self._lock:
+            bucket = self.skipped if skipped else self.parsed
+            bucket[kind] = bucket.get(kind, 0) + 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            skipped, parsed = sum(self.skipped.values()), sum(self.parsed.values())
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "skipped": skipped,
+                "parsed": parsed,
+                "skip_rate": round(skipped / (skipped + parsed), 4) if skipped + parsed else 0.0,
+                "disk_hits": self.disk_hits,
+                "skipped_by_kind": dict(self.skipped),
+                "parsed_by_kind": dict(self.parsed),
+            }
+
+
+parse_memo = ParseMemo()
+
+
+NOT_MODIFIED = object()  # fetch_html*: upstream jawab 304
+UPSTREAM_BUSY = object()  # fetch_html*: tidak dikirim, ditolak governor / circuit open
+UPSTREAM_FAILED = object()  # fetch_html*: error koneksi/timeout/5xx/429 (4xx biasa = None)
+
+
+class UpstreamValidators:
+    """
+    cache key -> (ETag, Last-Modified, digest HTML) dari respons upstream terakhir.
+
+    Validator cuma dikirim kalau digest-nya sudah terikat ke hasil parse (ParseMemo / disk),
+    karena 304 tidak bawa body: hasil parse lama itulah yang dipakai lagi.
+    """
+
+    def __init__(self, max_entries: int = PARSE_MEMO_MAX):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._pending = {}  # key -> (etag, last_modified) sebelum parse selesai
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.not_modified = 0
+        self.reused = 0
+
+    def headers(self, key):
+        if not key or not PARSE_MEMO:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            self.sent += 1
+        etag, last_modified, _ = entry
+        out = {}
+        if etag:
+            out["If-None-Match"] = etag
+        if last_modified:
+            out["If-Modified-Since"] = last_modified
+        return out
+
+    def remember(self, key, headers):
+        if not key or not PARSE_MEMO:
+            return
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        with self._lock:
+            if etag or last_modified:
+                self._pending[key] = (etag, last_modified)
+            else:
+                self._pending.pop(key, None)
+                self._data.pop(key, None)
+
+    def bind(self, key: str, digest: str):
+        """Dipanggil setelah parse: validator respons ini sekarang menunjuk ke digest tsb."""
+        with self._lock:
+            pending = self._pending.pop(key, None)
+            if pending is None:
+                return
+            self._data[key] = (*pending, digest)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def digest(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[2] if entry else None
+
+    def forget(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "sent": self.sent,
+            "not_modified": self.not_modified,
+            "reused": self.reused,
+        }
+
+
+upstream_validators = UpstreamValidators()
+
+
+def build_list_params(
+    page: int,
+    status: str | None,
+    type_: str | None,
+    sub: str | None,
+    order: str | None,
+    genres: list[str] | None,
+):
+    """
+    Anichin list query contoh:
+    /anime/?page=2&order=update&status=&type=&sub=
     """
     params = {}
 
@@ -131,545 +2011,2695 @@ def build_list_params(
     if genres:
         params["genre[]"] = genres
 
-    return params
+    return params
+
+
+# --------------------------
+# PARSERS
+# --------------------------
+# selector & regex parser didefinisikan sekali di sini, bukan string di tiap panggilan
+class css:
+    """
+    Selector CSS yang dikompilasi soupsieve sekali (saat pertama dipakai, supaya import tetap
+    ringan di cold start) lalu dipakai langsung, tanpa lewat soup.select() + cache soupsieve.
+    """
+
+    __slots__ = ("selector", "_compiled")
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        self._compiled = None
+
+    def compiled(self):
+        if self._compiled is None:
+            self._compiled = soupsieve.compile(self.selector)
+        return self._compiled
+
+    def select_one(self, el):
+        return (self._compiled or self.compiled()).select_one(el)
+
+    def select(self, el):
+        return (self._compiled or self.compiled()).select(el)
+
+
+def css_first(*selectors):
+    """Selector cadangan: dicoba berurutan lewat select_first(), yang pertama ketemu menang."""
+    return tuple(css(s) for s in selectors)
+
+
+def select_first(el, selectors):
+    for sel in selectors:
+        found = sel.select_one(el)
+        if found is not None:
+            return found
+    return None
+
+
+CARD_LINK = css("a")
+CARD_TITLE = css_first("div.tt", ".entry-title", "h2", "h3")
+CARD_IMG = css("img")
+CARD_EP = css_first("div.epx", ".ep", ".episode")
+CARD_STATUS = css_first("div.status", ".stat", ".status")
+CARD_TYPE = css_first("div.typez", ".type", ".typez")
+CARD_RATING = css_first(".numscore", ".rating", ".score", ".imdb")
+CARD_TIME = css_first("div.time", ".time")
+CARD_TIME_RE = re.compile(r"(\d{1,2}:\d{2})")
+DIGITS_RE = re.compile(r"(\d+)")
+LIST_CARDS = css("div.listupd article.bs")
+LIST_CARDS_DIV = css("div.listupd div.bs")
+
+
+def parse_card(element, is_schedule: bool = False):
+    try:
+        a = CARD_LINK.select_one(element)
+        if not a or not a.get("href"):
+            return None
+
+        url = abs_url(a["href"])
+        slug = extract_slug(url)
+
+        title_el = select_first(element, CARD_TITLE)
+        title = safe_text(title_el) or safe_text(a)
+
+        img = CARD_IMG.select_one(element)
+        poster = ""
+        if img:
+            poster = pick_first(
+                img.get("data-src", ""),
+                img.get("src", ""),
+                (img.get("srcset", "").split(" ")[0] if img.get("srcset") else ""),
+            )
+        poster = abs_url(poster) if poster else ""
+
+        ep_txt = safe_text(select_first(element, CARD_EP))
+        status = safe_text(select_first(element, CARD_STATUS)) or "Ongoing"
+        type_show = safe_text(select_first(element, CARD_TYPE)) or "Donghua"
+        rating = safe_text(select_first(element, CARD_RATING))
+
+        data = {
+            "title": title,
+            "slug": slug,
+            "poster": poster,
+            "status": status,
+            "type": type_show,
+            "rating": rating,
+            "sub": "Sub",
+            "href": f"/donghua/detail/{slug}",
+            "anichinUrl": url,
+        }
+
+        if is_schedule:
+            time_txt = safe_text(select_first(element, CARD_TIME))
+            m_time = CARD_TIME_RE.search(time_txt)
+            data["upload_at"] = m_time.group(1) if m_time else ""
+
+            m_ep = DIGITS_RE.search(ep_txt)
+            data["episode"] = m_ep.group(1) if m_ep else (ep_txt or "??")
+        else:
+            data["current_episode"] = ep_txt or "??"
+
+        return data
+    except Exception as e:
+        print("[parse_card] error:", e)
+        return None
+
+
+def parse_list_page(soup):
+    if not soup:
+        return []
+
+    cards = LIST_CARDS.select(soup)
+    if not cards:
+        cards = LIST_CARDS_DIV.select(soup)
+
+    out = []
+    for it in cards:
+        c = parse_card(it)
+        if c:
+            out.append(c)
+    return out
+
+
+ENTRY_TITLE = css("h1.entry-title")
+H1 = css("h1")
+ALT_TITLE = css_first(".seriestitl .alter, .seriestitl .alttitle, .seriestitl h2", "div.seriestitl h2")
+SHORT_DESC_BOX = css_first("div.entry-content", "article")
+PARAGRAPHS = css("p")
+POSTER_IMG = css_first("div.thumb img", ".thumb img", "img")
+GENRE_LINKS = css("div.genxed a, .genxed a, a[href*='/genre/'], a[href*='/genres/']")
+HEADINGS = css("h2, h3, h4")
+SYNOPSIS_BOX = css_first("div.entry-content[itemprop='description']", "div.entry-content")
+SERIES_EPISODES = css("ul#episode_list li a, .eplister li a, .episodelist li a")
+EPL_NUM = css(".epl-num")
+EPL_TITLE = css(".epl-title")
+INFO_SPANS = css("div.spe span")
+
+
+def parse_series_detail(soup, url: str, fields=None):
+    """fields: subset SERIES_FIELDS; bagian yang tidak diminta tidak diparse sama sekali."""
+    want = fields.__contains__ if fields else lambda f: True
+    out = {"status": "success", "creator": CREATOR}
+
+    if want("title"):
+        out["title"] = safe_text(ENTRY_TITLE.select_one(soup)) or safe_text(H1.select_one(soup)) or ""
+
+    if want("alt_title"):
+        out["alt_title"] = safe_text(select_first(soup, ALT_TITLE))
+
+    if want("short_description"):
+        short_desc = ""
+        entry = select_first(soup, SHORT_DESC_BOX)
+        if entry:
+            for p in PARAGRAPHS.select(entry):
+                t = normalize_label(p.get_text(" ", strip=True))
+                if len(t) > 80:
+                    short_desc = t
+                    break
+        out["short_description"] = short_desc
+
+    if want("poster"):
+        thumb = select_first(soup, POSTER_IMG)
+        out["poster"] = abs_url(thumb.get("src", "")) if thumb else ""
+
+    out["slug"] = extract_slug(url)
+
+    if want("info"):
+        out["info"] = parse_series_info(soup)
+
+    if want("genres"):
+        genres = []
+        seen = set()
+        for a in GENRE_LINKS.select(soup):
+            name = safe_text(a)
+            href = abs_url(a.get("href", ""))
+            if not name:
+                continue
+            slug = extract_slug(href) if href else WS_RE.sub("-", name.lower())
+            key = slug or name.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            genres.append({"name": name, "slug": slug, "anichinUrl": href})
+        out["genres"] = genres
+
+    if want("synopsis"):
+        synopsis_title = "Synopsis"
+        synopsis_text = ""
+
+        syn_head = None
+        for h in HEADINGS.select(soup):
+            if "synopsis" in safe_text(h).lower():
+                syn_head = h
+                synopsis_title = safe_text(h) or "Synopsis"
+                break
+
+        if syn_head:
+            parts = []
+            for sib in syn_head.find_all_next():
+                if sib.name in ("h2", "h3", "h4"):
+                    break
+                if sib.name in ("p", "div"):
+                    txt = normalize_label(sib.get_text(" ", strip=True))
+                    if txt:
+                        parts.append(txt)
+            synopsis_text = "\n".join(parts).strip()
+        else:
+            syn = select_first(soup, SYNOPSIS_BOX)
+            if syn:
+                synopsis_text = syn.get_text("\n", strip=True)
+        out["synopsis_title"] = synopsis_title
+        out["synopsis"] = synopsis_text
+
+    if want("episodes_list"):
+        episodes_list = []
+        for a in SERIES_EPISODES.select(soup):
+            href = a.get("href", "")
+            if not href:
+                continue
+            full = abs_url(href)
+
+            ep_num = EPL_NUM.select_one(a)
+            ep_title = EPL_TITLE.select_one(a)
+            ep_text = normalize_label(f"{safe_text(ep_num)} {safe_text(ep_title)}").strip()
+            if not ep_text:
+                ep_text = safe_text(a)
+
+            episodes_list.append(
+                {
+                    "episode": ep_text,
+                    "slug": extract_slug(full),
+                    "href": f"/donghua/episode/{extract_slug(full)}",
+                    "anichinUrl": full,
+                }
+            )
+        out["episodes_list"] = episodes_list
+
+    out["anichinUrl"] = url
+    return out
+
+
+def parse_series_info(soup) -> dict:
+    info = {
+        "status": "-",
+        "network": "-",
+        "studio": "-",
+        "released": "-",
+        "duration": "-",
+        "country": "-",
+        "type": "-",
+        "episodes": "-",
+        "fansub": "-",
+        "posted by": "-",
+        "released on": "-",
+        "updated on": "-",
+    }
+
+    for sp in INFO_SPANS.select(soup):
+        k, v = split_label_value(sp.get_text(" ", strip=True))
+        if not k:
+            continue
+        if "status" in k:
+            info["status"] = v
+        elif "network" in k:
+            info["network"] = v
+        elif "studio" in k:
+            info["studio"] = v
+        elif k == "released":
+            info["released"] = v
+        elif "duration" in k:
+            info["duration"] = v
+        elif "country" in k:
+            info["country"] = v
+        elif k == "type":
+            info["type"] = v
+        elif "episodes" in k:
+            info["episodes"] = v
+        elif "fansub" in k:
+            info["fansub"] = v
+        elif "posted" in k:
+            info["posted by"] = v
+        elif "released on" in k:
+            info["released on"] = v
+        elif "updated on" in k:
+            info["updated on"] = v
+    return info
+
+
+RES_RE = re.compile(r"(240|360|480|720|1080)p")
+DL_SECTION_TAGS = ("div", "section", "article")
+DL_ROW_TAGS = ("tr", "li", "div")
+DL_ROW_CLASSES = {"row", "dlrow", "dldiv"}
+DL_EXTRA_SELECTOR = "div.mctnx div.soraddl, div.soraurl, div.dl-box"
+DL_EXTRA = css(DL_EXTRA_SELECTOR)
+
+
+def extract_downloads(soup):
+    """
+    Cari link download per resolusi dalam satu kali jalan di DOM.
+
+    Aturannya sama dengan scan lama: section = div/section/article yang teksnya
+    mengandung "download" + resolusi (plus DL_EXTRA_SELECTOR, diproses paling akhir),
+    row = tr/li/div/.row/.dlrow/.dldiv di dalam section (atau section itu sendiri
+    kalau tidak punya row). Resolusi row diambil dari match pertama di teksnya,
+    dan untuk tiap resolusi yang menang adalah row terakhir yang akan diproses scan
+    lama -- tapi teks tiap node cuma dibaca sekali, bukan sekali per container.
+    """
+    tags = []
+    parent = []
+    str_lo, str_hi = [], []
+    link_lo, link_hi = [], []
+    str_res = []
+    str_dl = []
+    links = []
+
+    # pass 1: urutan dokumen, range string & link per tag
+    stack = []
+
+    def close(i):
+        str_hi[i] = len(str_res)
+        link_hi[i] = len(links)
+
+    for node in soup.descendants:
+        while stack and tags[stack[-1]] is not node.parent:
+            close(stack.pop())
+        if isinstance(node, Tag):
+            if node.name == "a":
+                provider = safe_text(node)
+                href = node.get("href", "")
+                if provider and href and href.startswith("http"):
+                    links.append((provider, href))
+            i = len(tags)
+            tags.append(node)
+            parent.append(stack[-1] if stack else -1)
+            str_lo.append(len(str_res))
+            str_hi.append(0)
+            link_lo.append(len(links))
+            link_hi.append(0)
+            stack.append(i)
+        elif type(node) in (NavigableString, CData):
+            t = normalize_label(node).lower()
+            if not t:
+                continue
+            m = RES_RE.search(t)
+            str_res.append(m.group(1) if m else None)
+            str_dl.append("download" in t)
+    while stack:
+        close(stack.pop())
+
+    n_str = len(str_res)
+    next_res = [n_str] * (n_str + 1)
+    next_dl = [n_str] * (n_str + 1)
+    for j in range(n_str - 1, -1, -1):
+        next_res[j] = j if str_res[j] else next_res[j + 1]
+        next_dl[j] = j if str_dl[j] else next_dl[j + 1]
+
+    # pass 2: atribut per tag
+    n = len(tags)
+    first_res = [None] * n
+    is_row = [False] * n
+    sec_a = [False] * n
+    has_row = [False] * n
+    extra_ids = {id(el) for el in DL_EXTRA.select(soup)}
+    sec_b = [id(el) in extra_ids for el in tags]
+
+    for i, el in enumerate(tags):
+        r = next_res[str_lo[i]]
+        if r < str_hi[i]:
+            first_res[i] = str_res[r]
+            if el.name in DL_SECTION_TAGS and next_dl[str_lo[i]] < str_hi[i]:
+                sec_a[i] = True
+        is_row[i] = el.name in DL_ROW_TAGS or bool(DL_ROW_CLASSES.intersection(el.get("class") or ()))
+
+    for i in range(n - 1, 0, -1):
+        p = parent[i]
+        if p >= 0 and (is_row[i] or has_row[i]):
+            has_row[p] = True
+
+    results = {}
+    for is_sec in (sec_a, sec_b):
+        # section terdalam / terluar yang membungkus tag (tidak termasuk dirinya sendiri)
+        inner = [-1] * n
+        outer = [-1] * n
+        for i in range(n):
+            p = parent[i]
+            if p < 0:
+                continue
+            if is_sec[p]:
+                inner[i] = p
+                outer[i] = outer[p] if outer[p] >= 0 else p
+            else:
+                inner[i] = inner[p]
+                outer[i] = outer[p]
+
+        best = {}
+        first = {}
+        for i in range(n):
+            res = first_res[i]
+            if res is None or link_hi[i] == link_lo[i]:
+                continue
+            last_sec = first_sec = -1
+            if is_row[i] and inner[i] >= 0:
+                last_sec, first_sec = inner[i], outer[i]
+            if is_sec[i] and not has_row[i]:
+                last_sec = i
+                if first_sec < 0:
+                    first_sec = i
+            if last_sec < 0:
+                continue
+            if res not in best or (last_sec, i) > best[res]:
+                best[res] = (last_sec, i)
+            if res not in first or (first_sec, i) < first[res]:
+                first[res] = (first_sec, i)
+        results_phase = sorted(first, key=first.get)
+        for res in results_phase:
+            results.setdefault(res, None)
+        for res, (_, i) in best.items():
+            results[res] = i
+
+    downloads = {}
+    for res, i in results.items():
+        downloads[f"download_url_{res}p"] = dict(links[link_lo[i]:link_hi[i]])
+    return downloads
+
+
+NAV_PREV = css_first("div.nvs .nav-previous a", "a[rel='prev']")
+NAV_NEXT = css_first("div.nvs .nav-next a", "a[rel='next']")
+SIDEBAR_EPISODES = css("div.bixbox.lpl li a")
+LPL_TITLE = css(".lpl_title")
+PLAYER_OPTIONS = css("ul#playeroptionsul li")
+OPTION_TITLE = css(".title")
+MIRROR_SELECT = css("select.mirror")
+OPTIONS = css("option")
+PLAYER_IFRAME = css_first(".video-content iframe", "iframe")
+
+
+def parse_episode_detail(soup, url: str, fields=None):
+    """fields: subset EPISODE_FIELDS; bagian yang tidak diminta tidak diparse sama sekali."""
+    want = fields.__contains__ if fields else lambda f: True
+    out = {"status": "success", "creator": CREATOR}
+
+    if want("episode"):
+        out["episode"] = safe_text(ENTRY_TITLE.select_one(soup)) or "Episode"
+
+    if want("streaming"):
+        out["streaming"] = parse_stream_servers(soup)
+
+    if want("download_url"):
+        with timed("downloads"):
+            out["download_url"] = extract_downloads(soup)
+
+    if want("navigation"):
+        nav = {}
+        nav_prev = select_first(soup, NAV_PREV)
+        nav_next = select_first(soup, NAV_NEXT)
+
+        if nav_prev and nav_prev.get("href"):
+            u = abs_url(nav_prev["href"])
+            nav["previous_episode"] = {"slug": extract_slug(u), "anichinUrl": u}
+        if nav_next and nav_next.get("href"):
+            u = abs_url(nav_next["href"])
+            nav["next_episode"] = {"slug": extract_slug(u), "anichinUrl": u}
+        out["navigation"] = nav
+
+    if want("episodes_list"):
+        episodes_list = []
+        for a in SIDEBAR_EPISODES.select(soup):
+            href = a.get("href", "")
+            if not href:
+                continue
+            full = abs_url(href)
+            ep_txt = safe_text(LPL_TITLE.select_one(a)) or safe_text(a)
+            episodes_list.append({"episode": ep_txt, "slug": extract_slug(full), "anichinUrl": full})
+        out["episodes_list"] = episodes_list
+
+    out["anichinUrl"] = url
+    return out
+
+
+def parse_stream_servers(soup) -> dict:
+    servers = []
+
+    for li in PLAYER_OPTIONS.select(soup):
+        name = safe_text(OPTION_TITLE.select_one(li)) or safe_text(li) or "Server"
+        raw = li.get("data-src") or li.get("data-url") or ""
+        clean = decode_url(raw)
+        if clean and "http" in clean:
+            servers.append({"name": name, "url": clean})
+
+    if not servers:
+        sel = MIRROR_SELECT.select_one(soup)
+        if sel:
+            for opt in OPTIONS.select(sel):
+                name = safe_text(opt) or "Server"
+                raw = opt.get("value", "")
+                clean = decode_url(raw)
+                if clean and "http" in clean:
+                    servers.append({"name": name, "url": clean})
+
+    if not servers:
+        iframe = select_first(soup, PLAYER_IFRAME)
+        if iframe and iframe.get("src"):
+            servers.append({"name": "Default", "url": iframe["src"]})
+
+    main_url = servers[0] if servers else {"name": "Default", "url": ""}
+    return {"main_url": main_url, "servers": servers}
+
+
+GENRE_INPUTS = css("input[name='genre[]']")
+LABELS_FOR = css("label[for]")
+SELECT_OPTIONS = css("select option")
+GENRE_SLUG_RE = re.compile(r"[a-z0-9-]+")
+
+
+def parse_genres(soup):
+    if not soup:
+        return []
+
+    results = []
+    seen = set()
+    # label[for=id] pertama per id, sekali jalan (bukan satu select per input)
+    labels = {}
+    for lab in LABELS_FOR.select(soup):
+        labels.setdefault(lab.get("for"), lab)
+
+    for inp in GENRE_INPUTS.select(soup):
+        slug = (inp.get("value") or "").strip()
+        if not slug:
+            continue
+
+        lab = None
+        if inp.get("id"):
+            lab = labels.get(inp.get("id"))
+        if not lab:
+            lab = inp.find_parent("label")
+        name = safe_text(lab) or slug.replace("-", " ").title()
+
+        if slug not in seen:
+            seen.add(slug)
+            results.append(
+                {
+                    "name": name,
+                    "slug": slug,
+                    "href": f"/donghua/genres/{slug}",
+                    "anichinUrl": f"{BASE_URL}/anime/?genre%5B%5D={slug}&status=&type=&sub=&order=",
+                }
+            )
+
+    if not results:
+        for opt in SELECT_OPTIONS.select(soup):
+            v = (opt.get("value") or "").strip()
+            t = safe_text(opt)
+            if v and GENRE_SLUG_RE.fullmatch(v) and t and v not in seen:
+                seen.add(v)
+                results.append(
+                    {
+                        "name": t,
+                        "slug": v,
+                        "href": f"/donghua/genres/{v}",
+                        "anichinUrl": f"{BASE_URL}/anime/?genre%5B%5D={v}&status=&type=&sub=&order=",
+                    }
+                )
+
+    results.sort(key=lambda x: x["name"].lower())
+    return results
+
+
+SCHEDULE_BOXES = css("div.bixbox")
+SCHEDULE_DAY = css_first("div.releases h3", "h3")
+SCHEDULE_CARDS = css("div.listupd article.bs, div.listupd div.bs")
+EPISODE_MARKERS = css_first("#playeroptionsul", "select.mirror", ".video-content iframe", ".mctnx")
+
+
+def parse_schedule(soup):
+    out = []
+
+    if soup:
+        for box in SCHEDULE_BOXES.select(soup):
+            day_el = select_first(box, SCHEDULE_DAY)
+            if not day_el:
+                continue
+
+            day_name = safe_text(day_el)
+            items = []
+
+            for it in SCHEDULE_CARDS.select(box):
+                c = parse_card(it, is_schedule=True)
+                if c:
+                    items.append(c)
+
+            if items:
+                out.append({"day": day_name, "donghua_list": items})
+
+    return out
+
+
+def is_episode_page(soup) -> bool:
+    return select_first(soup, EPISODE_MARKERS) is not None
+
+
+def parse_detail_auto(soup, url: str, fields=None):
+    if is_episode_page(soup):
+        return parse_episode_detail(soup, url, fields)
+    return parse_series_detail(soup, url, fields)
+
+
+# fields= yang bisa diminta per kind (selain status/creator/slug/anichinUrl yang selalu ada)
+SERIES_FIELDS = ("title", "alt_title", "short_description", "poster", "info", "genres", "synopsis", "episodes_list")
+EPISODE_FIELDS = ("episode", "streaming", "download_url", "navigation", "episodes_list")
+KIND_FIELDS = {
+    "series": frozenset(SERIES_FIELDS),
+    "episode": frozenset(EPISODE_FIELDS),
+    "detail": frozenset(SERIES_FIELDS + EPISODE_FIELDS),
+}
+ALWAYS_KEYS = ("status", "creator", "slug", "anichinUrl")
+
+
+def parse_fields(spec: str | None, kind: str):
+    """"info,genres" -> frozenset; None/"" = semua bagian."""
+    names = {f.strip() for f in (spec or "").split(",") if f.strip()}
+    if not names:
+        return None
+    unknown = names - KIND_FIELDS[kind]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"fields tidak dikenal: {', '.join(sorted(unknown))} (pilihan: {', '.join(sorted(KIND_FIELDS[kind]))})",
+        )
+    return frozenset(names)
+
+
+def project_fields(data: dict, fields) -> dict:
+    """Hasil parse lengkap -> bentuk yang sama dengan parse ber-fields."""
+    keep = set(fields) | set(ALWAYS_KEYS)
+    if "synopsis" in keep:
+        keep.add("synopsis_title")
+    return {k: v for k, v in data.items() if k in keep}
+
+
+# kind -> parser(soup, url); dipakai scrape()/scrape_async()
+PAGE_PARSERS = {
+    "list": lambda soup, url: parse_list_page(soup),
+    "search": lambda soup, url: parse_list_page(soup),
+    "schedule": lambda soup, url: parse_schedule(soup),
+    "genres": lambda soup, url: parse_genres(soup),
+    "series": parse_series_detail,
+    "episode": parse_episode_detail,
+    "detail": parse_detail_auto,
+}
+
+
+def parse_page(kind: str, html: str, url: str, backend: str | None = None, fields=None):
+    with timed("soup"):
+        soup = make_soup(html, backend, kind)
+    with timed(f"parse-{kind}"):
+        if fields:
+            return PAGE_PARSERS[kind](soup, url, fields)
+        return PAGE_PARSERS[kind](soup, url)
+
+
+def parse_and_store(key: str, kind: str, html: str, url: str, fields=None):
+    """key = kunci URL (tanpa fields); fields cuma dipakai waktu parse."""
+    digest, data = memo_lookup(key, kind, html)
+    if fields:
+        data = project_fields(data, fields) if data is not None else parse_page(kind, html, url, fields=fields)
+        return store_projection(key, kind, fields, data)
+    if data is None:
+        data = parse_page(kind, html, url)
+    return store_parsed(key, kind, html, digest, data)
+
+
+async def parse_and_store_async(key: str, kind: str, html: str, url: str, fields=None):
+    if not parse_pool.enabled:
+        return await run_parse(parse_and_store, key, kind, html, url, fields)
+    # digest/memo & simpan ke cache di thread; cuma parse-nya yang ke proses worker
+    digest, data = await run_parse(memo_lookup, key, kind, html)
+    if data is None:
+        data = await parse_pool.parse(kind, html, url, fields)
+    elif fields:
+        data = project_fields(data, fields)
+    if fields:
+        return store_projection(key, kind, fields, data)
+    return await run_parse(store_parsed, key, kind, html, digest, data)
+
+
+def memo_lookup(key: str, kind: str, html: str):
+    """(digest, hasil parse lama kalau HTML-nya sama)."""
+    digest = html_digest(html) if PARSE_MEMO else None
+    data = parse_memo.get(key, digest) if digest else None
+    if data is None and digest and disk_cache is not None:
+        data = disk_cache.get_parsed(key, digest)
+        if data is not None:
+            parse_memo.disk_hits += 1
+    if digest:
+        parse_memo.count(kind, skipped=data is not None)
+    return digest, data
+
+
+def store_parsed(key: str, kind: str, html: str, digest, data):
+    data = compact_parsed(data)
+    if digest:
+        parse_memo.put(key, digest, data)
+        upstream_validators.bind(key, digest)
+    ttl_class = KIND_TTL_CLASS[kind]
+    response_cache.set(key, data, ttl_class)
+    if disk_cache is not None:
+        disk_cache.set(key, kind, html, data, CACHE_TTL_CLASSES[ttl_class], digest)
+    return data
+
+
+def store_projection(key: str, kind: str, fields, data):
+    """Hasil ber-fields cuma masuk cache memory di kuncinya sendiri; memo, validator & disk milik hasil lengkap."""
+    data = compact_parsed(data)
+    response_cache.set(fields_key(key, fields), data, KIND_TTL_CLASS[kind])
+    return data
+
+
+def projected(data, fields, key: str):
+    """
+    Proyeksi fields= dari hasil lengkap di kunci URL `key`. Proyeksinya disimpan di kunci fields-nya
+    dengan umur yang sama dengan hasil lengkap di memory, jadi request berikutnya
+    dapat objek yang sama (encoded_cache ikut kena) dan tidak memproyeksikan ulang.
+    """
+    if not fields or data is None:
+        return data
+    data = project_fields(data, fields)
+    response_cache.set_like(fields_key(key, fields), key, data)
+    return data
+
+
+def revalidated(key: str, kind: str):
+    """Upstream 304: pakai lagi hasil parse yang terikat ke validator, perpanjang TTL-nya."""
+    upstream_validators.not_modified += 1
+    digest = upstream_validators.digest(key)
+    data = parse_memo.get(key, digest) if digest else None
+    if data is None and digest and disk_cache is not None:
+        data = compact_parsed(disk_cache.get_parsed(key, digest))
+    if data is None:
+        upstream_validators.forget(key)
+        return None
+    upstream_validators.reused += 1
+    parse_memo.put(key, digest, data)  # 304 = masih sama dengan upstream, umur last_known mulai lagi
+    ttl_class = KIND_TTL_CLASS[kind]
+    response_cache.set(key, data, ttl_class)
+    if disk_cache is not None:
+        disk_cache.touch(key, CACHE_TTL_CLASSES[ttl_class])
+    return data
+
+
+def last_known(key: str):
+    """
+    Upstream error/5xx atau ditolak: hasil parse terakhir (lewat jendela SWR pun, paling tua
+    LAST_KNOWN_MAX_AGE) lebih baik dari error. Tidak dipakai untuk 404: halamannya memang hilang.
+    """
+    data = parse_memo.last(key, LAST_KNOWN_MAX_AGE)
+    if data is not None:
+        breaker.fallbacks += 1
+    return data
+
+
+def upstream_busy(key: str):
+    """Fetch ditolak: hasil parse terakhir kalau ada, selain itu 503 (halaman belum tentu tidak ada)."""
+    data = last_known(key)
+    if data is None:
+        raise UpstreamBusy(breaker.retry_after())
+    return data
+
+
+def _scrape(kind: str, url: str, params=None, fields=None):
+    # fetch, validator & memo dikunci per URL: variasi fields= berbagi satu request upstream
+    key = cache_key(kind, url, params)
+    html = flights.do("fetch " + key, lambda: fetch_html(url, params=params, key=key))
+    if html is NOT_MODIFIED:
+        data = revalidated(key, kind)
+        if data is not None:
+            return projected(data, fields, key)
+        html = flights.do("refetch " + key, lambda: fetch_html(url, params=params))
+    if html is UPSTREAM_BUSY:
+        return projected(upstream_busy(key), fields, key)
+    if html is UPSTREAM_FAILED:
+        return projected(last_known(key), fields, key)
+    if html is None:
+        return None
+    return parse_and_store(key, kind, html, url, fields)
+
+
+async def _scrape_async(kind: str, url: str, params=None, fields=None):
+    # fetch, validator & memo dikunci per URL: variasi fields= berbagi satu request upstream
+    key = cache_key(kind, url, params)
+    html = await flights.do_async("fetch " + key, lambda: fetch_html_async(url, params=params, key=key))
+    if html is NOT_MODIFIED:
+        if disk_cache is not None:
+            # get_parsed / touch = sqlite + zlib: jangan di event loop
+            data = await asyncio.get_running_loop().run_in_executor(None, revalidated, key, kind)
+        else:
+            data = revalidated(key, kind)
+        if data is not None:
+            return projected(data, fields, key)
+        # hasil lama sudah hilang: ambil ulang tanpa validator
+        html = await flights.do_async("refetch " + key, lambda: fetch_html_async(url, params=params))
+    if html is UPSTREAM_BUSY:
+        return projected(upstream_busy(key), fields, key)
+    if html is UPSTREAM_FAILED:
+        return projected(last_known(key), fields, key)
+    if html is None:
+        return None
+    return await parse_and_store_async(key, kind, html, url, fields)
+
+
+_refreshing = set()
+_refresh_tasks = set()
+
+
+def cache_result(hit, source: str) -> str:
+    if hit is None:
+        return "miss"
+    prefix = "" if source == "memory" else "disk_"
+    return prefix + ("hit" if hit[1] else "stale")
+
+
+def projected_hit(key: str, fields):
+    """Hasil lengkap (tanpa fields) yang masih fresh di memory cukup diproyeksikan, tanpa fetch."""
+    hit = response_cache.get(key)
+    if hit is None or not hit[1]:
+        return None
+    return projected(hit[0], fields, key), True
+
+
+def scrape(kind: str, url: str, params=None, fields=None):
+    base = cache_key(kind, url, params)
+    key = fields_key(base, fields)
+    with timed("cache"):
+        hit = response_cache.get(key)
+        if hit is None and fields:
+            hit = projected_hit(base, fields)
+        # disk cuma menyimpan hasil lengkap (kunci URL)
+        if hit is None and disk_cache is not None:
+            hit = lookup_disk(base)
+            if hit is not None:
+                hit = projected(hit[0], fields, base), hit[1]
+            refresh = (base, None)
+        else:
+            refresh = (key, fields)
+    note_cache(cache_result(hit, "memory"))
+    if hit is None:
+        return flights.do(key, lambda: _scrape(kind, url, params, fields))
+
+    data, fresh = hit
+    rkey, rfields = refresh
+    if not fresh and rkey not in _refreshing:
+        _refreshing.add(rkey)
+
+        def refresh_bg():
+            try:
+                flights.do(rkey, lambda: _scrape(kind, url, params, rfields))
+            finally:
+                _refreshing.discard(rkey)
+
+        threading.Thread(target=refresh_bg, daemon=True).start()
+    return data
+
+
+async def scrape_async(kind: str, url: str, params=None, fields=None):
+    base = cache_key(kind, url, params)
+    key = fields_key(base, fields)
+    with timed("cache"):
+        source = "memory"
+        hit = response_cache.get(key)
+        if hit is None and fields:
+            hit = projected_hit(base, fields)
+        # disk cuma menyimpan hasil lengkap (kunci URL); yang stale di-refresh lengkap juga
+        refresh = (key, fields)
+        if hit is None and disk_cache is not None:
+            source = "disk"
+            hit = await asyncio.get_running_loop().run_in_executor(None, lookup_disk, base)
+            if hit is not None:
+                hit = projected(hit[0], fields, base), hit[1]
+            refresh = (base, None)
+    note_cache(cache_result(hit, source))
+    if hit is None:
+        return await flights.do_async(key, lambda: _scrape_async(kind, url, params, fields))
+
+    data, fresh = hit
+    rkey, rfields = refresh
+    if not fresh and rkey not in _refreshing:
+        # stale-while-revalidate: balikin yang lama, refresh di background
+        _refreshing.add(rkey)
+        task = asyncio.create_task(flights.do_async(rkey, lambda: _scrape_async(kind, url, params, rfields)))
+        _refresh_tasks.add(task)
+
+        def done(t):
+            _refresh_tasks.discard(t)
+            _refreshing.discard(rkey)
+
+        task.add_done_callback(done)
+    return data
+
+
+# --------------------------
+# PREFETCH
+# --------------------------
+class Prefetcher:
+    """
+    Hangatkan cache di background untuk halaman yang hampir pasti diminta berikutnya:
+    episode berikutnya (navigation.next_episode) setelah /api/episode, dan N series teratas
+    setelah /api/update halaman 1.
+
+    - budget: token bucket `budget` fetch per menit untuk semua prefetch, maksimal
+      `concurrency` jalan barengan; antrian terbatas, sisanya dibuang
+    - upstream: tidak prefetch selama breaker tidak closed atau governor sudah memakai
+      >= limit * headroom slot; sisa slot tetap buat request user
+    - hit rate: key yang di-prefetch diingat (maks `track`), request user ke key itu = hit
+
+    Dipanggil dari event loop saja (endpoint + callback task).
+    """
+
+    def __init__(self, budget: int = PREFETCH_BUDGET, concurrency: int = PREFETCH_CONCURRENCY,
+                 headroom: float = PREFETCH_HEADROOM, queue_max: int = PREFETCH_QUEUE, track: int = 1024):
+        self.enabled = PREFETCH
+        self.budget = budget
+        self.concurrency = concurrency
+        self.headroom = headroom
+        self.track = track
+        self.running = 0
+        self._tokens = float(budget)
+        self._refilled_at = time.monotonic()
+        self._queue = deque(maxlen=queue_max)
+        self._queued = set()
+        self._tasks = set()
+        self._prefetched = OrderedDict()  # key -> kind, belum diminta user
+        self.scheduled = 0
+        self.done = 0
+        self.failed = 0
+        self.skipped = {"cached": 0, "budget": 0, "busy": 0, "dropped": 0}
+        self.hits = {}
+        self.wasted = 0
+
+    # --- pemicu ---
+    def after_episode(self, data):
+        nxt = ((data or {}).get("navigation") or {}).get("next_episode") or {}
+        if nxt.get("anichinUrl"):
+            self.submit("episode", nxt["anichinUrl"])
+
+    def after_update(self, cards, limit: int = PREFETCH_SERIES):
+        for card in (cards or [])[:limit]:
+            if card.get("anichinUrl"):
+                self.submit("series", card["anichinUrl"])
+
+    def submit(self, kind: str, url: str):
+        if not self.enabled:
+            return
+        # path dari halaman, host dari BASE_URL (sama dengan url yang dipakai endpoint)
+        url = abs_url(urlsplit(url).path)
+        key = cache_key(kind, url)
+        if key in self._queued or key in self._prefetched or response_cache.is_fresh(key):
+            self.skipped["cached"] += 1
+            return
+        if len(self._queue) == self._queue.maxlen:
+            self._queued.discard(self._queue[0][2])
+            self.skipped["dropped"] += 1
+        self._queue.append((kind, url, key))
+        self._queued.add(key)
+        self._pump()
+
+    # --- jalan ---
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(float(self.budget), self._tokens + (now - self._refilled_at) * self.budget / 60.0)
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def upstream_busy(self) -> bool:
+        if breaker.enabled and breaker.state != "closed":
+            return True
+        return governor.enabled and governor.in_flight >= governor.limit * self.headroom
+
+    def _pump(self):
+        while self._queue and self.running < self.concurrency:
+            kind, url, key = self._queue.popleft()
+            self._queued.discard(key)
+            if response_cache.is_fresh(key):
+                self.skipped["cached"] += 1
+                continue
+            if self.upstream_busy():
+                self.skipped["busy"] += 1
+                continue
+            if not self._take_token():
+                self.skipped["budget"] += 1
+                continue
+            self.running += 1
+            self.scheduled += 1
+            self._remember(key, kind)
+            # context baru: timing/metrics request pemicu tidak ikut tercatat di prefetch
+            task = asyncio.get_running_loop().create_task(self._run(kind, url, key), context=contextvars.Context())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _remember(self, key: str, kind: str):
+        self._prefetched[key] = kind
+        while len(self._prefetched) > self.track:
+            self._prefetched.popitem(last=False)
+            self.wasted += 1
+
+    async def _run(self, kind: str, url: str, key: str):
+        ok = False
+        try:
+            ok = await flights.do_async(key, lambda: _scrape_async(kind, url)) is not None
+        except Exception as e:
+            print(f"[prefetch] Error {url}: {e}")
+        finally:
+            self.running -= 1
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+                self._prefetched.pop(key, None)
+            self._pump()
+
+    # --- hit rate ---
+    def claim(self, kind: str, url: str):
+        """Request user ke halaman ini: hit kalau sebelumnya di-prefetch (selesai atau masih jalan)."""
+        if not self._prefetched:
+            return
+        if self._prefetched.pop(cache_key(kind, url), None) is not None:
+            self.hits[kind] = self.hits.get(kind, 0) + 1
+
+    def hit_rate(self) -> float:
+        return sum(self.hits.values()) / self.scheduled if self.scheduled else 0.0
+
+    async def drain(self):
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def cancel(self):
+        self._queue.clear()
+        self._queued.clear()
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "budget_per_min": self.budget,
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "queued": len(self._queue),
+            "scheduled": self.scheduled,
+            "done": self.done,
+            "failed": self.failed,
+            "skipped": dict(self.skipped),
+            "hits": dict(self.hits),
+            "wasted": self.wasted,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
+
+
+prefetcher = Prefetcher()
+
+
+# --------------------------
+# COMPACT RECORDS
+# --------------------------
+# Kartu & entri episodes_list yang disimpan lama di memory (response cache, parse memo,
+# katalog, search index) tidak disimpan sebagai dict: key-nya berulang, "Sub"/href/anichinUrl
+# bisa diturunkan dari slug, status/type/rating nilainya itu-itu saja. Record di bawah cuma
+# menyimpan bagian yang tidak bisa diturunkan; dict-nya dibangun lagi saat serialisasi
+# (json_default / dump_records) dengan urutan key yang sama persis.
+
+
+def split_url(url: str, default_path: str):
+    """(host ter-intern, path atau None kalau path == default_path)."""
+    i = url.find("/", url.find("://") + 3) if "://" in url else 0
+    if i < 0:
+        return sys.intern(url), ""
+    path = url[i:]
+    return sys.intern(url[:i]), None if path == default_path else path
+
+
+class CompactRecord(Mapping):
+    """
+    Basis record ringkas: read-only Mapping (get/[]/**/== dict tetap jalan), to_dict()
+    menghasilkan dict yang sama dengan hasil parser.
+    """
+
+    __slots__ = ()
+    KEYS = ()
+    STORED = frozenset()
+
+    def __getitem__(self, key):
+        if key in self.STORED:
+            return getattr(self, key)
+        if key in self.KEYS:
+            return self.derived(key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self.STORED:
+            return getattr(self, key)
+        return self.derived(key) if key in self.KEYS else default
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    @abstractmethod
+    def derived(self, key: str) -> str:
+        """Nilai satu key turunan (key di KEYS yang tidak ada di STORED), tanpa membangun dict."""
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        """Dict yang sama persis dengan hasil parser (urutan key = KEYS)."""
+
+
+class CardRecord(CompactRecord):
+    """Hasil parse_card (bukan jadwal)."""
+
+    __slots__ = ("title", "slug", "poster", "status", "type", "rating", "current_episode", "host", "path")
+    KEYS = ("title", "slug", "poster", "status", "type", "rating", "sub", "href", "anichinUrl", "current_episode")
+    STORED = frozenset(("title", "slug", "poster", "status", "type", "rating", "current_episode"))
+
+    def __init__(self, title, slug, poster, status, type_, rating, current_episode, host, path):
+        self.title = title
+        self.slug = slug
+        self.poster = poster
+        self.status = status
+        self.type = type_
+        self.rating = rating
+        self.current_episode = current_episode
+        self.host = host
+        self.path = path
+
+    @classmethod
+    def from_dict(cls, card):
+        """Record, atau None kalau bentuk dict-nya tidak bisa diturunkan ulang persis."""
+        if tuple(card) != cls.KEYS or any(type(v) is not str for v in card.values()):
+            return None
+        slug = card["slug"]
+        if card["sub"] != "Sub" or card["href"] != f"/donghua/detail/{slug}":
+            return None
+        intern = sys.intern
+        host, path = split_url(card["anichinUrl"], f"/seri/{slug}/")
+        return cls(
+            card["title"], slug, card["poster"], intern(card["status"]), intern(card["type"]),
+            intern(card["rating"]), intern(card["current_episode"]), host, path,
+        )
+
+    def derived(self, key: str) -> str:
+        if key == "sub":
+            return "Sub"
+        if key == "href":
+            return f"/donghua/detail/{self.slug}"
+        return f"{self.host}/seri/{self.slug}/" if self.path is None else self.host + self.path
+
+    def to_dict(self) -> dict:
+        slug = self.slug
+        return {
+            "title": self.title,
+            "slug": slug,
+            "poster": self.poster,
+            "status": self.status,
+            "type": self.type,
+            "rating": self.rating,
+            "sub": "Sub",
+            "href": f"/donghua/detail/{slug}",
+            "anichinUrl": f"{self.host}/seri/{slug}/" if self.path is None else self.host + self.path,
+            "current_episode": self.current_episode,
+        }
+
+
+class EpisodeRecord(CompactRecord):
+    """Entri episodes_list halaman episode (sidebar)."""
+
+    __slots__ = ("episode", "slug", "host", "path")
+    KEYS = ("episode", "slug", "anichinUrl")
+    STORED = frozenset(("episode", "slug"))
+    HREF = False
+
+    def __init__(self, episode, slug, host, path):
+        self.episode = episode
+        self.slug = slug
+        self.host = host
+        self.path = path
+
+    @classmethod
+    def from_dict(cls, ep):
+        if tuple(ep) != cls.KEYS or any(type(v) is not str for v in ep.values()):
+            return None
+        slug = ep["slug"]
+        if cls.HREF and ep["href"] != f"/donghua/episode/{slug}":
+            return None
+        host, path = split_url(ep["anichinUrl"], f"/{slug}/")
+        return cls(ep["episode"], slug, host, path)
+
+    def derived(self, key: str) -> str:
+        return f"{self.host}/{self.slug}/" if self.path is None else self.host + self.path
+
+    def to_dict(self) -> dict:
+        slug = self.slug
+        return {
+            "episode": self.episode,
+            "slug": slug,
+            "anichinUrl": f"{self.host}/{slug}/" if self.path is None else self.host + self.path,
+        }
+
+
+class SeriesEpisodeRecord(EpisodeRecord):
+    """Entri episodes_list halaman series (ada href API-nya)."""
+
+    __slots__ = ()
+    KEYS = ("episode", "slug", "href", "anichinUrl")
+    HREF = True
+
+    def derived(self, key: str) -> str:
+        if key == "href":
+            return f"/donghua/episode/{self.slug}"
+        return super().derived(key)
+
+    def to_dict(self) -> dict:
+        slug = self.slug
+        return {
+            "episode": self.episode,
+            "slug": slug,
+            "href": f"/donghua/episode/{slug}",
+            "anichinUrl": f"{self.host}/{slug}/" if self.path is None else self.host + self.path,
+        }
+
+
+def compact_items(items, record_cls):
+    """List dict -> list record; item yang tidak cocok bentuknya dibiarkan dict."""
+    if items and isinstance(items[0], CompactRecord):
+        return items  # sudah diringkas (hasil memo / cache)
+    out = []
+    for item in items:
+        rec = record_cls.from_dict(item) if type(item) is dict else None
+        out.append(item if rec is None else rec)
+    return out
+
+
+def compact_parsed(data):
+    """
+    Ringkas hasil parse sebelum disimpan lama di memory: list kartu, atau episodes_list
+    di detail series/episode. Bentuk lain (jadwal, genre, ...) dikembalikan apa adanya.
+    """
+    if type(data) is list:
+        return compact_items(data, CardRecord)
+    if type(data) is dict and type(data.get("episodes_list")) is list:
+        eps = data["episodes_list"]
+        record_cls = SeriesEpisodeRecord if eps and "href" in eps[0] else EpisodeRecord
+        compacted = compact_items(eps, record_cls)
+        return data if compacted is eps else {**data, "episodes_list": compacted}
+    return data
+
+
+def compact_card(card):
+    if type(card) is not dict:
+        return card
+    return CardRecord.from_dict(card) or card
+
+
+def dump_records(records, chunk: int = 256) -> bytes:
+    """
+    Bulk: list record (atau dict) -> JSON array. Di-encode per potongan `chunk` record, jadi
+    dict sementara hasil to_dict tidak menumpuk sekaligus (memory + GC lebih ringan). Potongan
+    yang isinya satu kelas record saja (kasus biasa) lewat map(cls.to_dict) tanpa cek per item.
+    """
+    parts = []
+    for i in range(0, len(records), chunk):
+        part = records[i:i + chunk]
+        types = set(map(type, part))
+        if len(types) == 1 and issubclass(cls := types.pop(), CompactRecord):
+            rows = list(map(cls.to_dict, part))
+        else:
+            rows = [r.to_dict() if isinstance(r, CompactRecord) else r for r in part]
+        parts.append(json_dumps(rows)[1:-1])
+    return b"[" + b",".join(parts) + b"]"
+
+
+def records_json(records):
+    """Seperti cached_json tapi untuk list record: orjson.Fragment hasil dump_records, kalau tidak list-nya."""
+    if not records or not HAS_FRAGMENT:
+        return records
+    return orjson.Fragment(dump_records(records))
+
+
+# --------------------------
+# CATALOG (local store)
+# --------------------------
+# order upstream yang bisa dijawab lokal ("" = default situs, diperlakukan sama dengan update)
+CATALOG_ORDERS = {"", "update", "latest", "rating", "title", "titlereverse"}
+
+
+def card_rating(card) -> float:
+    try:
+        return float(card.get("rating") or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def series_facets(detail) -> dict:
+    """Bagian parse_series_detail yang dipakai filter katalog."""
+    info = detail.get("info") or {}
+    return {
+        "alt_title": detail.get("alt_title", ""),
+        "status": info.get("status", "-"),
+        "type": info.get("type", "-"),
+        "studio": info.get("studio", "-"),
+        "network": info.get("network", "-"),
+        "released": info.get("released", "-"),
+        "genres": [g["slug"] for g in detail.get("genres") or [] if g.get("slug")],
+    }
+
+
+SEARCH_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+# bobot field: judul paling penting, genre/studio cuma pelengkap
+SEARCH_FIELD_WEIGHTS = {"title": 3.0, "alt_title": 2.0, "genres": 1.0, "studio": 1.0}
+SEARCH_MATCH_EXACT, SEARCH_MATCH_PREFIX, SEARCH_MATCH_TYPO = 1.0, 0.8, 0.5
+# query luas (ribuan dokumen cocok): yang diberi skor cuma N dokumen, sisanya tidak disentuh
+SEARCH_MAX_CANDIDATES = 128
+SEARCH_TYPO_MIN_LEN = 4
+
+
+def search_tokens(text: str):
+    text = unicodedata.normalize("NFKD", text or "").lower()
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return SEARCH_TOKEN_RE.findall(text)
+
+
+def deletes1(token: str):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def bitmap_ids(mask: int, limit: int | None = None):
+    """Posisi bit 1 di mask, dari kecil ke besar (paling banyak limit)."""
+    found = re.finditer("1", bin(mask)[:1:-1])
+    return [m.start() for m in itertools.islice(found, limit)]
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """Levenshtein <= 1, plus satu transposisi huruf bersebelahan."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class SearchIndex:
+    """
+    Inverted index in-process di atas katalog: judul, alt_title, genre, studio.
+
+    - token terakhir query dicocokkan sebagai prefix (autocomplete)
+    - token >= SEARCH_TYPO_MIN_LEN yang tidak ketemu dicari dengan salah ketik 1 huruf
+      (deletion index ala SymSpell, lalu dicek within_one_edit)
+    - semua token query harus cocok (AND); skor = sum(kualitas match * bobot field)
+
+    Postings berupa bitmap per token (bit ke-i = series dengan id i, seperti FacetIndex), jadi
+    OR semua penyelesaian prefix dan AND antar token jalan sebagai operasi int; kerja per
+    dokumen cuma untuk kandidat yang diberi skor (paling banyak SEARCH_MAX_CANDIDATES).
+    Kalau kandidatnya lebih banyak, yang diambil: judul yang sama dengan / diawali query (bisect di
+    judul terurut), lalu per tingkat lewat bitmap ranks (token di judul, rating), bukan id terkecil.
+    """
+
+    def __init__(self):
+        self.docs = {}  # slug -> card
+        self.doc_tokens = {}  # slug -> {token: bobot field terbesar}
+        self.doc_titles = {}  # slug -> judul ter-normalisasi (buat bonus ranking)
+        self.ids = {}  # slug -> id (append-only)
+        self.slugs = []  # id -> slug
+        self.postings = {}  # token -> bitmap id dokumen
+        self.ranks = {}  # ("title", token) / ("rating", bucket) -> bitmap id dokumen
+        self.doc_ranks = {}  # slug -> key ranks yang sedang di-set
+        self.rating_buckets = []  # bucket rating yang ada, dari besar ke kecil
+        self.deletes = {}  # token tanpa 1 huruf -> set token
+        self.sorted_tokens = []
+        self._sorted_dirty = False
+        self.sorted_titles = []  # (judul ter-normalisasi, id), dibangun ulang saat dibutuhkan
+        self._titles_dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.docs)
+
+    @staticmethod
+    def doc_fields(card, detail):
+        detail = detail or {}
+        studio = detail.get("studio", "")
+        return {
+            "title": card.get("title", ""),
+            "alt_title": detail.get("alt_title", ""),
+            "genres": " ".join(g.replace("-", " ") for g in detail.get("genres") or ()),
+            "studio": "" if studio == "-" else studio,
+        }
+
+    @staticmethod
+    def rank_keys(title_tokens, card):
+        keys = {("title", tok) for tok in title_tokens}
+        keys.add(("rating", round(card_rating(card), 1)))
+        return keys
+
+    def _remove(self, slug):
+        bit = 1 << self.ids[slug] if slug in self.ids else 0
+        for key in self.doc_ranks.pop(slug, ()):
+            post = self.ranks[key] & ~bit
+            if post:
+                self.ranks[key] = post
+            else:
+                del self.ranks[key]
+                if key[0] == "rating":
+                    self.rating_buckets.remove(key[1])
+        for tok in self.doc_tokens.pop(slug, ()):
+            post = self.postings.get(tok)
+            if post is None:
+                continue
+            post &= ~bit
+            if post:
+                self.postings[tok] = post
+            else:
+                del self.postings[tok]
+                for d in deletes1(tok):
+                    variants = self.deletes.get(d)
+                    if variants is not None:
+                        variants.discard(tok)
+                        if not variants:
+                            del self.deletes[d]
+                self._sorted_dirty = True
+        self.docs.pop(slug, None)
+        if self.doc_titles.pop(slug, None) is not None:
+            self._titles_dirty = True
+
+    def add(self, slug: str, card, detail=None):
+        weights = {}
+        title_tokens = search_tokens(card.get("title", ""))
+        title = " ".join(title_tokens)
+        ranks = self.rank_keys(title_tokens, card)
+        for field, text in self.doc_fields(card, detail).items():
+            w = SEARCH_FIELD_WEIGHTS[field]
+            for tok in search_tokens(text):
+                if weights.get(tok, 0) < w:
+                    weights[tok] = w
+        with self._lock:
+            self._remove(slug)
+            i = self.ids.get(slug)
+            if i is None:
+                i = self.ids[slug] = len(self.slugs)
+                self.slugs.append(slug)
+            bit = 1 << i
+            self.docs[slug] = card
+            self.doc_titles[slug] = title
+            self._titles_dirty = True
+            self.doc_tokens[slug] = weights
+            self.doc_ranks[slug] = ranks
+            for key in ranks:
+                if key not in self.ranks:
+                    self.ranks[key] = 0
+                    if key[0] == "rating":
+                        bisect.insort(self.rating_buckets, key[1], key=lambda b: -b)
+                self.ranks[key] |= bit
+            for tok in weights:
+                post = self.postings.get(tok)
+                if post is None:
+                    post = 0
+                    for d in deletes1(tok):
+                        self.deletes.setdefault(d, set()).add(tok)
+                    self._sorted_dirty = True
+                self.postings[tok] = post | bit
+
+    @classmethod
+    def build(cls, records):
+        """Index baru dari records, dibangun di samping (index yang sedang dipakai tidak disentuh)."""
+        idx = cls()
+        for slug, rec in records.items():
+            idx.add(slug, rec["card"], rec["detail"])
+        return idx
+
+    def replace(self, other):
+        """Ambil isi index lain sekaligus; search yang jalan lihat isi lama atau baru, tidak setengah."""
+        with self._lock:
+            self.docs, self.doc_tokens, self.doc_titles = other.docs, other.doc_tokens, other.doc_titles
+            self.ids, self.slugs = other.ids, other.slugs
+            self.postings, self.deletes = other.postings, other.deletes
+            self.ranks, self.doc_ranks, self.rating_buckets = other.ranks, other.doc_ranks, other.rating_buckets
+            self.sorted_tokens, self._sorted_dirty = other.sorted_tokens, other._sorted_dirty
+            self.sorted_titles, self._titles_dirty = other.sorted_titles, other._titles_dirty
+
+    def rebuild(self, records):
+        self.replace(self.build(records))
+
+    def _variants(self, qtok: str, prefix: bool):
+        """token index yang cocok dengan qtok -> kualitas match."""
+        out = {}
+        if qtok in self.postings:
+            out[qtok] = SEARCH_MATCH_EXACT
+        if prefix:
+            if self._sorted_dirty:
+                self.sorted_tokens = sorted(self.postings)
+                self._sorted_dirty = False
+            toks = self.sorted_tokens
+            i = bisect.bisect_left(toks, qtok)
+            while i < len(toks) and toks[i].startswith(qtok):
+                out.setdefault(toks[i], SEARCH_MATCH_PREFIX)
+                i += 1
+        # salah ketik dicari kalau tidak ada yang cocok, atau token-nya cukup panjang sehingga bisa
+        # saja kata lain yang kebetulan valid; kualitasnya lebih rendah jadi exact/prefix tetap menang
+        if len(qtok) >= SEARCH_TYPO_MIN_LEN and (not out or len(qtok) >= SEARCH_TYPO_MIN_LEN + 2):
+            cands = set(self.deletes.get(qtok, ()))
+            for d in deletes1(qtok):
+                if d in self.postings:
+                    cands.add(d)
+                cands.update(self.deletes.get(d, ()))
+            for tok in cands:
+                if tok not in out and within_one_edit(qtok, tok):
+                    out[tok] = SEARCH_MATCH_TYPO
+        return out
+
+    def _top_candidates(self, cand: int, terms, q: str):
+        """
+        Paling banyak SEARCH_MAX_CANDIDATES id dari cand. Judul == q / diawali q (yang dapat bonus
+        ranking) selalu diambil kalau muat; sisanya per tingkat batas atas skor (semua token query
+        persis di judul, lalu persis/prefix di judul, lalu sisanya), di tiap tingkat rating dari
+        besar. Kerjanya bisect + operasi bitmap, tanpa kerja per dokumen.
+        """
+        cap = SEARCH_MAX_CANDIDATES
+        if self._titles_dirty:
+            ids = self.ids
+            self.sorted_titles = sorted((title, ids[slug]) for slug, title in self.doc_titles.items())
+            self._titles_dirty = False
+        titles = self.sorted_titles
+        lo = bisect.bisect_left(titles, (q,))
+        hi = bisect.bisect_left(titles, (q + "\uffff",), lo)
+        if hi - lo > cap:
+            hi = bisect.bisect_left(titles, (q, len(self.slugs)), lo)  # cuma yang judulnya == q
+        ids = [i for _, i in titles[lo:hi] if cand >> i & 1][:cap]
+        left = cand
+        for i in ids:
+            left &= ~(1 << i)
+
+        ranks = self.ranks
+
+        def exact_title():
+            mask = left
+            for qtok, _ in terms:
+                mask &= ranks.get(("title", qtok), 0)
+            return mask
+
+        def any_title():
+            mask = left
+            for _, variants in terms:
+                m = 0
+                for tok, quality in variants.items():
+                    if quality >= SEARCH_MATCH_PREFIX:
+                        m |= ranks.get(("title", tok), 0)
+                mask &= m
+            return mask
+
+        for tier in (exact_title, any_title, lambda: left):
+            if len(ids) >= cap:
+                break
+            mask = tier() & left
+            if not mask:
+                continue
+            left &= ~mask
+            # bucket rating utuh digabung dulu (urutan kandidat tidak penting sebelum diskor),
+            # bucket terakhir yang cuma muat sebagian diambil id terkecilnya
+            room = cap - len(ids)
+            if mask.bit_count() <= room:
+                ids += bitmap_ids(mask)
+                continue
+            whole = 0
+            for bucket in self.rating_buckets:
+                hits = mask & ranks[("rating", bucket)]
+                n = hits.bit_count()
+                if n >= room:
+                    return ids + bitmap_ids(whole) + bitmap_ids(hits, room)
+                whole |= hits
+                room -= n
+        return ids
+
+    def search(self, query: str, limit: int = 24):
+        qtoks = search_tokens(query)
+        if not qtoks:
+            return []
+        # token query duplikat cuma dihitung sekali; prefix hanya untuk token terakhir
+        seen = {}
+        for i, tok in enumerate(qtoks):
+            seen[tok] = seen.get(tok, False) or i == len(qtoks) - 1
+        with self._lock:
+            postings = self.postings
+            terms = []
+            cand = -1
+            for qtok, prefix in seen.items():
+                variants = self._variants(qtok, prefix)
+                if not variants:
+                    return []
+                mask = 0
+                for tok in variants:
+                    mask |= postings[tok]
+                cand &= mask
+                if not cand:
+                    return []
+                terms.append((qtok, variants))
+
+            if cand.bit_count() > SEARCH_MAX_CANDIDATES:
+                ids = self._top_candidates(cand, terms, " ".join(qtoks))
+            else:
+                ids = bitmap_ids(cand)
+
+            # skor per kandidat dari token dokumennya sendiri (cuma segelintir per judul)
+            slugs, doc_tokens = self.slugs, self.doc_tokens
+            scores = {}
+            for i in ids:
+                slug = slugs[i]
+                total = 0.0
+                for _, variants in terms:
+                    best = 0.0
+                    for tok, w in doc_tokens[slug].items():
+                        quality = variants.get(tok)
+                        if quality is not None and quality * w > best:
+                            best = quality * w
+                    total += best
+                scores[slug] = total
+
+            docs, titles = self.docs, self.doc_titles
+            # skor dasar dulu (murah), baru kandidat teratas diberi bonus judul diawali query + rating
+            top = heapq.nlargest(limit * 4, scores.items(), key=lambda kv: kv[1])
+            q = " ".join(qtoks)
+
+            def rank(kv):
+                bonus = 0.5 if titles[kv[0]].startswith(q) else 0.0
+                return (kv[1] + bonus, card_rating(docs[kv[0]]))
+
+            top.sort(key=rank, reverse=True)
+            return [docs[slug] for slug, _ in top[:limit]]
+
+    def stats(self) -> dict:
+        return {"docs": len(self.docs), "tokens": len(self.postings), "deletes": len(self.deletes)}
+
+
+search_index = SearchIndex()
+
+
+# field facet -> dari mana nilainya (detail menang kalau ada, kartu list sebagai cadangan)
+FACET_FIELDS = ("genre", "status", "type")
+
+
+class FacetIndex:
+    """
+    Bitmap per nilai facet di atas katalog: bit ke-i = series dengan id i.
+
+    Irisan filter (genre AND genre AND status ...) cuma AND beberapa int, jumlahnya
+    int.bit_count(); tidak perlu jalan per series.
+    """
+
+    def __init__(self):
+        self.ids = {}  # slug -> id (append-only)
+        self.values = {}  # slug -> {(field, value)} yang sedang di-set
+        self.bitmaps = {}  # (field, value) -> int
+        self.all = 0
+        self.with_detail = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def doc_values(card, detail):
+        detail = detail or {}
+        out = {("status", (detail.get("status") or card.get("status") or "").lower())}
+        if detail.get("type") and detail["type"] != "-":
+            out.add(("type", detail["type"].lower()))
+        out.update(("genre", g) for g in detail.get("genres") or ())
+        out.discard(("status", ""))
+        out.discard(("status", "-"))
+        return out
+
+    def add(self, slug: str, card, detail=None):
+        values = self.doc_values(card, detail)
+        with self._lock:
+            i = self.ids.get(slug)
+            if i is None:
+                i = self.ids[slug] = len(self.ids)
+            bit = 1 << i
+            old = self.values.get(slug, set())
+            for key in old - values:
+                self.bitmaps[key] &= ~bit
+                if not self.bitmaps[key]:
+                    del self.bitmaps[key]
+            for key in values - old:
+                self.bitmaps[key] = self.bitmaps.get(key, 0) | bit
+            self.values[slug] = values
+            self.all |= bit
+            if detail:
+                self.with_detail |= bit
+            else:
+                self.with_detail &= ~bit
+
+    @classmethod
+    def build(cls, records):
+        idx = cls()
+        for slug, rec in records.items():
+            idx.add(slug, rec["card"], rec["detail"])
+        return idx
+
+    def rebuild(self, records):
+        new = self.build(records)
+        with self._lock:
+            self.ids, self.values, self.bitmaps = new.ids, new.values, new.bitmaps
+            self.all, self.with_detail = new.all, new.with_detail
+
+    def coverage(self) -> float:
+        n = self.all.bit_count()
+        return self.with_detail.bit_count() / n if n else 0.0
+
+    def mask(self, status: str = "", type_: str = "", genres=()) -> int:
+        """Bitmap series yang lolos semua filter (kosong = tidak difilter)."""
+        m = self.all
+        for key in [("status", status.lower()), ("type", type_.lower())] + [("genre", g) for g in genres]:
+            if key[1]:
+                m &= self.bitmaps.get(key, 0)
+                if not m:
+                    break
+        return m
+
+    def counts(self, mask: int, field: str) -> dict:
+        """nilai facet -> jumlah series di mask yang punya nilai itu (yang 0 dibuang)."""
+        out = {}
+        for (f, value), bm in self.bitmaps.items():
+            if f == field:
+                n = (bm & mask).bit_count()
+                if n:
+                    out[value] = n
+        return dict(sorted(out.items(), key=lambda kv: (-kv[1], kv[0])))
+
+    def stats(self) -> dict:
+        return {"series": len(self.ids), "bitmaps": len(self.bitmaps)}
+
+
+class Catalog:
+    """
+    Katalog series lokal (memory + tabel SQLite), diisi dari halaman order=update.
+
+    record: {"card": parse_card(), "detail": series_facets() | None, "seq": urutan update,
+             "added": kapan pertama terlihat, "changed_at": kapan current_episode terakhir berubah,
+             "detail_at": kapan detail terakhir diambil}
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS catalog ("
+        " slug TEXT PRIMARY KEY, card TEXT, detail TEXT, seq REAL, added REAL, changed_at REAL, detail_at REAL)",
+        "CREATE TABLE IF NOT EXISTS catalog_meta (name TEXT PRIMARY KEY, value TEXT, expires REAL)",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = {}
+        self.page_size = 0
+        self.ready = False
+        self.synced_at = 0.0
+        self.version = 0
+        self.owner = f"{os.getpid()}-{id(self)}"
+        self._lock = threading.Lock()
+        self._ordered = {}
+        self.facets = FacetIndex()
+        self.genres = []
+        self.genres_at = 0.0
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout=10000")
+            conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in self.SCHEMA:
+                conn.execute(stmt)
+            self._local.conn = conn
+        return conn
+
+    # --- persistence ---
+    def _meta(self, name: str, default=""):
+        row = self._conn().execute("SELECT value FROM catalog_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, conn, name: str, value):
+        conn.execute(
+            "INSERT INTO catalog_meta (name, value, expires) VALUES (?, ?, 0)"
+            " ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+            (name, str(value)),
+        )
+
+    def load(self):
+        try:
+            rows = self._conn().execute("SELECT slug, card, detail, seq, added, changed_at, detail_at FROM catalog").fetchall()
+            records = {
+                slug: {
+                    "card": compact_card(json.loads(card)),
+                    "detail": json.loads(detail) if detail else None,
+                    "seq": seq,
+                    "added": added,
+                    "changed_at": changed_at or 0.0,
+                    "detail_at": detail_at or 0.0,
+                }
+                for slug, card, detail, seq, added, changed_at, detail_at in rows
+            }
+            # index dibangun di samping lalu ditukar bareng records dalam satu lock:
+            # query tidak pernah lihat records baru dengan facet id / search index lama
+            facets = FacetIndex.build(records)
+            search = SearchIndex.build(records)
+            with self._lock:
+                self.records = records
+                self.facets = facets
+                search_index.replace(search)
+                self.page_size = int(self._meta("page_size", "0") or 0)
+                self.ready = self._meta("ready") == "1"
+                self.synced_at = float(self._meta("synced_at", "0") or 0)
+                self.version = int(self._meta("version", "0") or 0)
+                self.genres = json.loads(self._meta("genres", "[]") or "[]")
+                self.genres_at = float(self._meta("genres_at", "0") or 0)
+                self._ordered = {}
+        except Exception as e:
+            print(f"[Catalog.load] Error {self.path}: {e}")
+
+    def save(self, slugs, bump: bool = True):
+        """
+        Tulis record yang berubah + meta. Version cuma dinaikkan (worker lain reload penuh)
+        kalau bump, yaitu ada isi katalog yang benar-benar berubah.
+        """
+        try:
+            conn = self._conn()
+            with self._lock:
+                rows = [
+                    (
+                        slug,
+                        json.dumps(rec["card"], ensure_ascii=False, default=json_default),
+                        json.dumps(rec["detail"], ensure_ascii=False) if rec["detail"] else None,
+                        rec["seq"],
+                        rec["added"],
+                        rec["changed_at"],
+                        rec["detail_at"],
+                    )
+                    for slug in slugs
+                    if (rec := self.records.get(slug))
+                ]
+                if bump:
+                    self.version += 1
+                meta = {
+                    "page_size": self.page_size,
+                    "ready": "1" if self.ready else "0",
+                    "synced_at": self.synced_at,
+                    "version": self.version,
+                    "genres": json.dumps(self.genres, ensure_ascii=False),
+                    "genres_at": self.genres_at,
+                }
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("INSERT OR REPLACE INTO catalog VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                for k, v in meta.items():
+                    self._set_meta(conn, k, v)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            print(f"[Catalog.save] Error {self.path}: {e}")
+
+    def acquire_lease(self, ttl: float) -> bool:
+        """Cuma satu worker yang nge-sync; yang lain reload dari SQLite."""
+        now = time.time()
+        try:
+            conn = self._conn()
+            conn.execute("INSERT OR IGNORE INTO catalog_meta (name, value, expires) VALUES ('sync_lease', '', 0)")
+            cur = conn.execute(
+                "UPDATE catalog_meta SET value = ?, expires = ? WHERE name = 'sync_lease' AND (value = ? OR expires < ?)",
+                (self.owner, now + ttl, self.owner, now),
+            )
+            return cur.rowcount == 1
+        except Exception as e:
+            print(f"[Catalog.acquire_lease] Error {self.path}: {e}")
+            return False
+
+    def reload_if_changed(self):
+        try:
+            if int(self._meta("version", "0") or 0) != self.version:
+                self.load()
+        except Exception as e:
+            print(f"[Catalog.reload_if_changed] Error {self.path}: {e}")
+
+    # --- updates ---
+    def upsert_cards(self, cards, seq_start: float, stop_at_known: bool):
+        """
+        Upsert kartu dari halaman order=update (urutan terbaru dulu).
+        Return (slug yang berubah, ketemu series yang sudah dikenal & tidak berubah).
+        """
+        changed = []
+        reached = False
+        now = time.time()
+        with self._lock:
+            for i, card in enumerate(cards):
+                slug = card.get("slug")
+                if not slug:
+                    continue
+                card = compact_card(card)
+                rec = self.records.get(slug)
+                unchanged = rec is not None and rec["card"].get("current_episode") == card.get("current_episode")
+                if unchanged:
+                    reached = True
+                    if stop_at_known:
+                        break
+                if rec is None:
+                    rec = self.records[slug] = {"card": card, "detail": None, "seq": 0.0, "added": now, "detail_at": 0.0}
+                if not unchanged:
+                    rec["changed_at"] = now
+                rec["card"] = card
+                rec["seq"] = seq_start - i
+                changed.append(slug)
+                self.facets.add(slug, card, rec["detail"])
+                search_index.add(slug, card, rec["detail"])
+            if changed:
+                self._ordered = {}
+        return changed, reached
+
+    def set_detail(self, slug: str, detail) -> bool:
+        """Return True kalau facet detail series ini berubah (bukan cuma detail_at)."""
+        facets = series_facets(detail)
+        with self._lock:
+            rec = self.records.get(slug)
+            if rec is None:
+                return False
+            rec["detail_at"] = time.time()
+            if rec["detail"] == facets:
+                return False
+            rec["detail"] = facets
+            self._ordered = {}
+        self.facets.add(slug, rec["card"], rec["detail"])
+        search_index.add(slug, rec["card"], rec["detail"])
+        return True
+
+    def details_due(self, limit: int, max_age: float):
+        """Slug yang detailnya belum ada / kadaluarsa / series-nya update setelah detail diambil."""
+        now = time.time()
+        with self._lock:
+            due = [
+                (rec["seq"], slug)
+                for slug, rec in self.records.items()
+                if rec["detail"] is None or now - rec["detail_at"] > max_age or rec["changed_at"] > rec["detail_at"]
+            ]
+        due.sort(reverse=True)
+        return [slug for _, slug in due[:limit]]
+
+    # --- queries ---
+    def detail_coverage(self) -> float:
+        return self.facets.coverage()
+
+    def ordered(self, order: str):
+        """
+        (facet index, [(facet id, card)]) urut sesuai order; di-cache sampai katalog berubah.
+        Facet index-nya ikut dikembalikan supaya mask dihitung dari index yang sama dengan id-nya.
+        """
+        with self._lock:
+            cached = self._ordered.get(order)
+            if cached is not None:
+                return cached
+            recs = list(self.records.items())
+            if order == "rating":
+                recs.sort(key=lambda kv: (card_rating(kv[1]["card"]), kv[1]["seq"]), reverse=True)
+            elif order in ("title", "titlereverse"):
+                recs.sort(key=lambda kv: kv[1]["card"].get("title", "").lower(), reverse=order == "titlereverse")
+            elif order == "latest":
+                recs.sort(key=lambda kv: kv[1]["added"], reverse=True)
+            else:
+                recs.sort(key=lambda kv: kv[1]["seq"], reverse=True)
+            ids = self.facets.ids
+            out = self._ordered[order] = (self.facets, [(ids[slug], rec["card"]) for slug, rec in recs])
+            return out
+
+    def can_filter(self, type_, sub, genres) -> bool:
+        # kartu list selalu "Sub", jadi filter sub tidak bisa dijawab lokal;
+        # genre/type butuh detail series yang cukup lengkap
+        if not self.ready or sub:
+            return False
+        return not (genres or type_) or self.detail_coverage() >= CATALOG_MIN_COVERAGE
+
+    def query(self, page: int, status: str = "", type_: str = "", sub: str = "", order: str = "", genres=None):
+        """Halaman kartu dari katalog, atau None kalau query ini harus ke upstream."""
+        order = order or ""
+        genres = [g for g in (genres or []) if g]
+        if not self.page_size or order not in CATALOG_ORDERS or not self.can_filter(type_, sub, genres):
+            return None
+
+        facets, rows = self.ordered(order)
+        mask = facets.mask(status or "", type_ or "", genres)
+        start = (max(1, page) - 1) * self.page_size
+        if not mask or start >= mask.bit_count():
+            return []
+        # geser int besar per series itu O(n); bytes cukup sekali konversi lalu cek O(1)
+        bits = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        nbits = len(bits) * 8
+        out = []
+        skipped = 0
+        for i, card in rows:
+            if i >= nbits or not bits[i >> 3] >> (i & 7) & 1:
+                continue
+            if skipped < start:
+                skipped += 1
+                continue
+            out.append(card)
+            if len(out) >= self.page_size:
+                break
+        return out
+
+    def facet_counts(self, status: str = "", type_: str = "", genres=None):
+        """{"total": n, "facets": {field: {nilai: jumlah}}} untuk filter ini, atau None kalau belum bisa."""
+        genres = [g for g in (genres or []) if g]
+        if not self.ready or self.detail_coverage() < CATALOG_MIN_COVERAGE:
+            return None
+        mask = self.facets.mask(status or "", type_ or "", genres)
+        return {
+            "total": mask.bit_count(),
+            "facets": {field: self.facets.counts(mask, field) for field in FACET_FIELDS},
+        }
 
+    def stats(self) -> dict:
+        return {
+            "enabled": CATALOG_ENABLED,
+            "ready": self.ready,
+            "series": len(self.records),
+            "page_size": self.page_size,
+            "detail_coverage": round(self.detail_coverage(), 4),
+            "synced_at": self.synced_at,
+            "version": self.version,
+            "search": search_index.stats(),
+            "facets": self.facets.stats(),
+            "genres": len(self.genres),
+            "genres_at": self.genres_at,
+        }
 
-# --------------------------
-# PARSERS
-# --------------------------
-def parse_card(element, is_schedule: bool = False):
-    try:
-        a = element.select_one("a")
-        if not a or not a.get("href"):
-            return None
 
-        url = abs_url(a["href"])
-        slug = extract_slug(url)
+catalog = Catalog(CATALOG_PATH)
 
-        title_el = (
-            element.select_one("div.tt")
-            or element.select_one(".entry-title")
-            or element.select_one("h2")
-            or element.select_one("h3")
-        )
-        title = safe_text(title_el) or safe_text(a)
 
-        img = element.select_one("img")
-        poster = ""
-        if img:
-            poster = pick_first(
-                img.get("data-src", ""),
-                img.get("src", ""),
-                (img.get("srcset", "").split(" ")[0] if img.get("srcset") else ""),
-            )
-        poster = abs_url(poster) if poster else ""
+def catalog_search(query: str):
+    """Hasil search lokal, atau None kalau harus ke upstream (katalog belum siap / tidak ketemu)."""
+    if not (CATALOG_ENABLED and SEARCH_LOCAL and catalog.ready):
+        return None
+    return records_json(search_index.search(query, SEARCH_LIMIT)) or None
 
-        ep_el = element.select_one("div.epx") or element.select_one(".ep") or element.select_one(".episode")
-        ep_txt = safe_text(ep_el)
 
-        status_el = element.select_one("div.status") or element.select_one(".stat") or element.select_one(".status")
-        status = safe_text(status_el) or "Ongoing"
+def catalog_list(page: int, status, type_, sub, order, genres):
+    if not CATALOG_ENABLED:
+        return None
+    return records_json(catalog.query(page, status or "", type_ or "", sub or "", order or "", genres))
 
-        type_el = element.select_one("div.typez") or element.select_one(".type") or element.select_one(".typez")
-        type_show = safe_text(type_el) or "Donghua"
 
-        rating_el = (
-            element.select_one(".numscore")
-            or element.select_one(".rating")
-            or element.select_one(".score")
-            or element.select_one(".imdb")
-        )
-        rating = safe_text(rating_el)
+async def catalog_sync_once(max_pages: int = CATALOG_SYNC_MAX_PAGES) -> int:
+    """
+    Jalan di halaman order=update sampai ketemu series yang sudah dikenal (atau sampai habis
+    kalau katalog belum pernah lengkap). Katalog dibatasi max_pages halaman.
+    Return jumlah series baru/berubah.
+    """
+    url = f"{BASE_URL}/anime/"
+    seq_start = time.time() * 1e6
+    incremental = catalog.ready
+    meta_before = (catalog.page_size, catalog.ready)
+    changed = []
+    complete = False
+    pos = 0
+    for page in range(1, max_pages + 1):
+        try:
+            cards = await scrape_async("list", url, build_list_params(page, "", "", "", "update", None))
+        except UpstreamBusy:
+            cards = None
+        if cards is None:
+            break
+        if not cards:
+            complete = True
+            break
+        if page == 1:
+            catalog.page_size = len(cards)
+        slugs, reached = catalog.upsert_cards(cards, seq_start - pos, stop_at_known=incremental)
+        changed += [s for s in slugs if s not in changed]
+        pos += len(cards)
+        if incremental and reached:
+            complete = True
+            break
+    else:
+        complete = True
 
-        data = {
-            "title": title,
-            "slug": slug,
-            "poster": poster,
-            "status": status,
-            "type": type_show,
-            "rating": rating,
-            "sub": "Sub",
-            "href": f"/donghua/detail/{slug}",
-            "anichinUrl": url,
-        }
+    if complete:
+        catalog.ready = True
+        catalog.synced_at = time.time()
+    # tanpa perubahan: cuma synced_at yang ditulis, version tetap (worker lain tidak reload)
+    bump = bool(changed) or (catalog.page_size, catalog.ready) != meta_before
+    await asyncio.get_running_loop().run_in_executor(None, catalog.save, changed, bump)
+    return len(changed)
 
-        if is_schedule:
-            time_el = element.select_one("div.time") or element.select_one(".time")
-            time_txt = safe_text(time_el)
-            m_time = re.search(r"(\d{1,2}:\d{2})", time_txt)
-            data["upload_at"] = m_time.group(1) if m_time else ""
 
-            m_ep = re.search(r"(\d+)", ep_txt)
-            data["episode"] = m_ep.group(1) if m_ep else (ep_txt or "??")
-        else:
-            data["current_episode"] = ep_txt or "??"
+async def catalog_refresh_details(limit: int = CATALOG_DETAIL_BATCH) -> int:
+    slugs = catalog.details_due(limit, CATALOG_DETAIL_MAX_AGE)
+    sem = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
 
-        return data
-    except Exception as e:
-        print("[parse_card] error:", e)
+    async def one(slug):
+        # path dari kartu, host dari BASE_URL (mirror/mock tetap kena)
+        path = urlsplit(catalog.records[slug]["card"].get("anichinUrl") or "").path or f"/seri/{slug}/"
+        url = abs_url(path)
+        async with sem:
+            try:
+                data = await scrape_async("series", url)
+            except UpstreamBusy:
+                return None  # dicoba lagi putaran berikutnya
+        if data:
+            return slug, catalog.set_detail(slug, data)
         return None
 
+    done = [r for r in await asyncio.gather(*(one(s) for s in slugs)) if r]
+    if done:
+        # detail_at tetap disimpan (jadwal refresh), version cuma naik kalau facet berubah
+        bump = any(changed for _, changed in done)
+        await asyncio.get_running_loop().run_in_executor(None, catalog.save, [s for s, _ in done], bump)
+    return len(done)
 
-def parse_list_page(soup):
-    if not soup:
-        return []
 
-    cards = soup.select("div.listupd article.bs")
-    if not cards:
-        cards = soup.select("div.listupd div.bs")
+async def catalog_refresh_genres(force: bool = False) -> bool:
+    """Daftar genre (halaman filter /anime/) cukup diambil tiap CATALOG_GENRES_REFRESH detik."""
+    if not force and catalog.genres and time.time() - catalog.genres_at < CATALOG_GENRES_REFRESH:
+        return False
+    data = await scrape_async("genres", f"{BASE_URL}/anime/", GENRES_PARAMS)
+    if not data:
+        return False
+    bump = data != catalog.genres
+    catalog.genres = data
+    catalog.genres_at = time.time()
+    await asyncio.get_running_loop().run_in_executor(None, catalog.save, [], bump)
+    return True
 
-    out = []
-    for it in cards:
-        c = parse_card(it)
-        if c:
-            out.append(c)
-    return out
 
+async def catalog_loop():
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            leader = await loop.run_in_executor(None, catalog.acquire_lease, CATALOG_SYNC_INTERVAL * 2)
+            if leader:
+                await catalog_sync_once()
+                await catalog_refresh_genres()
+                await catalog_refresh_details()
+            else:
+                await loop.run_in_executor(None, catalog.reload_if_changed)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[catalog_loop] Error: {e}")
+        await asyncio.sleep(CATALOG_SYNC_INTERVAL if catalog.ready else 5)
 
-def parse_series_detail(soup, url: str):
-    title = safe_text(soup.select_one("h1.entry-title")) or safe_text(soup.select_one("h1")) or ""
-    alt_title = ""
-    alt_el = (
-        soup.select_one(".seriestitl .alter, .seriestitl .alttitle, .seriestitl h2")
-        or soup.select_one("div.seriestitl h2")
-    )
-    alt_title = safe_text(alt_el)
-
-    thumb = soup.select_one("div.thumb img") or soup.select_one(".thumb img") or soup.select_one("img")
-    poster = abs_url(thumb.get("src", "")) if thumb else ""
-
-    short_desc = ""
-    entry = soup.select_one("div.entry-content") or soup.select_one("article")
-    if entry:
-        for p in entry.select("p"):
-            t = normalize_label(p.get_text(" ", strip=True))
-            if len(t) > 80:
-                short_desc = t
-                break
 
-    info = {
-        "status": "-",
-        "network": "-",
-        "studio": "-",
-        "released": "-",
-        "duration": "-",
-        "country": "-",
-        "type": "-",
-        "episodes": "-",
-        "fansub": "-",
-        "posted by": "-",
-        "released on": "-",
-        "updated on": "-",
-    }
+# --------------------------
+# SCHEDULE (precomputed)
+# --------------------------
+# nama hari dari situs (English / Indonesia) -> 0=Senin .. 6=Minggu, sama dengan datetime.weekday()
+DAY_INDEX = {
+    "monday": 0, "senin": 0,
+    "tuesday": 1, "selasa": 1,
+    "wednesday": 2, "rabu": 2,
+    "thursday": 3, "kamis": 3,
+    "friday": 4, "jumat": 4, "jum'at": 4,
+    "saturday": 5, "sabtu": 5,
+    "sunday": 6, "minggu": 6, "ahad": 6,
+}
+TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
 
-    for sp in soup.select("div.spe span"):
-        k, v = split_label_value(sp.get_text(" ", strip=True))
-        if not k:
-            continue
-        if "status" in k:
-            info["status"] = v
-        elif "network" in k:
-            info["network"] = v
-        elif "studio" in k:
-            info["studio"] = v
-        elif k == "released":
-            info["released"] = v
-        elif "duration" in k:
-            info["duration"] = v
-        elif "country" in k:
-            info["country"] = v
-        elif k == "type":
-            info["type"] = v
-        elif "episodes" in k:
-            info["episodes"] = v
-        elif "fansub" in k:
-            info["fansub"] = v
-        elif "posted" in k:
-            info["posted by"] = v
-        elif "released on" in k:
-            info["released on"] = v
-        elif "updated on" in k:
-            info["updated on"] = v
 
-    genres = []
-    seen = set()
-    for a in soup.select("div.genxed a, .genxed a, a[href*='/genre/'], a[href*='/genres/']"):
-        name = safe_text(a)
-        href = abs_url(a.get("href", ""))
-        if not name:
-            continue
-        slug = extract_slug(href) if href else re.sub(r"\s+", "-", name.lower())
-        key = slug or name.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        genres.append({"name": name, "slug": slug, "anichinUrl": href})
+def day_index(name: str):
+    return DAY_INDEX.get((name or "").strip().lower())
 
-    synopsis_title = "Synopsis"
-    synopsis_text = ""
 
-    syn_head = None
-    for h in soup.select("h2, h3, h4"):
-        if "synopsis" in safe_text(h).lower():
-            syn_head = h
-            synopsis_title = safe_text(h) or "Synopsis"
-            break
+def hhmm_minutes(value: str):
+    m = TIME_RE.match((value or "").strip())
+    if not m or int(m.group(1)) > 23 or int(m.group(2)) > 59:
+        return None
+    return int(m.group(1)) * 60 + int(m.group(2))
 
-    if syn_head:
-        parts = []
-        for sib in syn_head.find_all_next():
-            if sib.name in ("h2", "h3", "h4"):
-                break
-            if sib.name in ("p", "div"):
-                txt = normalize_label(sib.get_text(" ", strip=True))
-                if txt:
-                    parts.append(txt)
-        synopsis_text = "\n".join(parts).strip()
-    else:
-        syn = soup.select_one("div.entry-content[itemprop='description']") or soup.select_one("div.entry-content")
-        if syn:
-            synopsis_text = syn.get_text("\n", strip=True)
-
-    episodes_list = []
-    for a in soup.select("ul#episode_list li a, .eplister li a, .episodelist li a"):
-        href = a.get("href", "")
-        if not href:
-            continue
-        full = abs_url(href)
-
-        ep_num = a.select_one(".epl-num")
-        ep_title = a.select_one(".epl-title")
-        ep_text = normalize_label(f"{safe_text(ep_num)} {safe_text(ep_title)}").strip()
-        if not ep_text:
-            ep_text = safe_text(a)
-
-        episodes_list.append(
-            {
-                "episode": ep_text,
-                "slug": extract_slug(full),
-                "href": f"/donghua/episode/{extract_slug(full)}",
-                "anichinUrl": full,
-            }
-        )
 
-    return {
-        "status": "success",
-        "creator": CREATOR,
-        "title": title,
-        "alt_title": alt_title,
-        "short_description": short_desc,
-        "poster": poster,
-        "slug": extract_slug(url),
-        "info": info,
-        "genres": genres,
-        "synopsis_title": synopsis_title,
-        "synopsis": synopsis_text,
-        "episodes_list": episodes_list,
-        "anichinUrl": url,
-    }
+def schedule_now():
+    """(hari ini, menit sekarang) di zona waktu situs."""
+    t = time.gmtime(time.time() + SCHEDULE_TZ_OFFSET * 3600)
+    return t.tm_wday, t.tm_hour * 60 + t.tm_min
 
 
-def parse_episode_detail(soup, url: str):
-    episode_title = safe_text(soup.select_one("h1.entry-title")) or "Episode"
+class ScheduleStore:
+    """
+    Hasil parse_schedule yang di-index per hari dan upload_at (menit sejak 00:00),
+    jadi filter day/from/to cuma bisect di list kecil, tanpa scrape/parse ulang.
+    """
 
-    # STREAM SERVERS
-    servers = []
+    def __init__(self):
+        self.days = []  # output parse_schedule apa adanya (urutan situs)
+        self.slots = {}  # index hari -> [(menit, urutan, card)] terurut; tanpa jam -> menit -1
+        self.names = {}  # index hari -> nama hari dari situs
+        self.digest = ""
+        self.version = 0
+        self.updated_at = 0.0
+        self.checked_at = 0.0
 
-    for li in soup.select("ul#playeroptionsul li"):
-        name = safe_text(li.select_one(".title")) or safe_text(li) or "Server"
-        raw = li.get("data-src") or li.get("data-url") or ""
-        clean = decode_url(raw)
-        if clean and "http" in clean:
-            servers.append({"name": name, "url": clean})
+    def update(self, days) -> bool:
+        """Pasang hasil parse baru; return True kalau isinya berubah."""
+        self.checked_at = time.time()
+        digest = hashlib.sha1(json.dumps(days, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        if digest == self.digest:
+            return False
+        slots, names = {}, {}
+        for block in days:
+            d = day_index(block.get("day", ""))
+            if d is None:
+                continue
+            names[d] = block["day"]
+            items = slots.setdefault(d, [])
+            for card in block.get("donghua_list") or []:
+                m = hhmm_minutes(card.get("upload_at", ""))
+                items.append((-1 if m is None else m, len(items), card))
+        for items in slots.values():
+            items.sort(key=lambda x: (x[0], x[1]))
+        self.days, self.slots, self.names = days, slots, names
+        self.digest = digest
+        self.version += 1
+        self.updated_at = self.checked_at
+        return True
 
-    if not servers:
-        sel = soup.select_one("select.mirror")
-        if sel:
-            for opt in sel.select("option"):
-                name = safe_text(opt) or "Server"
-                raw = opt.get("value", "")
-                clean = decode_url(raw)
-                if clean and "http" in clean:
-                    servers.append({"name": name, "url": clean})
+    def window(self, day: int, lo: int, hi: int):
+        """Card hari `day` dengan lo <= upload_at < hi (menit)."""
+        items = self.slots.get(day, [])
+        i = bisect.bisect_left(items, (lo, -1))
+        j = bisect.bisect_left(items, (hi, -1))
+        return [card for _, _, card in items[i:j]]
 
-    if not servers:
-        iframe = soup.select_one(".video-content iframe") or soup.select_one("iframe")
-        if iframe and iframe.get("src"):
-            servers.append({"name": "Default", "url": iframe["src"]})
+    def query(self, day=None, start=None, end=None):
+        """
+        day: index hari atau None (semua). start/end: menit; kalau end <= start, jendela
+        menyeberang tengah malam ke hari berikutnya. Tanpa start/end: semua card hari itu
+        (termasuk yang tanpa jam).
+        """
+        days = [day] if day is not None else sorted(self.slots)
+        out = []
+        for d in days:
+            if start is None and end is None:
+                cards = [card for _, _, card in self.slots.get(d, [])]
+                if cards:
+                    out.append({"day": self.names[d], "donghua_list": cards})
+                continue
+            lo = 0 if start is None else start
+            hi = 24 * 60 if end is None else end
+            if hi > lo:
+                parts = [(d, self.window(d, lo, hi))]
+            elif day is None:
+                # semua hari: jendela lewat tengah malam = awal + akhir hari yang sama
+                parts = [(d, self.window(d, 0, hi) + self.window(d, lo, 24 * 60))]
+            else:
+                nxt = (d + 1) % 7
+                parts = [(d, self.window(d, lo, 24 * 60)), (nxt, self.window(nxt, 0, hi))]
+            for pd, cards in parts:
+                if cards:
+                    out.append({"day": self.names[pd], "donghua_list": cards})
+        return out
 
-    main_url = servers[0] if servers else {"name": "Default", "url": ""}
+    def stats(self) -> dict:
+        return {
+            "days": len(self.slots),
+            "items": sum(len(v) for v in self.slots.values()),
+            "version": self.version,
+            "updated_at": self.updated_at,
+            "checked_at": self.checked_at,
+        }
 
-    # DOWNLOADS
-    downloads = {}
 
-    dl_sections = []
-    for box in soup.select("div, section, article"):
-        t = normalize_label(box.get_text(" ", strip=True)).lower()
-        if "download" in t and any(x in t for x in ["240p", "360p", "480p", "720p", "1080p"]):
-            dl_sections.append(box)
+schedule_store = ScheduleStore()
 
-    dl_sections += soup.select("div.mctnx div.soraddl, div.soraurl, div.dl-box")
 
-    def add_links(res_key: str, container):
-        links_map = {}
-        for a in container.select("a"):
-            provider = safe_text(a)
-            href = a.get("href", "")
-            if provider and href and href.startswith("http"):
-                links_map[provider] = href
-        if links_map:
-            downloads[res_key] = links_map
-
-    for sec in dl_sections:
-        rows = sec.select("tr, li, .row, .dlrow, .dldiv, div")
-        if not rows:
-            rows = [sec]
-
-        for r in rows:
-            txt = normalize_label(r.get_text(" ", strip=True)).lower()
-            m = re.search(r"(240|360|480|720|1080)p", txt)
-            if not m:
-                continue
-            res = m.group(1)
-            add_links(f"download_url_{res}p", r)
-
-    # NAV
-    nav = {}
-    nav_prev = soup.select_one("div.nvs .nav-previous a") or soup.select_one("a[rel='prev']")
-    nav_next = soup.select_one("div.nvs .nav-next a") or soup.select_one("a[rel='next']")
-
-    if nav_prev and nav_prev.get("href"):
-        u = abs_url(nav_prev["href"])
-        nav["previous_episode"] = {"slug": extract_slug(u), "anichinUrl": u}
-    if nav_next and nav_next.get("href"):
-        u = abs_url(nav_next["href"])
-        nav["next_episode"] = {"slug": extract_slug(u), "anichinUrl": u}
-
-    episodes_list = []
-    for a in soup.select("div.bixbox.lpl li a"):
-        href = a.get("href", "")
-        if not href:
-            continue
-        full = abs_url(href)
-        ep_txt = safe_text(a.select_one(".lpl_title")) or safe_text(a)
-        episodes_list.append({"episode": ep_txt, "slug": extract_slug(full), "anichinUrl": full})
+async def schedule_refresh() -> bool:
+    """Ambil /schedule/ dari upstream (lewat single-flight, bukan cache) dan pasang kalau berubah."""
+    url = f"{BASE_URL}/schedule/"
+    days = await flights.do_async(cache_key("schedule", url, None), lambda: _scrape_async("schedule", url))
+    if not days:
+        return False
+    return schedule_store.update(days)
 
-    return {
-        "status": "success",
-        "creator": CREATOR,
-        "episode": episode_title,
-        "streaming": {"main_url": main_url, "servers": servers},
-        "download_url": downloads,
-        "navigation": nav,
-        "episodes_list": episodes_list,
-        "anichinUrl": url,
-    }
 
+async def schedule_loop():
+    while True:
+        try:
+            await schedule_refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[schedule_loop] Error: {e}")
+        await asyncio.sleep(SCHEDULE_REFRESH if schedule_store.days else 5)
 
-def scrape_all_genres():
-    soup = get_soup(f"{BASE_URL}/anime/", params={"status": "", "order": ""})
-    if not soup:
-        return []
 
-    results = []
-    seen = set()
+# --------------------------
+# RANGE STREAM (NDJSON)
+# --------------------------
+PAGES_SPEC_RE = re.compile(r"\s*(\d+)\s*(?:-\s*(\d+))?\s*")
 
-    for inp in soup.select("input[name='genre[]']"):
-        slug = (inp.get("value") or "").strip()
-        if not slug:
-            continue
 
-        lab = None
-        if inp.get("id"):
-            lab = soup.select_one(f"label[for='{inp.get('id')}']")
-        if not lab:
-            lab = inp.find_parent("label")
-        name = safe_text(lab) or slug.replace("-", " ").title()
+def parse_pages_spec(spec: str):
+    m = PAGES_SPEC_RE.fullmatch(spec or "")
+    if not m:
+        raise HTTPException(status_code=400, detail="Format pages salah, contoh: pages=1-20")
+    lo = max(1, int(m.group(1)))
+    hi = int(m.group(2) or lo)
+    if hi < lo:
+        raise HTTPException(status_code=400, detail="pages: halaman akhir lebih kecil dari awal")
+    if hi - lo + 1 > RANGE_MAX_PAGES:
+        # jangan dipotong diam-diam: client mengira sudah dapat semua halaman
+        raise HTTPException(status_code=400, detail=f"pages: maksimal {RANGE_MAX_PAGES} halaman per request")
+    return lo, hi
 
-        if slug not in seen:
-            seen.add(slug)
-            results.append(
-                {
-                    "name": name,
-                    "slug": slug,
-                    "href": f"/donghua/genres/{slug}",
-                    "anichinUrl": f"{BASE_URL}/anime/?genre%5B%5D={slug}&status=&type=&sub=&order=",
-                }
-            )
 
-    if not results:
-        for opt in soup.select("select option"):
-            v = (opt.get("value") or "").strip()
-            t = safe_text(opt)
-            if v and re.fullmatch(r"[a-z0-9-]+", v) and t and v not in seen:
-                seen.add(v)
-                results.append(
-                    {
-                        "name": t,
-                        "slug": v,
-                        "href": f"/donghua/genres/{v}",
-                        "anichinUrl": f"{BASE_URL}/anime/?genre%5B%5D={v}&status=&type=&sub=&order=",
-                    }
-                )
+async def iter_list_pages(lo: int, hi: int, make_params):
+    """
+    Yield (page, cards) berurutan; paling banyak RANGE_FANOUT halaman in-flight. Berhenti di
+    halaman kosong ([] = list habis); fetch gagal di-yield sebagai (page, None) lalu berhenti.
+    UpstreamBusy dari governor/breaker diteruskan ke pemanggil.
+    """
+    url = f"{BASE_URL}/anime/"
+    pending = {}
+    nxt = lo
+    try:
+        for page in range(lo, hi + 1):
+            while nxt <= hi and len(pending) < RANGE_FANOUT:
+                pending[nxt] = asyncio.ensure_future(scrape_async("list", url, make_params(nxt)))
+                nxt += 1
+            cards = await pending.pop(page)
+            if cards == []:
+                break
+            yield page, cards
+            if cards is None:
+                break
+    finally:
+        for task in pending.values():
+            task.cancel()
 
-    results.sort(key=lambda x: x["name"].lower())
-    return results
+
+def stream_error(page: int, error: str) -> bytes:
+    return json_dumps({"page": page, "status": "error", "error": error}) + b"\n"
+
+
+async def stream_list_pages(spec: str, make_params):
+    """
+    NDJSON satu kartu per baris. Halaman pertama di-fetch sebelum respons dimulai: gagal ->
+    502, sibuk -> 503 (status biasa). Setelah itu gagal/sibuk ditulis sebagai baris error
+    {"page", "status": "error", "error"} dan stream ditutup rapi, jadi client bisa membedakan
+    error dengan list yang memang habis.
+    """
+    lo, hi = parse_pages_spec(spec)
+    pages = iter_list_pages(lo, hi, make_params)
+    try:
+        first = await anext(pages, None)
+    except BaseException:
+        await pages.aclose()
+        raise
+    if first is not None and first[1] is None:
+        await pages.aclose()
+        raise HTTPException(status_code=502, detail=f"Gagal akses halaman list {first[0]} dari upstream")
+
+    async def body():
+        nxt = first
+        try:
+            while nxt is not None:
+                page, cards = nxt
+                if cards is None:
+                    yield stream_error(page, "Gagal akses halaman dari upstream")
+                    return
+                for c in cards:
+                    row = c.to_dict() if isinstance(c, CompactRecord) else c
+                    yield json_dumps({"page": page, **row}) + b"\n"
+                try:
+                    nxt = await anext(pages, None)
+                except UpstreamBusy as e:
+                    yield stream_error(page + 1, str(e))
+                    return
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
 
 
 # --------------------------
 # ENDPOINTS
 # --------------------------
 @app.get("/")
-def root():
-    return {"status": "success", "creator": CREATOR, "docs": "/docs"}
+async def root():
+    return reply({"status": "success", "creator": CREATOR, "docs": "/docs"})
+
+
+@app.get("/api/cache")
+async def cache_stats():
+    return reply({
+        "status": "success",
+        "creator": CREATOR,
+        "cache": response_cache.stats(),
+        "singleflight": flights.stats(),
+        "disk": disk_cache.stats() if disk_cache is not None else None,
+        "parse_memo": parse_memo.stats(),
+        "upstream_validators": upstream_validators.stats(),
+        "encoded": encoded_cache.stats(),
+        "governor": governor.stats(),
+        "breaker": breaker.stats(),
+        "parse_pool": parse_pool.stats(),
+        "prefetch": prefetcher.stats(),
+    })
+
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics dimatikan (ANICHIN_METRICS=0)")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/catalog")
+async def catalog_stats():
+    return reply({"status": "success", "creator": CREATOR, "catalog": catalog.stats(), "schedule": schedule_store.stats()})
 
 
 # LIST (semua support page=)
 @app.get("/api/update")
-def list_update(page: int = 1):
+async def list_update(page: int = 1, pages: str | None = None):
+    if pages:
+        return await stream_list_pages(pages, lambda p: build_list_params(p, "", "", "", "update", None))
     page = max(1, page)
     params = build_list_params(page, "", "", "", "update", None)
-    soup = get_soup(f"{BASE_URL}/anime/", params=params)
-    return {"status": "success", "creator": CREATOR, "order": "update", "page": page, "data": parse_list_page(soup)}
+    data = await scrape_async("list", f"{BASE_URL}/anime/", params)
+    if page == 1 and data:
+        prefetcher.after_update(data)
+    return reply({"status": "success", "creator": CREATOR, "order": "update", "page": page, "data": cached_json(data or [])})
 
 
 @app.get("/api/popular")
-def list_popular(page: int = 1):
+async def list_popular(page: int = 1, pages: str | None = None):
+    if pages:
+        return await stream_list_pages(pages, lambda p: build_list_params(p, None, None, None, "popular", None))
     page = max(1, page)
     params = build_list_params(page, None, None, None, "popular", None)
-    soup = get_soup(f"{BASE_URL}/anime/", params=params)
-    return {"status": "success", "creator": CREATOR, "order": "popular", "page": page, "data": parse_list_page(soup)}
+    data = await scrape_async("list", f"{BASE_URL}/anime/", params)
+    return reply({"status": "success", "creator": CREATOR, "order": "popular", "page": page, "data": cached_json(data or [])})
 
 
 @app.get("/api/rating")
-def list_rating(page: int = 1):
+async def list_rating(page: int = 1):
     page = max(1, page)
-    params = build_list_params(page, "", "", "", "rating", None)
-    soup = get_soup(f"{BASE_URL}/anime/", params=params)
-    return {"status": "success", "creator": CREATOR, "order": "rating", "page": page, "data": parse_list_page(soup)}
+    data = catalog_list(page, "", "", "", "rating", None)
+    if data is None:
+        params = build_list_params(page, "", "", "", "rating", None)
+        data = cached_json(await scrape_async("list", f"{BASE_URL}/anime/", params))
+    return reply({"status": "success", "creator": CREATOR, "order": "rating", "page": page, "data": data or []})
 
 
 @app.get("/api/ongoing")
-def list_ongoing(page: int = 1):
+async def list_ongoing(page: int = 1):
     page = max(1, page)
-    params = build_list_params(page, "ongoing", "", "", "", None)
-    soup = get_soup(f"{BASE_URL}/anime/", params=params)
-    return {"status": "success", "creator": CREATOR, "status_filter": "ongoing", "page": page, "data": parse_list_page(soup)}
+    data = catalog_list(page, "ongoing", "", "", "", None)
+    if data is None:
+        params = build_list_params(page, "ongoing", "", "", "", None)
+        data = cached_json(await scrape_async("list", f"{BASE_URL}/anime/", params))
+    return reply({"status": "success", "creator": CREATOR, "status_filter": "ongoing", "page": page, "data": data or []})
 
 
 @app.get("/api/completed")
-def list_completed(page: int = 1):
+async def list_completed(page: int = 1):
     page = max(1, page)
-    params = build_list_params(page, "completed", None, None, "", None)
-    soup = get_soup(f"{BASE_URL}/anime/", params=params)
-    return {"status": "success", "creator": CREATOR, "status_filter": "completed", "page": page, "data": parse_list_page(soup)}
+    data = catalog_list(page, "completed", None, None, "", None)
+    if data is None:
+        params = build_list_params(page, "completed", None, None, "", None)
+        data = cached_json(await scrape_async("list", f"{BASE_URL}/anime/", params))
+    return reply({"status": "success", "creator": CREATOR, "status_filter": "completed", "page": page, "data": data or []})
 
 
 @app.get("/api/list")
-def list_universal(
+async def list_universal(
     page: int = 1,
     status: str = "",
     type: str = "",
     sub: str = "",
     order: str = "",
     genre: list[str] = Query(default=[], alias="genre[]"),
+    pages: str | None = None,
 ):
+    if pages:
+        return await stream_list_pages(pages, lambda p: build_list_params(p, status, type, sub, order, genre))
     page = max(1, page)
-    params = build_list_params(page, status, type, sub, order, genre)
-    soup = get_soup(f"{BASE_URL}/anime/", params=params)
-    return {
+    data = catalog_list(page, status, type, sub, order, genre)
+    if data is None:
+        params = build_list_params(page, status, type, sub, order, genre)
+        data = cached_json(await scrape_async("list", f"{BASE_URL}/anime/", params))
+    return reply({
         "status": "success",
         "creator": CREATOR,
         "page": page,
         "filters": {"status": status, "type": type, "sub": sub, "order": order, "genre[]": genre},
-        "data": parse_list_page(soup),
-    }
+        "data": data or [],
+    })
 
 
 # GENRES (all + paged per genre)
 @app.get("/api/genres")
-def all_genres():
-    data = scrape_all_genres()
-    return {"status": "success", "creator": CREATOR, "count": len(data), "data": data}
+async def all_genres():
+    data = catalog.genres if CATALOG_ENABLED and catalog.genres else None
+    if data is None:
+        data = await scrape_async("genres", f"{BASE_URL}/anime/", GENRES_PARAMS) or []
+    return reply({"status": "success", "creator": CREATOR, "count": len(data), "data": cached_json(data)})
+
+
+@app.get("/api/facets")
+async def facets(
+    status: str = "",
+    type: str = "",
+    genre: list[str] = Query(default=[], alias="genre[]"),
+):
+    data = catalog.facet_counts(status, type, genre) if CATALOG_ENABLED else None
+    if data is None:
+        raise HTTPException(status_code=503, detail="Katalog belum siap / catalog not ready")
+    return reply({
+        "status": "success",
+        "creator": CREATOR,
+        "filters": {"status": status, "type": type, "genre[]": genre},
+        **data,
+    })
 
 
 @app.get("/api/genres/{slug}")
-def genre_detail(slug: str, page: int = 1):
+async def genre_detail(slug: str, page: int = 1, pages: str | None = None):
+    if pages:
+        return await stream_list_pages(pages, lambda p: build_list_params(p, "", "", "", "", [slug]))
     page = max(1, page)
-    params = build_list_params(page, "", "", "", "", [slug])
-    soup = get_soup(f"{BASE_URL}/anime/", params=params)
-    return {"status": "success", "creator": CREATOR, "genre": slug, "page": page, "data": parse_list_page(soup)}
+    data = catalog_list(page, "", "", "", "", [slug])
+    if data is None:
+        params = build_list_params(page, "", "", "", "", [slug])
+        data = cached_json(await scrape_async("list", f"{BASE_URL}/anime/", params))
+    return reply({"status": "success", "creator": CREATOR, "genre": slug, "page": page, "data": data or []})
 
 
 # SCHEDULE
 @app.get("/api/schedule")
-def schedule():
-    soup = get_soup(f"{BASE_URL}/schedule/")
-    out = []
-
-    if soup:
-        for box in soup.select("div.bixbox"):
-            day_el = box.select_one("div.releases h3") or box.select_one("h3")
-            if not day_el:
-                continue
-
-            day_name = safe_text(day_el)
-            items = []
+async def schedule(
+    day: str = "",
+    from_: str = Query(default="", alias="from"),
+    to: str = "",
+):
+    """
+    day: nama hari (Monday / Senin / ...), "today" atau "tomorrow".
+    from / to: HH:MM atau "now" (jam situs); to <= from berarti lewat tengah malam.
+    """
+    if (
+        SCHEDULE_REFRESH <= 0
+        or not schedule_store.days
+        or time.time() - schedule_store.checked_at > SCHEDULE_REFRESH * 2
+    ):
+        # tanpa loop (mis. serverless) / belum terisi: lewat cache biasa, index dibangun ulang kalau berubah
+        out = await scrape_async("schedule", f"{BASE_URL}/schedule/")
+        if out:
+            schedule_store.update(out)
+    if not (day or from_ or to):
+        return reply({"status": "success", "creator": CREATOR, "schedule": cached_json(schedule_store.days)})
 
-            for it in box.select("div.listupd article.bs, div.listupd div.bs"):
-                c = parse_card(it, is_schedule=True)
-                if c:
-                    items.append(c)
+    today, now = schedule_now()
+    if day.lower() in ("today", "hari-ini"):
+        d = today
+    elif day.lower() in ("tomorrow", "besok"):
+        d = (today + 1) % 7
+    elif day:
+        d = day_index(day)
+        if d is None:
+            raise HTTPException(status_code=400, detail="Hari tidak dikenal / unknown day")
+    else:
+        d = today if from_ == "now" else None
 
-            if items:
-                out.append({"day": day_name, "donghua_list": items})
+    bounds = []
+    for value in (from_, to):
+        if not value:
+            bounds.append(None)
+        elif value == "now":
+            bounds.append(now)
+        else:
+            m = hhmm_minutes(value)
+            if m is None:
+                raise HTTPException(status_code=400, detail="Format jam harus HH:MM / time must be HH:MM")
+            bounds.append(m)
 
-    return {"status": "success", "creator": CREATOR, "schedule": out}
+    out = schedule_store.query(d, bounds[0], bounds[1])
+    return reply({
+        "status": "success",
+        "creator": CREATOR,
+        "filters": {"day": day, "from": from_, "to": to},
+        "schedule": out,
+    })
 
 
 # SEARCH
 @app.get("/api/search")
-def search(s: str = Query(..., alias="s")):
-    soup = get_soup(BASE_URL, params={"s": s})
-    return {"status": "success", "creator": CREATOR, "query": s, "data": parse_list_page(soup)}
+async def search(s: str = Query(..., alias="s")):
+    data = catalog_search(s)
+    if data is None:
+        data = cached_json(await scrape_async("search", BASE_URL, {"s": s}))
+    return reply({"status": "success", "creator": CREATOR, "query": s, "data": data or []})
 
 
 # DETAILS
 @app.get("/api/series")
-def series_detail(url: str):
-    if not url.startswith("http"):
-        url = abs_url(url)
-    soup = get_soup(url)
-    if not soup:
+async def series_detail(url: str, fields: str | None = None):
+    wanted = parse_fields(fields, "series")
+    url = page_url(url)
+    prefetcher.claim("series", url)
+    data = await scrape_async("series", url, fields=wanted)
+    if data is None:
         raise HTTPException(status_code=404, detail="Gagal akses series page / page not found")
-    return parse_series_detail(soup, url)
+    return reply(encoded_json(data))
 
 
 @app.get("/api/episode")
-def episode_detail(url: str):
-    if not url.startswith("http"):
-        url = abs_url(url)
-    soup = get_soup(url)
-    if not soup:
+async def episode_detail(url: str, fields: str | None = None):
+    wanted = parse_fields(fields, "episode")
+    url = page_url(url)
+    prefetcher.claim("episode", url)
+    data = await scrape_async("episode", url, fields=wanted)
+    if data is None:
         raise HTTPException(status_code=404, detail="Gagal akses episode page / page not found")
-    return parse_episode_detail(soup, url)
+    prefetcher.after_episode(data)
+    return reply(encoded_json(data))
 
 
 @app.get("/api/detail")
-def detail_auto(url: str):
-    if not url.startswith("http"):
-        url = abs_url(url)
-    soup = get_soup(url)
-    if not soup:
+async def detail_auto(url: str, fields: str | None = None):
+    wanted = parse_fields(fields, "detail")
+    url = page_url(url)
+    data = await scrape_async("detail", url, fields=wanted)
+    if data is None:
         raise HTTPException(status_code=404, detail="Gagal akses page / page not found")
+    return reply(encoded_json(data))
 
-    is_episode_page = bool(
-        soup.select_one("#playeroptionsul")
-        or soup.select_one("select.mirror")
-        or soup.select_one(".video-content iframe")
-        or soup.select_one(".mctnx")
-    )
 
-    if is_episode_page:
-        return parse_episode_detail(soup, url)
-    return parse_series_detail(soup, url)
+# BATCH (banyak series/episode sekaligus)
+BATCH_TYPES = {"auto": "detail", "series": "series", "episode": "episode"}
+
+
+@app.post("/api/batch")
+async def batch_detail(
+    urls: list[str] = Body(..., embed=True),
+    type: str = Body("auto", embed=True),
+):
+    kind = BATCH_TYPES.get(type)
+    if kind is None:
+        raise HTTPException(status_code=400, detail="type harus auto, series, atau episode")
+    if len(urls) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Maksimal {BATCH_MAX_ITEMS} url per batch")
+
+    sem = asyncio.Semaphore(max(1, BATCH_CONCURRENCY))
+
+    async def one(raw: str):
+        try:
+            url = page_url(raw)
+        except HTTPException as e:
+            return {"url": raw, "status": "error", "error": e.detail}
+        try:
+            async with sem:
+                data = await scrape_async(kind, url)
+        except Exception as e:
+            print(f"[batch_detail] Error {url}: {e}")
+            return {"url": raw, "status": "error", "error": str(e) or e.__class__.__name__}
+        if data is None:
+            return {"url": raw, "status": "error", "error": "Gagal akses page / page not found"}
+        return {"url": raw, "status": "success", "data": cached_json(data)}
+
+    results = await asyncio.gather(*(one(u) for u in urls))
+    return reply({"status": "success", "creator": CREATOR, "count": len(results), "data": results})
@@ -0,0 +1,84 @@
+"""
+requests/sec: bare requests.get per call (jalur lama) vs pooled keep-alive client (fetch_html).
+
+Mock dilayani lewat HTTPS + jeda per koneksi baru (RTT handshake), karena yang dihemat
+pool memang handshake TCP+TLS per request; loopback HTTP polos tidak punya biaya itu.
+
+    python bench/bench_client.py [--requests 2000] [--threads 16] [--connect-latency 0.02] [--no-tls]
+"""
+import argparse
+import os
+import ssl
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+
+VERIFY = True
+
+
+def old_path(url: str):
+    import requests
+
+    req = requests.get(url, headers=index.HEADERS, timeout=25, verify=VERIFY)
+    req.raise_for_status()
+    return req.text
+
+
+def new_path(url: str):
+    return index.fetch_html(url)
+
+
+def run(fn, url: str, n: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        for r in ex.map(lambda _: fn(url), range(n)):
+            assert r
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=2000)
+    ap.add_argument("--threads", type=int, default=16)
+    ap.add_argument("--connect-latency", type=float, default=0.02, help="RTT handshake per koneksi baru (detik)")
+    ap.add_argument("--no-tls", action="store_true")
+    args = ap.parse_args()
+
+    global VERIFY
+    with MockUpstream(tls=not args.no_tls, connect_latency=args.connect_latency) as up:
+        url = up.url + "/anime/"
+        if up.cafile:
+            VERIFY = up.cafile
+            # client pooled yang sama dengan index.http_client(), cuma CA-nya CA mock
+            index._client = httpx.Client(
+                headers=index.HEADERS,
+                limits=index.upstream_limits(),
+                timeout=index.upstream_timeout(),
+                verify=ssl.create_default_context(cafile=up.cafile),
+                follow_redirects=True,
+            )
+        paths = [("pooled client", new_path)]
+        try:
+            import requests  # noqa: F401
+
+            paths.insert(0, ("requests.get", old_path))
+        except ImportError:
+            print("requests not installed, skipping old path")
+
+        for name, fn in paths:
+            fn(url)  # warmup
+            up.reset()
+            rps = run(fn, url, args.requests, args.threads)
+            print(f"{name:<16} {rps:10.1f} req/s  {up.connections:>6} koneksi baru")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+N caller serentak untuk URL yang sama -> harus cuma 1 hit ke upstream (sync + async).
+
+    python bench/bench_coalesce.py [--callers 200] [--delay 0.3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+
+
+def run_sync(up, n: int):
+    url = up.url + "/anime/"
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        results = list(ex.map(lambda _: index.scrape("list", url, {"order": "update"}), range(n)))
+    return results
+
+
+async def run_async(up, n: int):
+    url = up.url + "/some-episode-1/"
+    return await asyncio.gather(*(index.scrape_async("episode", url) for _ in range(n)))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--callers", type=int, default=200)
+    ap.add_argument("--delay", type=float, default=0.3)
+    args = ap.parse_args()
+
+    ok = True
+    for name, runner in [("sync", lambda up: run_sync(up, args.callers)),
+                         ("async", lambda up: asyncio.run(run_async(up, args.callers)))]:
+        index.response_cache.clear()
+        with MockUpstream(delay=args.delay) as up:
+            start = time.perf_counter()
+            results = runner(up)
+            elapsed = time.perf_counter() - start
+        same = all(r is results[0] for r in results)
+        print(f"{name:<6} callers={args.callers} upstream_hits={up.hits} shared_result={same} {elapsed:.3f}s")
+        ok = ok and up.hits == 1 and same
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
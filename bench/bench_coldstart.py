@@ -0,0 +1,162 @@
+"""
+Cold start: waktu `import index` dan latency request pertama per route, tiap run di proses
+Python baru (kayak instance Vercel yang baru bangun). Bisa dipakai sebagai guard di CI:
+
+    python bench/bench_coldstart.py --save coldstart.json                 # baseline
+    python bench/bench_coldstart.py --compare coldstart.json --tolerance 0.3   # exit 1 kalau lebih lambat
+    python bench/bench_coldstart.py --max-import-ms 1500 --max-first-ms 500    # batas absolut
+    python bench/bench_coldstart.py --profile       # modul paling berat saat import (-X importtime)
+
+Baseline yang di-commit: bench/baselines/coldstart.json; tests/test_coldstart.py menjalankan
+script ini dengan --compare baseline itu dan --max-*, jadi `pytest tests` ikut menjaganya.
+
+Angka = median dari --runs proses, dengan .pyc api/ sudah ada. "first" = request pertama route itu di proses baru,
+"warm" = request kedua (url lain, jadi tetap fetch + parse, tapi tanpa biaya sekali-jalan).
+"""
+import argparse
+import asyncio
+import compileall
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+API = os.path.join(HERE, "..", "api")
+sys.path.insert(0, HERE)
+
+from report import compare_baseline, regressions, save_baseline  # noqa: E402
+
+ROUTES = [
+    ("/api/update", "/api/update?page={n}"),
+    ("/api/episode", "/api/episode?url=/donghua-episode-{n}/"),
+    ("/api/series", "/api/series?url=/seri/series-{n}/"),
+    ("/api/schedule", "/api/schedule?x={n}"),
+    ("/api/genres", "/api/genres?x={n}"),
+    ("/api/search", "/api/search?s=q{n}"),
+]
+
+
+def child_import():
+    start = time.perf_counter()
+    import index  # noqa: F401
+
+    print(json.dumps({"import_ms": (time.perf_counter() - start) * 1000}))
+
+
+def child_requests():
+    start = time.perf_counter()
+    import index
+
+    import_ms = (time.perf_counter() - start) * 1000
+    import httpx
+    from mock_server import MockUpstream
+
+    index.disk_cache = None
+    out = {"import_ms": import_ms}
+
+    async def run():
+        transport = httpx.ASGITransport(app=index.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, tmpl in ROUTES:
+                for n, label in ((1, "first"), (2, "warm")):
+                    t = time.perf_counter()
+                    r = await client.get(tmpl.format(n=n))
+                    out[f"{name}_{label}_ms"] = (time.perf_counter() - t) * 1000
+                    if r.status_code != 200:
+                        out[f"{name}_status"] = r.status_code
+
+    with MockUpstream() as up:
+        index.BASE_URL = up.url
+        asyncio.run(run())
+    print(json.dumps(out))
+
+
+def import_profile(top: int = 12):
+    """Modul dengan waktu import kumulatif terbesar (python -X importtime), buat cari yang bisa ditunda."""
+    env = dict(os.environ, ANICHIN_DISK_CACHE="")
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import index"],
+        cwd=API, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        head, cum_us, name = line.split("|")
+        rows.append((int(cum_us), int(head.split(":")[1]), name.rstrip()))
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for cum, self_, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cum / 1000:>14.1f}{self_ / 1000:>10.1f}  {name}")
+
+
+def spawn(mode: str) -> dict:
+    env = dict(os.environ, ANICHIN_DISK_CACHE="", PYTHONPATH=os.pathsep.join([API, HERE]))
+    res = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), mode],
+        cwd=API, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ("--child-import", "--child-requests"):
+        sys.path[:0] = [API, HERE]
+        return child_import() if sys.argv[1] == "--child-import" else child_requests()
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--save")
+    ap.add_argument("--compare")
+    ap.add_argument("--tolerance", type=float, default=0.3)
+    ap.add_argument("--max-import-ms", type=float)
+    ap.add_argument("--max-first-ms", type=float, help="batas request pertama route mana pun")
+    ap.add_argument("--profile", action="store_true", help="print profil import lalu keluar")
+    args = ap.parse_args()
+
+    if args.profile:
+        compileall.compile_dir(API, quiet=1)
+        return import_profile()
+
+    # .pyc ditulis dulu: yang diukur import, bukan compile source (deploy normal sudah punya .pyc)
+    compileall.compile_dir(API, quiet=1)
+    imports = [spawn("--child-import")["import_ms"] for _ in range(args.runs)]
+    runs = [spawn("--child-requests") for _ in range(args.runs)]
+    results = {"import_ms": statistics.median(imports)}
+    for key in runs[0]:
+        if key.endswith("_ms") and key != "import_ms":
+            results[key] = statistics.median(r[key] for r in runs)
+    failed = sorted({k for r in runs for k in r if k.endswith("_status")})
+
+    print(f"import index: {results['import_ms']:.0f} ms (median {args.runs} proses, min {min(imports):.0f})")
+    print(f"{'route':<16}{'first ms':>10}{'warm ms':>10}")
+    for name, _ in ROUTES:
+        print(f"{name:<16}{results[f'{name}_first_ms']:>10.1f}{results[f'{name}_warm_ms']:>10.1f}")
+
+    ok = not failed
+    if failed:
+        print(f"status bukan 200: {failed}")
+    if args.max_import_ms and results["import_ms"] > args.max_import_ms:
+        ok = False
+        print(f"import {results['import_ms']:.0f} ms > batas {args.max_import_ms:.0f} ms")
+    worst = max(v for k, v in results.items() if k.endswith("_first_ms"))
+    if args.max_first_ms and worst > args.max_first_ms:
+        ok = False
+        print(f"request pertama {worst:.0f} ms > batas {args.max_first_ms:.0f} ms")
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        compare_baseline(args.compare, results)
+        # yang dijaga cuma biaya cold start; "warm" (beberapa ms) terlalu berisik buat guard
+        guarded = {k: v for k, v in results.items() if k == "import_ms" or k.endswith("_first_ms")}
+        worse = regressions(args.compare, guarded, args.tolerance)
+        if worse:
+            ok = False
+            print(f"lebih lambat dari baseline (> {args.tolerance:.0%}): {', '.join(worse)}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
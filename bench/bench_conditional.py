@@ -0,0 +1,86 @@
+"""
+Revalidasi dua arah:
+  upstream: setelah TTL habis, fetch ulang kirim If-None-Match; 304 dipakai sebagai cache hit
+            (tanpa body, tanpa parse). Dibandingkan byte & waktu vs fetch penuh.
+  client:   respons kita punya ETag kuat; If-None-Match yang cocok dijawab 304 tanpa body.
+
+    python bench/bench_conditional.py [--rounds 20] [--latency 0.02]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+
+PATHS = ["/seri/long/", "/seri/short/", "/some-episode-12-subtitle-indonesia/"]
+
+
+async def refetch_rounds(up, rounds: int):
+    """Fetch + parse tiap path `rounds` kali seolah TTL selalu sudah habis."""
+    index.upstream_validators = index.UpstreamValidators()
+    index.parse_memo = index.ParseMemo()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in PATHS:
+            kind = "series" if path.startswith("/seri/") else "episode"
+            data = await index._scrape_async(kind, up.url + path)
+            assert data, path
+    return time.perf_counter() - start, up.bytes_sent, up.not_modified
+
+
+async def client_roundtrip():
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get("/api/series?url=/seri/long/")
+        etag = first.headers.get("etag")
+        again = await client.get("/api/series?url=/seri/long/", headers={"If-None-Match": etag or ""})
+        other = await client.get("/api/series?url=/seri/long/", headers={"If-None-Match": '"nope"'})
+        stream = await client.get("/api/update?pages=1-2")
+    return first, etag, again, other, stream
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--latency", type=float, default=0.02)
+    args = ap.parse_args()
+
+    index.disk_cache = index.DiskCache(os.path.join(tempfile.mkdtemp(prefix="anichin-bench-"), "c.sqlite3"), 1 << 26)
+    with MockUpstream(latency=args.latency) as up:
+        t_full, b_full, _ = asyncio.run(refetch_rounds(up, args.rounds))
+    with MockUpstream(latency=args.latency, validators=True) as up:
+        index.BASE_URL = up.url
+        t_cond, b_cond, n304 = asyncio.run(refetch_rounds(up, args.rounds))
+        st = index.upstream_validators.stats()
+        first, etag, again, other, stream = asyncio.run(client_roundtrip())
+
+    n = args.rounds * len(PATHS)
+    print(f"upstream full refetch: {n} fetches {t_full:.2f}s {b_full / 1024:.0f} KiB")
+    print(f"upstream conditional : {n} fetches {t_cond:.2f}s {b_cond / 1024:.0f} KiB, 304: {n304}, {st}")
+    print(f"client: 200 etag={etag} ({len(first.content)} B) -> If-None-Match {again.status_code} "
+          f"({len(again.content)} B); mismatch {other.status_code}; ndjson etag={stream.headers.get('etag')}")
+
+    ok = (
+        n304 == n - len(PATHS)
+        and st["reused"] == n304
+        and b_cond < b_full
+        and first.status_code == 200 and etag
+        and again.status_code == 304 and not again.content and again.headers.get("etag") == etag
+        and other.status_code == 200
+        and stream.status_code == 200 and stream.headers.get("etag") is None
+    )
+    print(f"checks: {'ok' if ok else 'FAIL'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+DiskCache dipakai banyak proses sekaligus (kayak beberapa worker uvicorn): reader & writer
+serentak di file SQLite yang sama. Cek tidak ada error/lock yang bocor, data yang dibaca
+selalu utuh, eviction menjaga ukuran, dan warm() setelah "cold start" dapat isinya lagi.
+
+    python bench/bench_disk_cache.py [--procs 8] [--seconds 5]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import fixtures  # noqa: E402
+
+KEYS = 200
+
+
+def payload(i: int, version: int) -> dict:
+    return {"key": i, "version": version, "data": [{"episode": f"Episode {n}", "slug": f"ep-{i}-{n}"} for n in range(50)]}
+
+
+def worker(path: str, max_bytes: int, seconds: float, seed: int, write_ratio: float, out):
+    import index
+
+    cache = index.DiskCache(path, max_bytes)
+    html = fixtures()["episode"][1]
+    rng = random.Random(seed)
+    reads = writes = hits = corrupt = 0
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        i = rng.randrange(KEYS)
+        key = f"bench {i}"
+        if rng.random() < write_ratio:
+            cache.set(key, "episode", html, payload(i, seed), 60)
+            writes += 1
+        else:
+            got = cache.get(key)
+            reads += 1
+            if got is not None:
+                hits += 1
+                data = got[0]
+                if data.get("key") != i or len(data.get("data", [])) != 50:
+                    corrupt += 1
+    out.put({"reads": reads, "writes": writes, "hits": hits, "corrupt": corrupt, "errors": cache.errors})
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--procs", type=int, default=8)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--write-ratio", type=float, default=0.2)
+    ap.add_argument("--max-mb", type=float, default=0.25, help="kecil supaya eviction ikut jalan")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="anichin-bench-")
+    path = os.path.join(tmp, "cache.sqlite3")
+    max_bytes = int(args.max_mb * 1024 * 1024)
+
+    out = mp.Queue()
+    procs = [
+        mp.Process(target=worker, args=(path, max_bytes, args.seconds, seed, args.write_ratio, out))
+        for seed in range(args.procs)
+    ]
+    for p in procs:
+        p.start()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    tot = {k: sum(r[k] for r in results) for k in results[0]}
+    ops = tot["reads"] + tot["writes"]
+    print(f"{args.procs} procs, {args.seconds:.0f}s: {ops / args.seconds:.0f} ops/s "
+          f"({tot['reads']} reads, {tot['writes']} writes, hit rate {tot['hits'] / max(tot['reads'], 1):.0%})")
+    print(f"corrupt reads: {tot['corrupt']}, errors: {tot['errors']}")
+
+    import index
+
+    cache = index.DiskCache(path, max_bytes)
+    cache.evict()
+    st = cache.stats()
+    print(f"after evict: {st['entries']} entries, {st['bytes'] / 1024:.0f} KiB (limit {max_bytes / 1024:.0f} KiB)")
+    warmed = cache.warm(50)
+    print(f"cold start warm(): {len(warmed)} entries")
+
+    ok = tot["corrupt"] == 0 and tot["errors"] == 0 and st["bytes"] <= max_bytes and warmed
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
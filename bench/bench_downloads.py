@@ -0,0 +1,98 @@
+"""
+extract_downloads (satu pass) vs scan download lama di parse_episode_detail.
+
+Cek output identik di semua fixture episode, lalu ukur waktu saat halaman makin
+dalam (depth) dan makin banyak blok download (blocks).
+
+    python bench/bench_downloads.py [--repeat 5]
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import episode_page  # noqa: E402
+
+
+def legacy_downloads(soup):
+    # salinan persis blok DOWNLOADS sebelum extract_downloads
+    downloads = {}
+
+    dl_sections = []
+    for box in soup.select("div, section, article"):
+        t = index.normalize_label(box.get_text(" ", strip=True)).lower()
+        if "download" in t and any(x in t for x in ["240p", "360p", "480p", "720p", "1080p"]):
+            dl_sections.append(box)
+
+    dl_sections += soup.select("div.mctnx div.soraddl, div.soraurl, div.dl-box")
+
+    def add_links(res_key: str, container):
+        links_map = {}
+        for a in container.select("a"):
+            provider = index.safe_text(a)
+            href = a.get("href", "")
+            if provider and href and href.startswith("http"):
+                links_map[provider] = href
+        if links_map:
+            downloads[res_key] = links_map
+
+    for sec in dl_sections:
+        rows = sec.select("tr, li, .row, .dlrow, .dldiv, div")
+        if not rows:
+            rows = [sec]
+
+        for r in rows:
+            txt = index.normalize_label(r.get_text(" ", strip=True)).lower()
+            m = re.search(r"(240|360|480|720|1080)p", txt)
+            if not m:
+                continue
+            res = m.group(1)
+            add_links(f"download_url_{res}p", r)
+
+    return downloads
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    cases = []
+    for layout in ("soraurl", "table", "list"):
+        for depth in (0, 8, 24):
+            for blocks in (1, 8, 24):
+                cases.append((layout, depth, blocks))
+
+    ok = True
+    print(f"{'layout':<8}{'depth':>6}{'blocks':>7}{'nodes':>8}{'legacy ms':>11}{'single ms':>11}{'speedup':>9}  same")
+    for layout, depth, blocks in cases:
+        soup = index.make_soup(episode_page(layout=layout, depth=depth, blocks=blocks))
+        nodes = len(soup.find_all(True))
+        same = legacy_downloads(soup) == index.extract_downloads(soup)
+        same = same and list(legacy_downloads(soup)) == list(index.extract_downloads(soup))
+        ok = ok and same
+        old = timed(lambda: legacy_downloads(soup), args.repeat)
+        new = timed(lambda: index.extract_downloads(soup), args.repeat)
+        print(f"{layout:<8}{depth:>6}{blocks:>7}{nodes:>8}{old:>11.2f}{new:>11.2f}{old / new:>8.1f}x  {same}")
+
+    print("output:", "identical" if ok else "DIFFERENT")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Query facet katalog (genre AND genre AND status/type) lewat bitmap vs scan per series,
+di katalog sintetis besar. Hasil halaman + jumlah harus sama persis dengan scan biasa.
+
+    python bench/bench_facets.py [--docs 30000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import GENRES, STATUSES, TYPES, catalog_records  # noqa: E402
+from report import compare_baseline, save_baseline  # noqa: E402
+
+
+def scan(records, order_recs, page, page_size, status, type_, genres):
+    """Filter per series (cara lama), buat pembanding."""
+    want = set(genres)
+    hits = [
+        rec["card"] for rec in order_recs
+        if (not status or rec["detail"]["status"].lower() == status)
+        and (not type_ or rec["detail"]["type"].lower() == type_)
+        and want.issubset(rec["detail"]["genres"])
+    ]
+    start = (page - 1) * page_size
+    return hits[start:start + page_size], len(hits)
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        out = fn()
+    return (time.perf_counter() - start) / n * 1e6, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=30000)
+    ap.add_argument("--queries", type=int, default=50)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--save")
+    ap.add_argument("--compare")
+    args = ap.parse_args()
+
+    records = catalog_records(args.docs)
+    cat = index.Catalog(os.path.join(tempfile.mkdtemp(prefix="anichin-bench-"), "catalog.sqlite3"))
+    start = time.perf_counter()
+    cat.records = records
+    cat.facets.rebuild(records)
+    build = time.perf_counter() - start
+    cat.ready, cat.page_size = True, 24
+    order_recs = sorted(records.values(), key=lambda r: r["seq"], reverse=True)
+    cat.ordered("")
+    print(f"facet build: {args.docs} series in {build:.2f}s {cat.facets.stats()}")
+
+    rng = random.Random(args.seed)
+    ok = True
+    t_bitmap = t_scan = t_counts = 0.0
+    for _ in range(args.queries):
+        genres = rng.sample(GENRES, rng.randint(1, 2))
+        status = rng.choice(["", *STATUSES]).lower()
+        type_ = rng.choice(["", *TYPES]).lower()
+        page = rng.randint(1, 3)
+        us, got = timed(lambda: cat.query(page, status, type_, "", "", genres), 5)
+        t_bitmap += us
+        us, (want, total) = timed(lambda: scan(records, order_recs, page, 24, status, type_, genres), 2)
+        t_scan += us
+        us, counts = timed(lambda: cat.facet_counts(status, type_, genres), 5)
+        t_counts += us
+        if [c["slug"] for c in got] != [c["slug"] for c in want] or counts["total"] != total:
+            ok = False
+            print(f"MISMATCH {status!r} {type_!r} {genres} page {page}: {len(got)}/{len(want)}, {counts['total']}/{total}")
+
+    n = args.queries
+    results = {"bitmap_query_us": t_bitmap / n, "scan_query_us": t_scan / n, "facet_counts_us": t_counts / n}
+    for k, v in results.items():
+        print(f"{k:<24} {v:>12.1f} us")
+    print(f"parity: {'ok' if ok else 'FAIL'}")
+
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        compare_baseline(args.compare, results)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+fields= di /api/series, /api/episode, /api/detail: bagian yang tidak diminta tidak diparse.
+
+Bandingkan waktu parse lengkap vs parse satu/dua bagian saja (soup sudah jadi, jadi yang
+diukur murni kerja parser), plus parity: tiap bagian hasil parse ber-fields harus sama
+persis dengan key yang sama di hasil lengkap. Terakhir: caller serentak dengan fields= beda
+untuk URL yang sama tetap cuma 1 hit ke upstream (mock).
+
+    python bench/bench_fields.py [--min-time 0.2]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from bench_micro import per_call_us  # noqa: E402
+from fixtures import fixtures  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+
+CASES = [
+    ("series_long", "series", None),
+    ("series_long", "series", "info"),
+    ("series_long", "series", "title,poster"),
+    ("series_long", "series", "episodes_list"),
+    ("episode", "episode", None),
+    ("episode", "episode", "streaming"),
+    ("episode", "episode", "navigation"),
+    ("episode_table", "episode", "download_url"),
+    ("series_long", "detail", "synopsis"),
+]
+
+
+async def concurrent_fields(url: str, specs):
+    return await asyncio.gather(*(index.scrape_async("series", url, fields=index.parse_fields(s, "series")) for s in specs))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--min-time", type=float, default=0.2)
+    args = ap.parse_args()
+
+    fx = fixtures()
+    ok = True
+    full_us = {}
+    print(f"{'fixture':<16}{'kind':<9}{'fields':<16}{'us':>12}{'vs full':>10}")
+    for name, kind, spec in CASES:
+        _, html, url = fx[name]
+        soup = index.make_soup(html, kind=kind)
+        fields = index.parse_fields(spec, kind)
+        parser = index.PAGE_PARSERS[kind]
+        if fields:
+            fn = lambda s=soup, u=url, f=fields, p=parser: p(s, u, f)  # noqa: E731
+        else:
+            fn = lambda s=soup, u=url, p=parser: p(s, u)  # noqa: E731
+
+        us = per_call_us(fn, args.min_time)
+        if fields is None:
+            full_us[(name, kind)] = us
+        base = full_us.get((name, kind)) or per_call_us(lambda s=soup, u=url, p=parser: p(s, u), args.min_time)
+        print(f"{name:<16}{kind:<9}{spec or '(all)':<16}{us:>12.1f}{base / us:>9.1f}x")
+
+        if fields:
+            want = index.project_fields(parser(soup, url), fields)
+            got = fn()
+            if got != want:
+                ok = False
+                print(f"  MISMATCH: {sorted(set(got) ^ set(want)) or 'isi beda'}")
+
+    key_all = index.cache_key("series", index.BASE_URL + "/seri/x/")
+    key_some = index.cache_key("series", index.BASE_URL + "/seri/x/", fields=index.parse_fields("info,genres", "series"))
+    if key_all == key_some:
+        ok = False
+        print("cache key tidak membedakan fields")
+
+    specs = ["title", "poster", "info", None]
+    index.response_cache.clear()
+    index.disk_cache = None
+    with MockUpstream(delay=0.2) as up:
+        url = up.url + "/seri/x/"
+        got = asyncio.run(concurrent_fields(url, specs))
+    full = got[-1]
+    same = all(g == index.project_fields(full, index.parse_fields(s, "series")) for s, g in zip(specs, got[:-1]))
+    print(f"fields {specs}: upstream_hits={up.hits} sama dengan proyeksi hasil lengkap={same}")
+    ok = ok and up.hits == 1 and same
+
+    print("parity:", "ok" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
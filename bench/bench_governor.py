@@ -0,0 +1,154 @@
+"""
+Upstream governor (AIMD), circuit breaker dan hedged request, di atas mock yang bisa
+melambat / balikin 503 / punya ekor latency.
+
+1. slowdown: upstream jadi lambat -> limit in-flight turun, request serentak ke upstream
+   dibatasi (bandingkan governor mati); upstream pulih -> limit naik lagi.
+2. outage: semua 503 -> breaker open setelah beberapa kegagalan, upstream tidak dihajar,
+   halaman yang pernah diparse tetap dijawab (hasil terakhir); pulih -> probe -> closed.
+3. hedge: 5% request kena +0.5s -> p99 dengan dan tanpa hedged request.
+
+    python bench/bench_governor.py
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+from report import percentile  # noqa: E402
+
+
+async def fire(paths, concurrency: int):
+    """Jalankan semua path, return [(path, status, detik)]."""
+    queue = asyncio.Queue()
+    for p in paths:
+        queue.put_nowait(p)
+    out = []
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+
+        async def worker():
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                r = await client.get(path)
+                out.append((path, r.status_code, time.perf_counter() - start))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return out
+
+
+def fresh(governor: bool = True, breaker: bool = True, **kw):
+    index.response_cache.clear()
+    index.governor = index.UpstreamGovernor(**kw)
+    index.governor.enabled = governor
+    index.breaker = index.CircuitBreaker(cooldown=0.5)
+    index.breaker.enabled = breaker
+
+
+def slowdown(up, args) -> bool:
+    print("== slowdown")
+    paths = [f"/api/episode?url=/slow-{i}/" for i in range(args.requests)]
+    up.latency = args.slow
+    peaks = {}
+    for enabled in (False, True):
+        fresh(governor=enabled, initial=32, target=args.slow / 2)
+        up.reset()
+        start = time.perf_counter()
+        asyncio.run(fire(paths, args.concurrency))
+        st = index.governor.stats()
+        peaks[enabled] = up.max_in_flight
+        print(f"governor {'on ' if enabled else 'off'}: upstream max in-flight {up.max_in_flight:>3}, "
+              f"limit {st['limit']:>6}, decreases {st['decreases']}, shed {st['shed']}, "
+              f"{time.perf_counter() - start:.1f}s")
+    low = index.governor.limit
+
+    up.latency = 0.005
+    index.response_cache.clear()
+    asyncio.run(fire([f"/api/episode?url=/fast-{i}/" for i in range(args.requests)], args.concurrency))
+    print(f"pulih: limit {low:.1f} -> {index.governor.limit:.1f}")
+    return peaks[True] < peaks[False] and index.governor.limit > low
+
+
+def outage(up, args) -> bool:
+    print("== outage")
+    fresh(initial=args.concurrency)
+    up.latency = 0.005
+    warm = [f"/api/episode?url=/warm-{i}/" for i in range(20)]
+    cold = [f"/api/episode?url=/cold-{i}/" for i in range(20)]
+    asyncio.run(fire(warm, 8))
+
+    index.response_cache.clear()  # TTL+SWR lewat: cuma hasil parse terakhir yang tersisa
+    up.error_rate = 1.0
+    up.reset()
+    res = asyncio.run(fire((warm + cold) * 5, args.concurrency))
+    warm_ok = sum(1 for p, status, _ in res if p in warm and status == 200)
+    cold_ms = percentile([t for p, _, t in res if p in cold], 0.95) * 1000
+    st = index.breaker.stats()
+    print(f"breaker {st['state']}, opens {st['opens']}, rejected {st['rejected']}, fallbacks {st['fallbacks']}")
+    print(f"upstream hits selama outage: {up.hits} (dari {len(res)} request)")
+    print(f"warm dijawab 200: {warm_ok}/{len(warm) * 5}, cold p95 {cold_ms:.1f} ms")
+    opened = st["opens"] > 0 and up.hits <= index.BREAKER_MIN_CALLS + args.concurrency
+
+    up.error_rate = 0.0
+    time.sleep(index.breaker.cooldown + 0.05)
+    index.response_cache.clear()
+    asyncio.run(fire(cold[:4], 1))
+    print(f"pulih: breaker {index.breaker.state}")
+    return opened and warm_ok == len(warm) * 5 and index.breaker.state == "closed"
+
+
+def hedge(up, args) -> bool:
+    print("== hedge")
+    up.latency = 0.01
+    up.slow_rate, up.slow_latency = 0.05, 0.5
+    p99 = {}
+    for enabled in (False, True):
+        fresh(initial=args.concurrency)
+        index.PARSE_MEMO = False
+        index.HEDGE = enabled
+        paths = [f"/api/genres/action?page={i}&h={int(enabled)}" for i in range(args.requests * 2)]
+        res = asyncio.run(fire(paths, 8))
+        times = [t for _, _, t in res]
+        p99[enabled] = percentile(times, 0.99) * 1000
+        st = index.governor.stats()
+        print(f"hedge {'on ' if enabled else 'off'}: p50 {percentile(times, 0.5) * 1000:.1f} ms, "
+              f"p99 {p99[enabled]:.1f} ms, hedges {st['hedges']} (menang {st['hedge_wins']})")
+    index.HEDGE = False
+    up.slow_rate = 0.0
+    index.PARSE_MEMO = True
+    return p99[True] < p99[False]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--slow", type=float, default=0.4, help="latency upstream saat melambat (detik)")
+    args = ap.parse_args()
+
+    index.disk_cache = None
+    results = {}
+    with MockUpstream(seed=3) as up:
+        index.BASE_URL = up.url
+        results["slowdown"] = slowdown(up, args)
+        results["outage"] = outage(up, args)
+        results["hedge"] = hedge(up, args)
+
+    print(" ".join(f"{k}={'ok' if v else 'FAILED'}" for k, v in results.items()))
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
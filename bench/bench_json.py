@@ -0,0 +1,100 @@
+"""
+Serialisasi + kompresi respons series dengan 1000 episode:
+  - jalur lama FastAPI: jsonable_encoder + json stdlib
+  - json_dumps (orjson kalau ada)
+  - bytes dari EncodedCache (respons dari cache: tidak encode ulang)
+  - payload ber-wrapper dengan cached_json (orjson.Fragment kalau orjson >= 3.9)
+lalu ukuran body identity / gzip / br, dan end-to-end GET /api/series lewat ASGI.
+
+    python bench/bench_json.py [--episodes 1000]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+import index  # noqa: E402
+from bench_micro import per_call_us  # noqa: E402
+from fixtures import HOST, series_page  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+from report import compare_baseline, save_baseline  # noqa: E402
+
+
+async def fetch(path: str, encoding: str, n: int):
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.get(path, headers={"Accept-Encoding": encoding})
+        start = time.perf_counter()
+        for _ in range(n):
+            await client.get(path, headers={"Accept-Encoding": encoding})
+        return r, (time.perf_counter() - start) / n
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--episodes", type=int, default=1000)
+    ap.add_argument("--min-time", type=float, default=0.3)
+    ap.add_argument("--requests", type=int, default=50)
+    ap.add_argument("--save")
+    ap.add_argument("--compare")
+    args = ap.parse_args()
+
+    html = series_page(args.episodes, seed=7)
+    data = index.parse_page("series", html, f"{HOST}/seri/long/")
+    print(f"orjson: {getattr(index.orjson, '__version__', None)}, Fragment: {index.HAS_FRAGMENT}, "
+          f"brotli: {index.brotli is not None}, episodes: {len(data['episodes_list'])}")
+
+    raw = index.json_dumps(data)
+    wrapper = {"url": "x", "status": "success"}
+    results = {
+        "stdlib_jsonable_us": per_call_us(
+            lambda: json.dumps(jsonable_encoder(data), ensure_ascii=False).encode("utf-8"), args.min_time
+        ),
+        "json_dumps_us": per_call_us(lambda: index.json_dumps(data), args.min_time),
+        "encoded_cache_us": per_call_us(lambda: index.encoded_json(data), args.min_time),
+        "wrapped_cached_us": per_call_us(
+            lambda: index.json_dumps({**wrapper, "data": index.cached_json(data)}), args.min_time
+        ),
+        "identity_bytes": len(raw),
+        "gzip_bytes": len(gzip.compress(raw, compresslevel=index.GZIP_LEVEL)),
+    }
+    if index.brotli is not None:
+        results["br_bytes"] = len(index.brotli.compress(raw, quality=index.BROTLI_QUALITY))
+    ok = json.loads(raw) == json.loads(json.dumps(jsonable_encoder(data)))
+    ok = ok and json.loads(index.json_dumps({**wrapper, "data": index.cached_json(data)}))["data"] == data
+
+    # end-to-end: upstream mock dengan halaman series panjang, respons dari cache
+    with MockUpstream(page=html) as up:
+        index.BASE_URL = up.url
+        expected = index.parse_page("series", html, f"{up.url}/seri/long/")
+        for encoding in ("identity", "gzip", "br"):
+            r, dt = asyncio.run(fetch("/api/series?url=/seri/long/", encoding, args.requests))
+            wire = int(r.headers.get("content-length", len(r.content)))
+            got = r.headers.get("content-encoding", "identity")
+            ok = ok and r.status_code == 200 and r.json() == expected
+            if encoding != "br" or index.brotli is not None:
+                ok = ok and got == encoding
+            results[f"e2e_{encoding}_ms"] = dt * 1e3
+            results[f"e2e_{encoding}_wire_bytes"] = wire
+
+    for k, v in results.items():
+        print(f"{k:<28} {v:>14.1f}")
+    print(f"checks: {'ok' if ok else 'FAIL'}")
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        compare_baseline(args.compare, results)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
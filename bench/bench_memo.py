@@ -0,0 +1,86 @@
+"""
+Parse memo: fetch ulang halaman yang sama (cuma nonce / komentar cache / iklan yang beda)
+tidak di-parse ulang; perubahan isi tetap di-parse. Bandingkan waktu parse penuh vs digest,
+dan cek worker lain (ParseMemo kosong) dapat hasilnya dari disk cache.
+
+    python bench/bench_memo.py [--rounds 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import fixtures  # noqa: E402
+from report import compare_baseline, save_baseline  # noqa: E402
+
+NAMES = ("series_short", "series_long", "episode", "list")
+
+
+def refetched(html: str, n: int) -> str:
+    """Halaman yang sama seperti di-fetch ulang: nonce, komentar cache, iklan & ?ver= berubah."""
+    return (
+        html.replace("<head>", f"<head><script nonce='n{n}'>var _nonce='{n:08x}';</script>", 1)
+        .replace("</body>", f"<ins class='adsbygoogle' data-slot='{n}'></ins><!-- cached {n} --></body>", 1)
+        .replace(".js'", f".js?ver=6.{n}'")
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=20)
+    ap.add_argument("--save")
+    ap.add_argument("--compare")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="anichin-bench-")
+    index.disk_cache = index.DiskCache(os.path.join(tmp, "cache.sqlite3"), 64 * 1024 * 1024)
+    fx = fixtures()
+    ok = True
+    results = {}
+    print(f"{'page':<14}{'parse ms':>10}{'memo ms':>10}{'speedup':>9}")
+    for name in NAMES:
+        kind, html, url = fx[name]
+        key = index.cache_key(kind, url, None)
+
+        index.parse_memo = index.ParseMemo()
+        start = time.perf_counter()
+        first = index.parse_and_store(key, kind, html, url)
+        t_parse = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for n in range(args.rounds):
+            again = index.parse_and_store(key, kind, refetched(html, n), url)
+        t_memo = (time.perf_counter() - start) / args.rounds
+        st = index.parse_memo.stats()
+        ok = ok and again is first and st["skipped"] == args.rounds and st["parsed"] == 1
+
+        # isi berubah -> parse ulang
+        changed = index.parse_and_store(key, kind, html.replace("</h1>", " Baru</h1>", 1), url)
+        ok = ok and index.parse_memo.stats()["parsed"] == 2 and changed is not first
+
+        # worker lain: memo kosong, tapi disk punya digest + hasil parse
+        index.parse_memo = index.ParseMemo()
+        index.parse_and_store(key, kind, html, url)
+        index.parse_memo = index.ParseMemo()
+        from_disk = index.parse_and_store(key, kind, refetched(html, 99), url)
+        ok = ok and index.parse_memo.disk_hits == 1 and from_disk == first
+
+        print(f"{name:<14}{t_parse * 1e3:>10.2f}{t_memo * 1e3:>10.2f}{t_parse / t_memo:>8.0f}x")
+        results[f"{name}_parse_ms"] = t_parse * 1e3
+        results[f"{name}_memo_ms"] = t_memo * 1e3
+
+    print(f"skip/reparse/disk checks: {'ok' if ok else 'FAIL'}")
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        compare_baseline(args.compare, results)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
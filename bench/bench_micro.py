@@ -0,0 +1,90 @@
+"""
+Micro-benchmark tiap fungsi parser/helper di api/index.py, di atas fixture (tanpa network).
+
+Soup dibangun sekali per fixture, jadi angka parser tidak termasuk waktu bangun DOM
+(itu diukur terpisah di baris make_soup).
+
+    python bench/bench_micro.py [--save base.json] [--compare base.json]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import fixtures  # noqa: E402
+from report import compare_baseline, save_baseline  # noqa: E402
+
+
+def per_call_us(fn, min_time: float) -> float:
+    n = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / n * 1e6
+        n *= 2 if elapsed < min_time / 10 else 1 + int(min_time / max(elapsed, 1e-9))
+
+
+def cases(fx):
+    soups = {name: index.make_soup(html) for name, (_, html, _) in fx.items()}
+    urls = {name: url for name, (_, _, url) in fx.items()}
+    list_cards = soups["list"].select("div.listupd article.bs, div.listupd div.bs")
+    sched_card = soups["schedule"].select_one("div.listupd article.bs, div.listupd div.bs")
+    b64 = next((o.get("value") for o in soups["episode"].select("select.mirror option") if o.get("value")), "")
+
+    for name, (kind, html, _) in fx.items():
+        yield f"make_soup[{name}]", lambda h=html: index.make_soup(h)
+        if kind in index.PAGE_STRAINERS:
+            yield f"make_soup_partial[{name}]", lambda h=html, k=kind: index.make_soup(h, kind=k)
+
+    yield "parse_card", lambda: index.parse_card(list_cards[0])
+    yield "parse_card[schedule]", lambda: index.parse_card(sched_card, is_schedule=True)
+    yield "parse_list_page[list]", lambda: index.parse_list_page(soups["list"])
+    yield "parse_list_page[search]", lambda: index.parse_list_page(soups["search"])
+    yield "parse_list_page[genre]", lambda: index.parse_list_page(soups["genre"])
+    yield "parse_schedule", lambda: index.parse_schedule(soups["schedule"])
+    yield "parse_genres", lambda: index.parse_genres(soups["genres"])
+    for name in ("series_short", "series_long"):
+        yield f"parse_series_detail[{name}]", lambda n=name: index.parse_series_detail(soups[n], urls[n])
+        yield f"parse_detail_auto[{name}]", lambda n=name: index.parse_detail_auto(soups[n], urls[n])
+    for name in ("episode", "episode_table", "episode_list"):
+        yield f"parse_episode_detail[{name}]", lambda n=name: index.parse_episode_detail(soups[n], urls[n])
+        yield f"extract_downloads[{name}]", lambda n=name: index.extract_downloads(soups[n])
+    yield "is_episode_page[series_long]", lambda: index.is_episode_page(soups["series_long"])
+    yield "decode_url", lambda: index.decode_url(b64)
+    yield "build_list_params", lambda: index.build_list_params(3, "ongoing", "", "", "update", ["action", "fantasy"])
+    yield "cache_key", lambda: index.cache_key("list", index.BASE_URL + "/anime/", {"page": 3, "genre[]": ["a", "b"]})
+    yield "extract_slug", lambda: index.extract_slug(index.BASE_URL + "/seri/battle-through-the-heavens/?x=1")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--min-time", type=float, default=0.2, help="detik minimal per fungsi")
+    ap.add_argument("--filter", default="", help="hanya fungsi yang namanya mengandung teks ini")
+    ap.add_argument("--save")
+    ap.add_argument("--compare")
+    args = ap.parse_args()
+
+    print(f"backend: {index.resolve_parser()}")
+    results = {}
+    for name, fn in cases(fixtures()):
+        if args.filter and args.filter not in name:
+            continue
+        us = per_call_us(fn, args.min_time)
+        results[f"{name}_us"] = us
+        print(f"{name:<44} {us:>12.1f} us")
+
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        compare_baseline(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Parse di proses worker (ParsePool) vs thread pool biasa: throughput parse per jumlah worker.
+
+Beban: campuran fixture episode/series/list, semua di-submit serentak dari event loop
+(kayak banyak request yang fetch-nya selesai barengan). Thread pool kena GIL, jadi cuma
+satu core; proses worker skalanya ikut jumlah core (lihat os.cpu_count() di output).
+
+Cek juga: hasil parse di worker == parse in-process, antrian penuh -> fallback in-process,
+worker diganti setelah max_tasks_per_child.
+
+    python bench/bench_parse_pool.py [--docs 200] [--workers 1,2,4]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import fixtures  # noqa: E402
+
+MIX = [("episode", "episode"), ("series_short", "series"), ("list", "list"), ("episode_table", "episode")]
+
+
+def workload(n: int):
+    fx = fixtures()
+    return [(kind, fx[name][1], fx[name][2]) for name, kind in (MIX[i % len(MIX)] for i in range(n))]
+
+
+async def run(pool, docs):
+    if pool is None:
+        return await asyncio.gather(*(index.run_parse(index.parse_page, k, h, u) for k, h, u in docs))
+    return await asyncio.gather(*(pool.parse(k, h, u) for k, h, u in docs))
+
+
+def measure(pool, docs) -> float:
+    start = time.perf_counter()
+    asyncio.run(run(pool, docs))
+    return len(docs) / (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--workers", default="", help="mis. 1,2,4 (default: 1..cpu_count, pangkat 2)")
+    args = ap.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = [int(x) for x in args.workers.split(",") if x] or sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    docs = workload(args.docs)
+    ok = True
+
+    base = measure(None, docs)
+    print(f"cpu_count {cpus}, {len(docs)} dokumen")
+    print(f"{'mode':<22}{'docs/s':>10}{'vs thread':>11}")
+    print(f"{'thread pool':<22}{base:>10.1f}{1.0:>10.2f}x")
+    for n in counts:
+        pool = index.ParsePool(workers=n, max_pending=len(docs), max_tasks_per_child=0)
+        pool.warm()
+        rps = measure(pool, docs)
+        print(f"{f'{n} proses':<22}{rps:>10.1f}{rps / base:>10.2f}x")
+        pool.shutdown()
+
+    # parity
+    pool = index.ParsePool(workers=1, max_pending=len(docs))
+    sample = docs[: len(MIX)]
+    got = asyncio.run(run(pool, sample))
+    want = [index.parse_page(k, h, u) for k, h, u in sample]
+    parity = got == want
+    print(f"parity worker vs in-process: {'ok' if parity else 'BEDA'}")
+    ok = ok and parity
+
+    # antrian penuh -> in-process
+    pool.max_pending = 2
+    asyncio.run(run(pool, docs[:20]))
+    st = pool.stats()
+    print(f"max_pending 2, 20 dokumen serentak: {st['fallback_full']} fallback in-process")
+    ok = ok and st["fallback_full"] > 0 and st["pending"] == 0
+    pool.shutdown()
+
+    # worker recycling
+    pool = index.ParsePool(workers=1, max_tasks_per_child=2)
+    pids = {pool.pool().submit(os.getpid).result() for _ in range(6)}
+    print(f"max_tasks_per_child 2, 6 task: {len(pids)} pid worker berbeda")
+    ok = ok and len(pids) >= 3
+    pool.shutdown()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
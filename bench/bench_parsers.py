@@ -0,0 +1,73 @@
+"""
+Parity + waktu parse per backend parser (html.parser sebagai referensi).
+
+Exit code != 0 kalau ada backend yang hasil JSON-nya beda.
+
+    python bench/bench_parsers.py [--repeat 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import fixtures  # noqa: E402
+
+REFERENCE = "html.parser"
+
+
+def first_card(html: str, backend: str):
+    soup = index.make_soup(html, backend)
+    el = soup.select_one("div.listupd article.bs, div.listupd div.bs")
+    return index.parse_card(el) if el else None
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    backends = [b for b in index.PARSER_BACKENDS if index.backend_available(b)]
+    missing = [b for b in index.PARSER_BACKENDS if b not in backends]
+    if missing:
+        print("not installed:", ", ".join(missing))
+
+    cases = {}
+    for name, (kind, html, url) in fixtures().items():
+        cases[name] = (lambda b, k=kind, h=html, u=url: index.parse_page(k, h, u, b))
+    _, list_html, _ = fixtures()["list"]
+    cases["parse_card"] = lambda b: first_card(list_html, b)
+
+    mismatches = []
+    print(f"{'fixture':<14}" + "".join(f"{b:>14}" for b in backends) + "   (ms, median)")
+    for name, run in cases.items():
+        expected = json.dumps(run(REFERENCE), sort_keys=True)
+        row = f"{name:<14}"
+        for b in backends:
+            if json.dumps(run(b), sort_keys=True) != expected:
+                mismatches.append((name, b))
+            row += f"{timed(lambda: run(b), args.repeat):>14.2f}"
+        print(row)
+
+    for name, b in mismatches:
+        print(f"MISMATCH {name} on {b}")
+    print("parity:", "ok" if not mismatches else f"{len(mismatches)} mismatch(es)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Full DOM vs partial parse (PAGE_STRAINERS) untuk list/search/schedule/genres:
+waktu parse, peak memory (tracemalloc), dan cek output identik.
+
+    python bench/bench_partial.py [--repeat 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import fixtures  # noqa: E402
+
+
+def parse(kind: str, html: str, url: str, partial: bool):
+    soup = index.make_soup(html, kind=kind if partial else None)
+    return index.PAGE_PARSERS[kind](soup, url)
+
+
+def measure(kind, html, url, partial, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(kind, html, url, partial)
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(kind, html, url, partial)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(samples) * 1000, peak / 1024
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    ok = True
+    print(f"backend: {index.resolve_parser()}")
+    print(f"{'page':<10}{'full ms':>9}{'part ms':>9}{'full KiB':>10}{'part KiB':>10}{'time':>8}{'mem':>8}  same")
+    for name, (kind, html, url) in fixtures().items():
+        if kind not in index.PAGE_STRAINERS:
+            continue
+        same = json.dumps(parse(kind, html, url, False)) == json.dumps(parse(kind, html, url, True))
+        ok = ok and same
+        ft, fm = measure(kind, html, url, False, args.repeat)
+        pt, pm = measure(kind, html, url, True, args.repeat)
+        print(f"{name:<10}{ft:>9.2f}{pt:>9.2f}{fm:>10.0f}{pm:>10.0f}{pt / ft - 1:>+8.0%}{pm / fm - 1:>+8.0%}  {same}")
+
+    print("output:", "identical" if ok else "DIFFERENT")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
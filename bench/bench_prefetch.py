@@ -0,0 +1,143 @@
+"""
+Prefetch prediktif: penonton pindah ke navigation.next_episode, dan dari /api/update
+halaman 1 ke series yang ada di situ. Bandingkan latency klik berikutnya tanpa / dengan
+prefetch (mock upstream lambat, link prev/next mengikuti path episode).
+
+1. episode: V penonton, masing-masing E episode berurutan dengan jeda "nonton" di antaranya.
+2. update: buka /api/update, jeda, lalu buka N series teratas.
+3. budget: budget kecil -> prefetch berhenti, sisanya dihitung skipped budget.
+4. upstream sibuk (headroom 0) -> tidak ada prefetch sama sekali.
+Plus: hit rate di /api/cache dan /metrics.
+
+    python bench/bench_prefetch.py [--viewers 8] [--episodes 4] [--latency 0.15]
+"""
+import argparse
+import asyncio
+import os
+import sys
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+from report import percentile  # noqa: E402
+
+
+def fresh(enabled: bool, **kw):
+    index.response_cache.clear()
+    index.parse_memo = index.ParseMemo()
+    index.governor = index.UpstreamGovernor()
+    index.governor.enabled = True  # headroom prefetch dihitung dari limit governor
+    index.prefetcher = index.Prefetcher(**kw)
+    index.prefetcher.enabled = enabled
+
+
+async def timed_get(client, path):
+    start = asyncio.get_running_loop().time()
+    r = await client.get(path)
+    return r, asyncio.get_running_loop().time() - start
+
+
+async def watch(client, viewer: int, episodes: int, think: float):
+    """Latency tiap klik 'next' (episode pertama tidak dihitung)."""
+    out = []
+    path = f"/api/episode?url=/viewer-{viewer}-episode-1-subtitle-indonesia/"
+    await asyncio.sleep(think * (viewer % 8) / 8)  # penonton tidak klik barengan
+    for i in range(episodes):
+        r, secs = await timed_get(client, path)
+        if i:
+            out.append(secs)
+        nxt = r.json()["navigation"]["next_episode"]["anichinUrl"]
+        path = f"/api/episode?url={urlsplit(nxt).path}"
+        await asyncio.sleep(think)
+    return out
+
+
+async def browse(client, top: int, think: float):
+    r, _ = await timed_get(client, "/api/update?page=1")
+    await asyncio.sleep(think)
+    paths = [urlsplit(c["anichinUrl"]).path for c in r.json()["data"][:top]]
+    res = await asyncio.gather(*(timed_get(client, f"/api/series?url={p}") for p in paths))
+    return [secs for _, secs in res]
+
+
+async def session(fn):
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        out = await fn(client)
+        await index.prefetcher.drain()
+        text = (await client.get("/metrics")).text
+        stats = (await client.get("/api/cache")).json()["prefetch"]
+    return out, stats, text
+
+
+def episodes_run(up, args, enabled: bool, **kw):
+    fresh(enabled, **kw)
+    up.reset()
+
+    async def fn(client):
+        res = await asyncio.gather(*(watch(client, v, args.episodes, args.think) for v in range(args.viewers)))
+        return [t for xs in res for t in xs]
+
+    times, stats, text = asyncio.run(session(fn))
+    return times, stats, text, up.hits
+
+
+def report(label, times, hits, stats):
+    print(f"{label:<16}p50 {percentile(times, 0.5) * 1000:>7.1f} ms  p95 {percentile(times, 0.95) * 1000:>7.1f} ms  "
+          f"upstream {hits:>4}  prefetch {stats['scheduled']:>3} (hit rate {stats['hit_rate']:.0%})")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--viewers", type=int, default=8)
+    ap.add_argument("--episodes", type=int, default=4)
+    ap.add_argument("--top", type=int, default=5)
+    ap.add_argument("--latency", type=float, default=0.15)
+    ap.add_argument("--think", type=float, default=1.0, help="jeda antar klik (detik)")
+    args = ap.parse_args()
+
+    index.disk_cache = None
+    checks = {}
+    with MockUpstream(latency=args.latency, episode_chain=True) as up:
+        index.BASE_URL = up.url
+
+        print("== episode berikutnya")
+        base, st, _, hits = episodes_run(up, args, False)
+        report("prefetch off", base, hits, st)
+        got, st, text, hits = episodes_run(up, args, True, budget=10000, concurrency=8)
+        report("prefetch on", got, hits, st)
+        checks["episode"] = percentile(got, 0.5) < percentile(base, 0.5) / 2 and st["hit_rate"] > 0.5
+        checks["metrics"] = "anichin_prefetch_hit_ratio" in text and 'anichin_prefetch_hits_total{kind="episode"}' in text
+
+        print("== /api/update -> series")
+        off = []
+        for enabled in (False, True):
+            fresh(enabled, budget=10000, concurrency=8)
+            up.reset()
+            times, st, _ = asyncio.run(session(lambda c: browse(c, args.top, args.think)))
+            report(f"prefetch {'on' if enabled else 'off'}", times, up.hits, st)
+            if enabled:
+                checks["update"] = percentile(times, 0.5) < percentile(off, 0.5) / 2 and st["hits"].get("series") == args.top
+            off = times
+
+        print("== budget")
+        _, st, _, _ = episodes_run(up, args, True, budget=3, concurrency=8)
+        print(f"budget 3/menit: {st['scheduled']} prefetch, skipped {st['skipped']}")
+        checks["budget"] = st["scheduled"] <= 4 and st["skipped"]["budget"] > 0  # +1 dari refill selama jalan
+
+        print("== upstream sibuk")
+        _, st, _, _ = episodes_run(up, args, True, headroom=0.0)
+        print(f"headroom 0: {st['scheduled']} prefetch, skipped {st['skipped']}")
+        checks["busy"] = st["scheduled"] == 0 and st["skipped"]["busy"] > 0
+
+    print(" ".join(f"{k}={'ok' if v else 'FAILED'}" for k, v in checks.items()))
+    sys.exit(0 if all(checks.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
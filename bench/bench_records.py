@@ -0,0 +1,114 @@
+"""
+Record ringkas (CardRecord / SeriesEpisodeRecord) vs dict hasil parser, di 100k record.
+
+1. Byte per record yang tertahan di memory (tracemalloc): tiap string dibuat ulang per
+   record seperti keluaran parser, jadi "Sub", "Ongoing", href dan anichinUrl ikut terhitung.
+2. Serialisasi: json_dumps(list dict) vs dump_records(list record) vs json_dumps(list record)
+   lewat json_default (jalur payload biasa).
+3. Parity: bytes JSON record == bytes JSON dict, dan Mapping-nya == dict aslinya.
+
+    python bench/bench_records.py [--records 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import HOST, catalog_records  # noqa: E402
+
+
+def fresh(s: str) -> str:
+    """String baru dengan isi sama (parser tidak berbagi objek string antar kartu)."""
+    return (s + ".")[:-1]
+
+
+_cards = []
+
+
+def cards(n: int):
+    if len(_cards) < n:
+        _cards[:] = [rec["card"] for rec in catalog_records(n).values()]
+    for card in _cards[:n]:
+        yield {k: fresh(v) for k, v in card.items()}
+
+
+def episodes(n: int):
+    for i in range(n):
+        slug = f"series-{i // 500}-episode-{i % 500 + 1}-subtitle-indonesia"
+        yield {
+            "episode": f"{i % 500 + 1} Episode {i % 500 + 1}",
+            "slug": slug,
+            "href": f"/donghua/episode/{slug}",
+            "anichinUrl": f"{HOST}/{slug}/",
+        }
+
+
+def retained(build) -> float:
+    """Byte yang tertahan oleh hasil build() (diukur setelah sampah sementara dibuang)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        obj = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    del obj
+    return size
+
+
+def best_ms(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(name, make, record_cls, n: int) -> bool:
+    for _ in make(n):  # data sumber disiapkan di luar pengukuran
+        pass
+    dict_bytes = retained(lambda: list(make(n)))
+    rec_bytes = retained(lambda: index.compact_items(list(make(n)), record_cls))
+    dicts = list(make(n))
+    recs = index.compact_items(dicts, record_cls)
+    compacted = sum(isinstance(r, index.CompactRecord) for r in recs)
+
+    t_dict = best_ms(lambda: index.json_dumps(dicts))
+    t_bulk = best_ms(lambda: index.dump_records(recs))
+    t_default = best_ms(lambda: index.json_dumps(recs))
+
+    parity = (
+        index.dump_records(recs) == index.json_dumps(dicts) == index.json_dumps(recs)
+        and all(r == d and dict(r) == d for r, d in zip(recs[:1000], dicts))
+    )
+    print(f"== {name} ({n} record, {compacted} diringkas)")
+    print(f"{'':<26}{'B/record':>10}{'ms total':>10}")
+    print(f"{'dict':<26}{dict_bytes / n:>10.0f}{t_dict:>10.1f}")
+    print(f"{'record + dump_records':<26}{rec_bytes / n:>10.0f}{t_bulk:>10.1f}")
+    print(f"{'record + json_default':<26}{'':>10}{t_default:>10.1f}")
+    print(f"memory {rec_bytes / dict_bytes:.0%} dari dict, serialisasi {t_bulk / t_dict:.2f}x, "
+          f"parity {'ok' if parity else 'BEDA'}")
+    return parity and compacted == n and rec_bytes < dict_bytes
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=100000)
+    args = ap.parse_args()
+
+    ok = run("kartu", cards, index.CardRecord, args.records)
+    ok = run("episodes_list series", episodes, index.SeriesEpisodeRecord, args.records) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+SearchIndex lokal di atas katalog sintetis besar: waktu build, latency query
+(exact, prefix/autocomplete, salah ketik), dan cek hasil yang diharapkan ikut ketemu.
+
+    python bench/bench_search.py [--docs 30000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import catalog_records  # noqa: E402
+from report import compare_baseline, percentile, save_baseline  # noqa: E402
+
+
+def typo(word: str, rng: random.Random) -> str:
+    i = rng.randrange(len(word) - 1)
+    op = rng.choice(("swap", "drop", "replace"))
+    if op == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if op == "drop":
+        return word[:i] + word[i + 1:]
+    return word[:i] + ("x" if word[i] != "x" else "z") + word[i + 1:]
+
+
+def queries(records, n: int, rng: random.Random):
+    """(jenis, query, slug yang harus ada di hasil)"""
+    slugs = list(records)
+    for _ in range(n):
+        slug = rng.choice(slugs)
+        words = records[slug]["card"]["title"].lower().split()[:-2]
+        kind = rng.choice(("exact", "prefix", "typo"))
+        if kind == "exact":
+            yield kind, " ".join(words), slug
+        elif kind == "prefix":
+            yield kind, " ".join(words[:-1] + [words[-1][: max(2, len(words[-1]) // 2)]]), slug
+        else:
+            w = max(words, key=len)
+            if len(w) < index.SEARCH_TYPO_MIN_LEN + 1:
+                continue
+            yield kind, " ".join(typo(x, rng) if x is w else x for x in words), slug
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=30000)
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--limit", type=int, default=24)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--save")
+    ap.add_argument("--compare")
+    args = ap.parse_args()
+
+    records = catalog_records(args.docs)
+    idx = index.SearchIndex()
+    start = time.perf_counter()
+    idx.rebuild(records)
+    build = time.perf_counter() - start
+    print(f"build: {len(idx)} docs in {build:.2f}s {idx.stats()}")
+
+    rng = random.Random(args.seed)
+    lat = {"exact": [], "prefix": [], "typo": []}
+    found = {k: 0 for k in lat}
+    for kind, q, slug in queries(records, args.queries, rng):
+        t = time.perf_counter()
+        res = idx.search(q, args.limit)
+        lat[kind].append(time.perf_counter() - t)
+        # query pendek bisa cocok ke lebih dari `limit` judul; cukup cek yang spesifik
+        if any(c["slug"] == slug for c in res) or len(res) == args.limit:
+            found[kind] += 1
+
+    results = {"build_s": build}
+    print(f"{'query':<8}{'n':>6}{'found':>8}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}")
+    ok = True
+    for kind, xs in lat.items():
+        p50, p95, p99 = (percentile(xs, q) * 1e6 for q in (0.5, 0.95, 0.99))
+        rate = found[kind] / max(len(xs), 1)
+        ok = ok and rate >= 0.99
+        print(f"{kind:<8}{len(xs):>6}{rate:>8.1%}{p50:>10.0f}{p95:>10.0f}{p99:>10.0f}")
+        results.update({f"{kind}_p50_us": p50, f"{kind}_p99_us": p99})
+
+    # update inkremental: ganti judul satu series, index harus langsung ikut
+    slug = next(iter(records))
+    rec = records[slug]
+    idx.add(slug, dict(rec["card"], title="Zzyzx Unique Renamed"), rec["detail"])
+    ok = ok and [c["slug"] for c in idx.search("zzyzx uniq")] == [slug]
+    idx.add(slug, rec["card"], rec["detail"])
+    ok = ok and idx.search("zzyzx") == [] and "zzyzx" not in idx.deletes.get("zzyz", ())
+    print(f"incremental update: {'ok' if ok else 'FAIL'}")
+
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        compare_baseline(args.compare, results)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Instrumentasi per tahap: header Server-Timing + /metrics (Prometheus).
+
+1. Rata-rata tiap tahap (fetch/soup/parse-*/downloads/serialize/compress) per route dari
+   header Server-Timing, request cold (cache dimatikan) di atas mock upstream.
+2. Cek /metrics: histogram latency per route, status upstream, cache lookup/hit ratio ada.
+3. Overhead: throughput dengan instrumentasi nyala vs mati.
+
+    python bench/bench_timing.py [--requests 300] [--latency 0.01]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+
+PATHS = [
+    "/api/episode?url=/donghua-episode-{n}/",
+    "/api/series?url=/seri/series-{n}/",
+    "/api/update?page={n}",
+    "/api/genres/action?page={n}",
+]
+EXPECTED = [
+    "anichin_request_duration_seconds_bucket",
+    "anichin_stage_duration_seconds_bucket",
+    "anichin_upstream_responses_total",
+    "anichin_cache_lookups_total",
+    "anichin_cache_hit_ratio",
+]
+
+
+def parse_server_timing(value: str) -> dict:
+    out = {}
+    for part in value.split(","):
+        name, *params = part.strip().split(";")
+        for p in params:
+            if p.startswith("dur="):
+                out[name] = float(p[4:])
+    return out
+
+
+async def run(n: int, concurrency: int):
+    stages = defaultdict(lambda: defaultdict(list))
+    queue = asyncio.Queue()
+    for i in range(n):
+        tmpl = PATHS[i % len(PATHS)]
+        queue.put_nowait((tmpl.split("?")[0], tmpl.format(n=i)))
+
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            while True:
+                try:
+                    name, path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                r = await client.get(path)
+                for stage, ms in parse_server_timing(r.headers.get("server-timing", "")).items():
+                    stages[name][stage].append(ms)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        text = (await client.get("/metrics")).text if index.METRICS_ENABLED else ""
+    return stages, n / elapsed, text
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--latency", type=float, default=0.01)
+    args = ap.parse_args()
+
+    index.response_cache.max_entries = 0
+    index.disk_cache = None
+    index.PARSE_MEMO = False
+
+    ok = True
+    with MockUpstream(latency=args.latency) as up:
+        index.BASE_URL = up.url
+        stages, rps_on, text = asyncio.run(run(args.requests, args.concurrency))
+
+        print(f"{'route':<20}{'stage':<16}{'avg ms':>10}")
+        for route in sorted(stages):
+            for stage, xs in sorted(stages[route].items(), key=lambda kv: -sum(kv[1])):
+                print(f"{route:<20}{stage:<16}{sum(xs) / len(xs):>10.2f}")
+        for route in ("/api/episode", "/api/series"):
+            if "fetch" not in stages[route] or f"parse-{route.rsplit('/', 1)[1]}" not in stages[route]:
+                ok = False
+                print(f"{route}: fetch/parse tidak ada di Server-Timing")
+
+        missing = [name for name in EXPECTED if name not in text]
+        print(f"/metrics: {len(text.splitlines())} baris, kurang: {missing or '-'}")
+        ok = ok and not missing
+
+        index.SERVER_TIMING = index.METRICS_ENABLED = False
+        _, rps_off, _ = asyncio.run(run(args.requests, args.concurrency))
+
+    print(f"throughput: {rps_on:.1f} req/s instrumented, {rps_off:.1f} req/s tanpa "
+          f"({rps_on / rps_off - 1:+.1%})")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Halaman HTML tiruan (markup tema anichin.moe) buat benchmark & parity check.
+
+Semua generator deterministik, jadi output parser bisa dibandingkan antar run.
+
+Rekaman halaman asli (bench/fixtures/, dibuat bench/record.py) TIDAK ikut di repo: selama
+belum direkam, semua angka benchmark dan cek parity (termasuk tests/) cuma dari halaman
+tiruan di sini.
+"""
+import base64
+import json
+import os
+import random
+
+HOST = "https://anichin.moe"
+
+GENRES = [
+    "action", "adventure", "comedy", "cultivation", "drama", "fantasy", "historical",
+    "martial-arts", "mystery", "reincarnation", "romance", "sci-fi", "supernatural",
+]
+STATUSES = ["Ongoing", "Completed"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+PROVIDERS = ["Mirrored", "Terabox", "Gdrive", "Mega", "Pixeldrain"]
+RESOLUTIONS = ["360p", "480p", "720p", "1080p"]
+
+
+def _title(rng: random.Random, i: int) -> str:
+    words = ["Battle", "Through", "Heavens", "Soul", "Land", "Martial", "Peak", "Renegade",
+             "Immortal", "Swallowed", "Star", "Perfect", "World", "Legend", "Sword", "Domain"]
+    return " ".join(rng.choice(words) for _ in range(rng.randint(2, 4))) + f" {i}"
+
+
+def _slug(title: str) -> str:
+    return title.lower().replace(" ", "-")
+
+
+def _head(title: str) -> str:
+    return (
+        "<!DOCTYPE html><html lang='id'><head><meta charset='UTF-8'>"
+        f"<title>{title} - Anichin</title>"
+        "<link rel='stylesheet' href='/wp-content/themes/animestream/style.css'>"
+        "<script>var _nonce='a81f0c2e9b';window.dataLayer=window.dataLayer||[];"
+        "function gtag(){dataLayer.push(arguments);}gtag('js',new Date());</script>"
+        "</head><body class='home blog darkmode'>"
+        "<div class='th'><div class='centernav bound'><div class='logox'>"
+        f"<a href='{HOST}/'><img src='{HOST}/logo.png' alt='Anichin'></a></div>"
+        "<nav id='main-menu'><ul>"
+        + "".join(f"<li><a href='{HOST}/genres/{g}/'>{g.title()}</a></li>" for g in GENRES[:6])
+        + "</ul></nav></div></div><div id='content'><div class='wrapper'>"
+    )
+
+
+def _sidebar(rng: random.Random) -> str:
+    items = "".join(
+        f"<li><div class='imgseries'><a class='series' href='{HOST}/seri/{_slug(t)}/'>"
+        f"<img src='{HOST}/img/side-{i}.jpg'></a></div><div class='leftseries'><h2>"
+        f"<a class='series' href='{HOST}/seri/{_slug(t)}/'>{t}</a></h2>"
+        f"<span><b>Genres</b>: <a href='{HOST}/genres/action/'>Action</a></span></div></li>"
+        for i, t in ((i, _title(rng, 900 + i)) for i in range(10))
+    )
+    return (
+        "<div id='sidebar'><div class='section'><div class='releases'><h3>Popular Series</h3></div>"
+        f"<div class='serieslist pop'><ul>{items}</ul></div></div></div>"
+    )
+
+
+def _foot() -> str:
+    return (
+        "</div></div><div id='comments' class='comments-area'>"
+        + "".join(
+            f"<div class='comment'><p>Komentar nomor {i}, mantap min lanjut episode berikutnya!</p></div>"
+            for i in range(30)
+        )
+        + "</div><div id='footer'><div class='footercopyright'>Anichin &copy; 2026</div></div>"
+        "<script src='/wp-includes/js/jquery/jquery.min.js'></script>"
+        "<script>(function(){var ads=document.querySelectorAll('.ads');for(var i=0;i<ads.length;i++)"
+        "{ads[i].style.display='block';}})();</script></body></html>"
+    )
+
+
+def _card(rng: random.Random, i: int, schedule: bool = False) -> str:
+    t = _title(rng, i)
+    slug = _slug(t)
+    extra = f"<div class='time'>at {rng.randint(0, 23):02d}:{rng.choice([0, 15, 30, 45]):02d}</div>" if schedule else ""
+    return (
+        "<article class='bs' itemscope='itemscope'><div class='bsx'>"
+        f"<a href='{HOST}/seri/{slug}/' itemprop='url' title='{t}' class='tip' rel='{1000 + i}'>"
+        "<div class='limit'><div class='typez Donghua'>Donghua</div>"
+        "<div class='ply'><i class='far fa-play-circle'></i></div>"
+        f"<div class='bt'><div class='epx'>Ep {rng.randint(1, 250)}</div><span class='sb Sub'>Sub</span></div>"
+        f"<div class='status'>{rng.choice(STATUSES)}</div>"
+        f"<img src='{HOST}/wp-content/uploads/{slug}.jpg' class='ts-post-image' loading='lazy' alt='{t}'>"
+        f"</div><div class='tt'>{t}<h2 itemprop='headline'>{t}</h2></div>"
+        f"<div class='numscore'>{rng.randint(60, 95) / 10:.1f}</div></a>{extra}</div></article>"
+    )
+
+
+def _list_body(rng: random.Random, n: int, heading: str) -> str:
+    cards = "".join(_card(rng, i) for i in range(n))
+    return (
+        f"<div class='postbody'><div class='bixbox'><div class='releases'><h1>{heading}</h1></div>"
+        f"<div class='listupd'>{cards}</div>"
+        "<div class='hpage'><a class='r' href='?page=2'>Next</a></div></div></div>"
+    )
+
+
+def list_page(n: int = 24, seed: int = 1) -> str:
+    rng = random.Random(seed)
+    return _head("Anime List") + _list_body(rng, n, "Latest Update") + _sidebar(rng) + _foot()
+
+
+def search_page(n: int = 10, seed: int = 2) -> str:
+    rng = random.Random(seed)
+    return _head("Search") + _list_body(rng, n, "Search Results") + _sidebar(rng) + _foot()
+
+
+def schedule_page(per_day: int = 8, seed: int = 3) -> str:
+    rng = random.Random(seed)
+    boxes = "".join(
+        f"<div class='bixbox schedulepage sch_{d.lower()}'><div class='releases'><h3><span>{d}</span></h3></div>"
+        "<div class='listupd'>"
+        + "".join(_card(rng, di * 100 + i, schedule=True) for i in range(per_day))
+        + "</div></div>"
+        for di, d in enumerate(DAYS)
+    )
+    return _head("Schedule") + f"<div class='postbody'>{boxes}</div>" + _sidebar(rng) + _foot()
+
+
+def genres_page(seed: int = 4) -> str:
+    rng = random.Random(seed)
+    items = "".join(
+        f"<li><input class='genre-item' type='checkbox' id='genre-{g}' name='genre[]' value='{g}'>"
+        f"<label for='genre-{g}'>{g.replace('-', ' ').title()}</label></li>"
+        for g in GENRES
+    )
+    form = (
+        "<div class='quickfilter'><form class='filters' action='/anime/' method='get'>"
+        f"<div class='filter dropdown'><button type='button'>Genre</button><ul class='dropdown-menu c4'>{items}</ul></div>"
+        "<div class='filter dropdown'><ul><li><input type='radio' name='status' value='ongoing' id='st-ongoing'>"
+        "<label for='st-ongoing'>Ongoing</label></li></ul></div></form></div>"
+    )
+    return _head("Anime") + form + _list_body(rng, 24, "Anime") + _sidebar(rng) + _foot()
+
+
+def series_page(episodes: int = 12, seed: int = 5) -> str:
+    rng = random.Random(seed)
+    t = _title(rng, 0)
+    slug = _slug(t)
+    info = "".join(
+        f"<span><b>{k}:</b> {v}</span>"
+        for k, v in [
+            ("Status", rng.choice(STATUSES)), ("Network", "Tencent Video"), ("Studio", "Motion Magic"),
+            ("Released", "2020"), ("Duration", "20 min. per ep."), ("Country", "China"), ("Type", "ONA"),
+            ("Episodes", str(episodes)), ("Fansub", "Anichin"), ("Posted by", "admin"),
+            ("Released on", "Jan 1, 2020"), ("Updated on", "Oct 1, 2026"),
+        ]
+    )
+    genres = "".join(f"<a href='{HOST}/genres/{g}/' rel='tag'>{g.replace('-', ' ').title()}</a>" for g in rng.sample(GENRES, 4))
+    synopsis = "".join(
+        f"<p>Paragraf sinopsis {i}: Setelah kehilangan segalanya, sang pendekar muda memulai perjalanan panjang "
+        "untuk menembus batas kultivasi dan melindungi orang-orang yang ia sayangi dari sekte jahat.</p>"
+        for i in range(3)
+    )
+    eps = "".join(
+        f"<li data-index='{i}'><a href='{HOST}/{slug}-episode-{n}-subtitle-indonesia/'>"
+        f"<div class='epl-num'>{n}</div><div class='epl-title'>{t} Episode {n}</div>"
+        "<div class='epl-sub'><span class='status Sub'>Sub</span></div>"
+        f"<div class='epl-date'>Oct {1 + i % 28}, 2026</div></a></li>"
+        for i, n in enumerate(range(episodes, 0, -1))
+    )
+    return (
+        _head(t)
+        + "<div class='postbody'><article id='post-1' class='hentry'><div class='bixbox animefull'>"
+        f"<div class='bigcontent'><div class='thumbook'><div class='thumb'><img src='{HOST}/img/{slug}.jpg' alt='{t}'></div></div>"
+        f"<div class='infox'><h1 class='entry-title'>{t}</h1><div class='ninfo'>"
+        f"<div class='seriestitl'><span class='alter'>{t} Alternative, 斗破苍穹</span></div>"
+        f"<div class='info-content'><div class='spe'>{info}</div><div class='genxed'>{genres}</div></div>"
+        "</div></div></div></div>"
+        f"<div class='bixbox synp'><div class='releases'><h2>Synopsis {t}</h2></div>"
+        f"<div class='entry-content' itemprop='description'>{synopsis}</div></div>"
+        f"<div class='bixbox bxcl epcheck'><div class='releases'><h2>Watch {t}</h2></div>"
+        f"<div class='eplister'><ul>{eps}</ul></div></div></article></div>"
+        + _sidebar(rng)
+        + _foot()
+    )
+
+
+def _embed(src: str) -> str:
+    raw = f'<iframe src="{src}" frameborder="0" allowfullscreen></iframe>'
+    return base64.b64encode(raw.encode()).decode()
+
+
+def _downloads(slug: str, ep: int, layout: str) -> str:
+    def links(r):
+        return " ".join(
+            f"<a href='https://{p.lower()}.example/{slug}-{ep}-{r}' target='_blank'>{p}</a>" for p in PROVIDERS
+        )
+
+    if layout == "table":
+        rows = "".join(f"<tr><td class='reso'>{r}</td><td>{links(r)}</td></tr>" for r in RESOLUTIONS)
+        return f"<div class='content'><table><tbody>{rows}</tbody></table></div>"
+    if layout == "list":
+        rows = "".join(f"<li><strong>MP4 {r}</strong> {links(r)}</li>" for r in RESOLUTIONS)
+        return f"<ul>{rows}</ul>"
+    return "".join(
+        f"<div class='soraurl'><div class='res'>{r}</div><div class='slink'>{links(r)}</div></div>"
+        for r in RESOLUTIONS
+    )
+
+
+def episode_page(sidebar_eps: int = 24, seed: int = 6, layout: str = "soraurl", depth: int = 0, blocks: int = 1) -> str:
+    """
+    layout: markup blok download ("soraurl", "table", "list")
+    depth: jumlah div pembungkus tambahan di sekitar blok download
+    blocks: jumlah blok download (rilis batch)
+    """
+    rng = random.Random(seed)
+    t = _title(rng, 0)
+    slug = _slug(t)
+    ep = rng.randint(10, 200)
+    options = "<option value=''>Pilih Server Video</option>" + "".join(
+        f"<option value='{_embed(f'https://player{i}.example/embed/{slug}-{ep}')}' data-index='{i}'>Server {i} {r}</option>"
+        for i, r in enumerate(["720p", "1080p", "480p", "360p"])
+    )
+    dl_blocks = "".join(
+        f"<div class='soraddl dlone'><div class='sorattl'><h3>Download {t} Episode {ep + b}</h3></div>"
+        f"{_downloads(slug, ep + b, layout)}</div>"
+        for b in range(blocks)
+    )
+    dl_blocks = "<div class='wrap'>" * depth + dl_blocks + "</div>" * depth
+    side = "".join(
+        f"<li><a href='{HOST}/{slug}-episode-{n}-subtitle-indonesia/'><div class='lpl_title'>{t} Episode {n}</div>"
+        f"<span class='lpl_date'>Oct {1 + n % 28}</span></a></li>"
+        for n in range(sidebar_eps, 0, -1)
+    )
+    return (
+        _head(f"{t} Episode {ep}")
+        + "<div class='postbody'><article class='post hentry'><div class='megavid'><div class='mvelement'>"
+        f"<div class='item meta'><h1 class='entry-title'>{t} Episode {ep} Subtitle Indonesia</h1></div>"
+        "<div class='video-content'><div id='embed_holder'><div class='player-embed' id='pembed'>"
+        f"<iframe src='https://player0.example/embed/{slug}-{ep}' frameborder='0'></iframe></div></div></div>"
+        f"<div class='item video-nav'><div class='mobius'><select class='mirror' name='mirror'>{options}</select></div></div>"
+        "<div class='naveps bignav'>"
+        f"<div class='nvs'><a href='{HOST}/{slug}-episode-{ep - 1}-subtitle-indonesia/' rel='prev'>Prev</a></div>"
+        f"<div class='nvs nvsc'><a href='{HOST}/seri/{slug}/'>All Episodes</a></div>"
+        f"<div class='nvs'><a href='{HOST}/{slug}-episode-{ep + 1}-subtitle-indonesia/' rel='next'>Next</a></div>"
+        "</div></div></div>"
+        "<div class='bixbox mctn'><div class='releases'><h3>Download</h3></div><div class='mctnx'>"
+        f"{dl_blocks}"
+        "</div></div>"
+        f"<div class='bixbox lpl'><div class='releases'><h3>Episode List</h3></div><ul>{side}</ul></div>"
+        "</article></div>"
+        + _sidebar(rng)
+        + _foot()
+    )
+
+
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+SYLLABLES = ["bai", "lian", "cheng", "shen", "dou", "po", "cang", "qiong", "wan", "jie", "xian", "ni",
+             "tian", "long", "wu", "dao", "zun", "mo", "jian", "lai", "xing", "chen", "yu", "feng"]
+STUDIOS = ["Sparkly Key", "Original Force", "BUILD DREAM", "Wonder Cat", "Motion Magic", "Ruo Hong"]
+TYPES = ["ONA", "TV", "Movie", "Special"]
+
+
+def catalog_records(n: int = 30000, seed: int = 11) -> dict:
+    """
+    slug -> record katalog sintetis (bentuk sama dengan Catalog.records) buat bench index lokal.
+    Kosakata judul dibangun dari suku kata supaya token-nya beragam kayak katalog asli.
+    """
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3))).title() for _ in range(10000)]
+    out = {}
+    for i in range(n):
+        title = " ".join(rng.choice(words) for _ in range(rng.randint(2, 4))) + f" Season {rng.randint(1, 5)}"
+        slug = f"{_slug(title)}-{i}"
+        card = {
+            "title": title,
+            "slug": slug,
+            "poster": f"{HOST}/wp-content/uploads/{slug}.jpg",
+            "status": rng.choice(STATUSES),
+            "type": "Donghua",
+            "rating": f"{rng.uniform(5, 9.9):.2f}",
+            "sub": "Sub",
+            "href": f"/donghua/detail/{slug}",
+            "anichinUrl": f"{HOST}/seri/{slug}/",
+            "current_episode": f"Ep {rng.randint(1, 300)}",
+        }
+        detail = {
+            "alt_title": " ".join(rng.choice(words) for _ in range(rng.randint(1, 3))),
+            "status": card["status"],
+            "type": rng.choice(TYPES),
+            "studio": rng.choice(STUDIOS),
+            "network": "-",
+            "released": str(rng.randint(2010, 2026)),
+            "genres": rng.sample(GENRES, rng.randint(1, 4)),
+        }
+        out[slug] = {"card": card, "detail": detail, "seq": float(n - i), "added": float(i),
+                     "changed_at": 0.0, "detail_at": 1.0}
+    return out
+
+
+def synthetic_fixtures() -> dict:
+    """name -> (kind, html, url)"""
+    return {
+        "list": ("list", list_page(), f"{HOST}/anime/"),
+        "search": ("search", search_page(), f"{HOST}/"),
+        "genre": ("list", list_page(seed=10), f"{HOST}/anime/"),
+        "schedule": ("schedule", schedule_page(), f"{HOST}/schedule/"),
+        "genres": ("genres", genres_page(), f"{HOST}/anime/"),
+        "series_short": ("series", series_page(12), f"{HOST}/seri/short/"),
+        "series_long": ("series", series_page(520, seed=7), f"{HOST}/seri/long/"),
+        "episode": ("episode", episode_page(), f"{HOST}/some-episode-12-subtitle-indonesia/"),
+        "episode_table": ("episode", episode_page(layout="table", seed=8), f"{HOST}/table-episode-3/"),
+        "episode_list": ("episode", episode_page(layout="list", seed=9), f"{HOST}/list-episode-4/"),
+    }
+
+
+def recorded_fixtures() -> dict:
+    """Halaman asli hasil bench/record.py (bench/fixtures/manifest.json), kalau ada."""
+    manifest = os.path.join(RECORDED_DIR, "manifest.json")
+    if not os.path.exists(manifest):
+        return {}
+    with open(manifest, encoding="utf-8") as f:
+        entries = json.load(f)
+    out = {}
+    for name, meta in entries.items():
+        path = os.path.join(RECORDED_DIR, f"{name}.html")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                out[name] = (meta["kind"], f.read(), meta["url"])
+    return out
+
+
+def fixtures(source: str | None = None) -> dict:
+    """
+    name -> (kind, html, url)
+
+    source: "synthetic", "recorded", atau None (recorded menimpa synthetic dengan nama sama).
+    ANICHIN_BENCH_FIXTURES bisa dipakai buat set default-nya.
+    """
+    source = source or os.environ.get("ANICHIN_BENCH_FIXTURES", "")
+    if source == "synthetic":
+        return synthetic_fixtures()
+    if source == "recorded":
+        recorded = recorded_fixtures()
+        if not recorded:
+            raise RuntimeError(f"belum ada rekaman di {RECORDED_DIR}, jalankan bench/record.py dulu")
+        return recorded
+    out = synthetic_fixtures()
+    out.update(recorded_fixtures())
+    return out
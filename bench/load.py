@@ -0,0 +1,120 @@
+"""
+End-to-end load harness: FastAPI `app` (in-process, lewat ASGI transport) di atas mock upstream.
+
+Laporan: throughput, p50/p95/p99 latency per route & total, error, hit ke upstream.
+
+    python bench/load.py --requests 2000 --concurrency 64 --latency 0.05 --jitter 0.05
+    python bench/load.py --no-cache --save base.json
+    python bench/load.py --no-cache --compare base.json
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx  # noqa: E402
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+from report import compare_baseline, percentile, save_baseline  # noqa: E402
+
+# route -> bobot (kira-kira pola trafik client)
+ROUTES = {
+    "/api/update?page={n}": 30,
+    "/api/episode?url=/donghua-episode-{n}/": 25,
+    "/api/series?url=/seri/series-{n}/": 15,
+    "/api/schedule": 10,
+    "/api/search?s=q{n}": 10,
+    "/api/genres": 5,
+    "/api/list?genre[]=action&page={n}": 5,
+}
+
+
+def pick_route(rng: random.Random, keys: int):
+    tmpl = rng.choices(list(ROUTES), weights=list(ROUTES.values()))[0]
+    return tmpl.split("?")[0], tmpl.format(n=rng.randint(1, keys))
+
+
+async def run(args):
+    rng = random.Random(args.seed)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(pick_route(rng, args.keys))
+
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            while True:
+                try:
+                    name, path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                try:
+                    r = await client.get(path)
+                    ok = r.status_code < 500
+                except Exception:
+                    ok = False
+                latencies[name].append(time.perf_counter() - start)
+                if not ok:
+                    errors[name] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=1000)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--keys", type=int, default=20, help="jumlah url berbeda per route")
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--jitter", type=float, default=0.05)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--no-cache", action="store_true", help="matikan response cache (memory + disk)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--save")
+    ap.add_argument("--compare")
+    args = ap.parse_args()
+
+    if args.no_cache:
+        index.response_cache.max_entries = 0
+        index.disk_cache = None
+
+    with MockUpstream(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed) as up:
+        index.BASE_URL = up.url
+        latencies, errors, elapsed = asyncio.run(run(args))
+
+    total = [x for xs in latencies.values() for x in xs]
+    results = {"total_rps": len(total) / elapsed}
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {elapsed:.2f}s, "
+          f"upstream hits {up.hits} ({up.errors} injected errors)")
+    print(f"{'route':<16}{'n':>6}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name in sorted(latencies) + ["total"]:
+        xs = total if name == "total" else latencies[name]
+        err = sum(errors.values()) if name == "total" else errors[name]
+        p50, p95, p99 = (percentile(xs, q) * 1000 for q in (0.5, 0.95, 0.99))
+        print(f"{name:<16}{len(xs):>6}{err:>6}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+        results.update({f"{name}_p50_ms": p50, f"{name}_p95_ms": p95, f"{name}_p99_ms": p99})
+    print(f"throughput: {results['total_rps']:.1f} req/s")
+
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare:
+        compare_baseline(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
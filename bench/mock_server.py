@@ -0,0 +1,288 @@
+"""
+Local stand-in for anichin.moe, dipakai benchmark biar nggak nembak situs aslinya.
+
+Route-nya ngikutin situs: /anime/ (list, genre filter), /schedule/, /?s= (search),
+/seri/<slug>/ (series), selain itu episode. Isi halaman dari bench/fixtures.py.
+
+    with MockUpstream(latency=0.2, jitter=0.1, error_rate=0.05) as up:
+        print(up.url)   # http://127.0.0.1:<port>
+        up.latency = 2.0  # semua atribut boleh diubah saat jalan (skenario upstream melambat)
+
+    python bench/mock_server.py --port 8765 --latency 0.2 --jitter 0.1 --error-rate 0.05
+"""
+import hashlib
+import os
+import random
+import re
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from fixtures import fixtures
+
+EPISODE_PATH_RE = re.compile(r"^/(.+)-episode-(\d+)-subtitle-indonesia/$")
+NAV_LINK_RE = re.compile(r"""href=(["'])[^"']*\1 rel=(["'])(prev|next)\2""")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        # koneksi baru: jeda handshake (RTT TCP+TLS) lalu handshake TLS-nya sendiri di thread ini
+        up = self.server.upstream
+        up.count_connection()
+        if up.connect_latency:
+            time.sleep(up.connect_latency)
+        if isinstance(self.request, ssl.SSLSocket):
+            self.request.do_handshake()
+        super().setup()
+
+    def do_GET(self):
+        up = self.server.upstream
+        up.hit(self.path)
+        try:
+            wait = up.next_delay()
+            if wait:
+                time.sleep(wait)
+            status, html = up.respond(self.path)
+        finally:
+            up.leave()
+        body = html.encode("utf-8")
+        etag = up.etag(body) if status == 200 else None
+        if etag and etag == self.headers.get("If-None-Match"):
+            up.count_not_modified()
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Mon, 05 Oct 2026 10:00:00 GMT")
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            return  # client batal (mis. hedged request yang kalah)
+        up.count_bytes(len(body))
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # default 5: burst koneksi baru ketahan di backlog, bukan di mock
+
+
+class MockUpstream:
+    def __init__(
+        self,
+        page: str | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        delay: float = 0.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        validators: bool = False,
+        slow_rate: float = 0.0,
+        slow_latency: float = 0.0,
+        episode_chain: bool = False,
+        tls: bool = False,
+        connect_latency: float = 0.0,
+    ):
+        """
+        page: kalau diisi, semua path balikin halaman ini (tanpa routing)
+        latency/delay: jeda dasar per request (detik); jitter: tambahan acak 0..jitter
+        error_rate: peluang balikin 503
+        gone (atribut): path yang dijawab 404 (halaman dihapus)
+        slow_rate/slow_latency: peluang satu request kena tambahan jeda slow_latency (ekor latency)
+        validators: kirim ETag/Last-Modified dan jawab If-None-Match yang cocok dengan 304
+        episode_chain: link prev/next halaman /<slug>-episode-<n>-subtitle-indonesia/ menunjuk
+            ke episode n-1/n+1 dari path itu (bukan link tetap di fixture)
+        tls: layani HTTPS dengan sertifikat self-signed (openssl); CA-nya di `cafile`
+        connect_latency: jeda sekali per koneksi baru (RTT handshake TCP/TLS), bukan per request
+        """
+        self.page = page
+        self.latency = latency or delay
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.validators = validators
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.episode_chain = episode_chain
+        self.connect_latency = connect_latency
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.hits = 0
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self.errors = 0
+        self.paths = []
+        self.gone = set()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._pages = {name: html for name, (_, html, _) in fixtures().items()}
+        self._server = _Server((host, port), _Handler)
+        self._server.upstream = self
+        self._thread = None
+        self.cafile = None
+        if tls:
+            self.cafile, keyfile = self._self_signed(host)
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ctx.load_cert_chain(self.cafile, keyfile)
+            self._server.socket = ctx.wrap_socket(self._server.socket, server_side=True, do_handshake_on_connect=False)
+
+    @staticmethod
+    def _self_signed(host: str):
+        tmp = tempfile.mkdtemp(prefix="mock-tls-")
+        cert, key = os.path.join(tmp, "cert.pem"), os.path.join(tmp, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", f"/CN={host}",
+             "-addext", f"subjectAltName=IP:{host}", "-keyout", key, "-out", cert],
+            check=True, capture_output=True,
+        )
+        return cert, key
+
+    @property
+    def delay(self) -> float:
+        return self.latency
+
+    @delay.setter
+    def delay(self, v: float):
+        self.latency = v
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"{'https' if self.cafile else 'http'}://{host}:{port}"
+
+    def count_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def hit(self, path: str):
+        with self._lock:
+            self.hits += 1
+            self.paths.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def next_delay(self) -> float:
+        with self._lock:
+            wait = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            if self.slow_rate and self._rng.random() < self.slow_rate:
+                wait += self.slow_latency
+            return wait
+
+    def etag(self, body: bytes):
+        if not self.validators:
+            return None
+        return '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+    def count_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def count_bytes(self, n: int):
+        with self._lock:
+            self.bytes_sent += n
+
+    def respond(self, path: str):
+        with self._lock:
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if fail:
+            return 503, "<html><body>Service Unavailable</body></html>"
+        if urlsplit(path).path in self.gone:
+            return 404, "<html><body>Not Found</body></html>"
+        return 200, self.render(path)
+
+    def render(self, path: str) -> str:
+        if self.page is not None:
+            return self.page
+        parts = urlsplit(path)
+        q = parse_qs(parts.query, keep_blank_values=True)
+        p = parts.path
+        if p.startswith("/anime"):
+            if "genre[]" in q:
+                return self._pages["genre"]
+            if "order" in q and not q["order"][0] and "type" not in q:
+                return self._pages["genres"]  # /api/genres (GENRES_PARAMS): ?status=&order=
+            return self._pages["list"]
+        if p.startswith("/schedule"):
+            return self._pages["schedule"]
+        if "s" in q:
+            return self._pages["search"]
+        if p.startswith("/seri/"):
+            return self._pages["series_long" if "long" in p else "series_short"]
+        m = EPISODE_PATH_RE.match(p) if self.episode_chain else None
+        if m:
+            def nav(link):
+                n = int(m.group(2)) + (1 if link.group(3) == "next" else -1)
+                return f"href='{self.url}/{m.group(1)}-episode-{n}-subtitle-indonesia/' rel='{link.group(3)}'"
+
+            return NAV_LINK_RE.sub(nav, self._pages["episode"])
+        return self._pages["episode"]
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.errors = 0
+            self.not_modified = 0
+            self.bytes_sent = 0
+            self.connections = 0
+            self.max_in_flight = self.in_flight
+            self.paths = []
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--validators", action="store_true", help="ETag/Last-Modified + 304")
+    args = ap.parse_args()
+
+    srv = MockUpstream(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        validators=args.validators,
+    )
+    print(f"mock upstream on {srv.url}  (set ANICHIN_BASE_URL={srv.url} on the API)")
+    srv._server.serve_forever()
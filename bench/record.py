@@ -0,0 +1,79 @@
+"""
+Rekam halaman asli anichin.moe ke bench/fixtures/ (sekali saja, lalu semua benchmark offline).
+
+    python bench/record.py --series-long https://anichin.moe/seri/<judul-500-episode>/
+
+Series pendek & episode diambil otomatis dari halaman update kalau tidak diisi.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import index  # noqa: E402
+from fixtures import RECORDED_DIR  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--query", default="soul")
+    ap.add_argument("--genre", default="action")
+    ap.add_argument("--series-short")
+    ap.add_argument("--series-long")
+    ap.add_argument("--episode")
+    args = ap.parse_args()
+
+    base = index.BASE_URL
+    targets = {
+        "list": ("list", f"{base}/anime/", index.build_list_params(1, "", "", "", "update", None)),
+        "search": ("search", base, {"s": args.query}),
+        "genre": ("list", f"{base}/anime/", index.build_list_params(1, "", "", "", "", [args.genre])),
+        "schedule": ("schedule", f"{base}/schedule/", None),
+        "genres": ("genres", f"{base}/anime/", index.GENRES_PARAMS),
+    }
+
+    os.makedirs(RECORDED_DIR, exist_ok=True)
+    manifest = {}
+
+    def save(name, kind, url, params=None):
+        html = index.fetch_html(url, params=params)
+        if html is None:
+            print(f"skip {name}: gagal fetch {url}")
+            return None
+        with open(os.path.join(RECORDED_DIR, f"{name}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+        manifest[name] = {"kind": kind, "url": url}
+        print(f"{name:<14} {len(html):>9} bytes  {url}")
+        return html
+
+    for name, (kind, url, params) in targets.items():
+        save(name, kind, url, params)
+
+    series_short = args.series_short
+    if not series_short and "list" in manifest:
+        with open(os.path.join(RECORDED_DIR, "list.html"), encoding="utf-8") as f:
+            cards = index.parse_list_page(index.make_soup(f.read()))
+        series_short = cards[0]["anichinUrl"] if cards else None
+
+    episode = args.episode
+    for name, url in (("series_short", series_short), ("series_long", args.series_long)):
+        if not url:
+            print(f"skip {name}: url tidak diisi")
+            continue
+        html = save(name, "series", url)
+        if html and not episode:
+            eps = index.parse_series_detail(index.make_soup(html), url)["episodes_list"]
+            episode = eps[0]["anichinUrl"] if eps else None
+
+    if episode:
+        save("episode", "episode", episode)
+
+    with open(os.path.join(RECORDED_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Helper kecil buat benchmark: percentil, simpan baseline, bandingkan dengan baseline."""
+import json
+
+
+def percentile(samples, q: float) -> float:
+    if not samples:
+        return 0.0
+    xs = sorted(samples)
+    k = (len(xs) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(xs) - 1)
+    return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+
+def save_baseline(path: str, results: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    print(f"baseline saved to {path}")
+
+
+def compare_baseline(path: str, results: dict):
+    """
+    Print perubahan tiap metrik numerik vs baseline (flat dict: nama -> angka).
+    Metrik berakhiran "_rps" makin besar makin bagus, sisanya makin kecil makin bagus.
+    """
+    with open(path, encoding="utf-8") as f:
+        base = json.load(f)
+    print(f"\nvs baseline {path}:")
+    for key, val in results.items():
+        old = base.get(key)
+        if not isinstance(val, (int, float)) or not isinstance(old, (int, float)) or not old:
+            continue
+        delta = val / old - 1
+        better = delta > 0 if key.endswith("_rps") else delta < 0
+        mark = "" if abs(delta) < 0.05 else ("  better" if better else "  WORSE")
+        print(f"  {key:<44} {old:>12.3f} -> {val:>12.3f}  {delta:>+7.1%}{mark}")
+
+
+def regressions(path: str, results: dict, tolerance: float) -> list:
+    """Metrik yang lebih buruk dari baseline lebih dari `tolerance` (0.25 = 25%); buat guard CI."""
+    with open(path, encoding="utf-8") as f:
+        base = json.load(f)
+    out = []
+    for key, val in results.items():
+        old = base.get(key)
+        if not isinstance(val, (int, float)) or not isinstance(old, (int, float)) or not old:
+            continue
+        worse = val < old * (1 - tolerance) if key.endswith("_rps") else val > old * (1 + tolerance)
+        if worse:
+            out.append(key)
+    return out
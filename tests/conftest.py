@@ -0,0 +1,48 @@
+"""
+Fixture bersama: api/index.py dan mock upstream dari bench/ di sys.path, state global
+index (cache, memo, governor, breaker) dibuat baru per test, disk cache mati.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "api"))
+sys.path.insert(0, os.path.join(ROOT, "bench"))
+
+import httpx  # noqa: E402
+
+import index  # noqa: E402
+from mock_server import MockUpstream  # noqa: E402
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    monkeypatch.setattr(index, "response_cache", index.ResponseCache())
+    monkeypatch.setattr(index, "parse_memo", index.ParseMemo())
+    monkeypatch.setattr(index, "upstream_validators", index.UpstreamValidators())
+    monkeypatch.setattr(index, "flights", index.SingleFlight())
+    monkeypatch.setattr(index, "governor", index.UpstreamGovernor())
+    monkeypatch.setattr(index, "breaker", index.CircuitBreaker())
+    monkeypatch.setattr(index, "disk_cache", None)
+    return index
+
+
+@pytest.fixture
+def upstream(fresh, monkeypatch):
+    with MockUpstream() as up:
+        monkeypatch.setattr(index, "BASE_URL", up.url)
+        yield up
+
+
+def get_all(paths):
+    """GET semua path serentak lewat app (ASGI, tanpa server), return list respons."""
+
+    async def run():
+        transport = httpx.ASGITransport(app=index.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            return await asyncio.gather(*(client.get(p) for p in paths))
+
+    return asyncio.run(run())
@@ -0,0 +1,86 @@
+"""Circuit breaker: open setelah error beruntun, upstream tidak dihajar, probe -> closed."""
+import time
+
+from tests.conftest import get_all, index
+
+
+def test_state_machine():
+    brk = index.CircuitBreaker(window=4, min_calls=4, threshold=0.5, cooldown=0.05)
+    brk.enabled = True
+    for _ in range(4):
+        assert brk.allow()
+        brk.record(False)
+    assert brk.state == "open" and not brk.allow()
+    time.sleep(0.06)
+    assert brk.allow() and brk.state == "half_open"
+    assert not brk.allow()  # cuma satu probe
+    brk.record(False)
+    assert brk.state == "open"
+    time.sleep(0.06)
+    assert brk.allow()
+    brk.record(True)
+    assert brk.state == "closed" and brk.allow()
+
+
+def test_outage_and_recovery(upstream, monkeypatch):
+    brk = index.CircuitBreaker(window=10, min_calls=10, threshold=0.5, cooldown=0.3)
+    brk.enabled = True
+    monkeypatch.setattr(index, "breaker", brk)
+    warm = [f"/api/episode?url=/warm-{i}-episode-1/" for i in range(5)]
+    cold = [f"/api/episode?url=/cold-{i}-episode-1/" for i in range(20)]
+    assert {r.status_code for r in get_all(warm)} == {200}
+
+    index.response_cache.clear()  # cuma hasil parse terakhir yang tersisa
+    upstream.error_rate = 1.0
+    upstream.reset()
+    for _ in range(2):
+        res = get_all(cold)
+    assert brk.state == "open" and brk.opens == 1
+    assert upstream.hits < 2 * len(cold)
+    assert {r.status_code for r in res} == {503}
+    assert int(res[0].headers["retry-after"]) >= 1
+    # halaman yang pernah diparse tetap dijawab selama open
+    assert {r.status_code for r in get_all(warm)} == {200}
+
+    upstream.error_rate = 0.0
+    time.sleep(brk.cooldown + 0.05)
+    assert get_all(cold[:1])[0].status_code == 200
+    assert brk.state == "closed"
+
+
+def test_off_host_urls_do_not_open(upstream, monkeypatch):
+    brk = index.CircuitBreaker(window=10, min_calls=10, threshold=0.5, cooldown=30)
+    brk.enabled = True
+    monkeypatch.setattr(index, "breaker", brk)
+    bogus = [f"/api/series?url=http://127.0.0.1:1/bogus-{i}/" for i in range(12)]
+    bogus += [f"/api/episode?url=//127.0.0.1:1/bogus-{i}/" for i in range(12)]
+    assert {r.status_code for r in get_all(bogus)} == {400}
+    # fetch langsung ke host lain (mis. link dari halaman) juga tidak dihitung
+    for i in range(12):
+        assert index.fetch_html(f"http://127.0.0.1:1/direct-{i}/") is index.UPSTREAM_FAILED
+    assert brk.state == "closed" and not brk._outcomes
+    assert get_all(["/api/update?page=1"])[0].status_code == 200
+    assert upstream.hits == 1
+
+
+def test_404_is_not_answered_from_last_parse(upstream):
+    path = "/api/episode?url=/deleted-episode-1/"
+    assert get_all([path])[0].status_code == 200
+    index.response_cache.clear()
+    upstream.gone.add("/deleted-episode-1/")
+    assert get_all([path])[0].status_code == 404
+    assert index.breaker.fallbacks == 0
+
+
+def test_last_parse_has_max_age(upstream, monkeypatch):
+    path = "/api/episode?url=/old-episode-1/"
+    assert get_all([path])[0].status_code == 200
+    index.response_cache.clear()
+    upstream.error_rate = 1.0
+    assert get_all([path])[0].status_code == 200  # masih muda: dijawab dari hasil terakhir
+    assert index.breaker.fallbacks == 1
+
+    index.response_cache.clear()
+    monkeypatch.setattr(index, "LAST_KNOWN_MAX_AGE", 0.0)
+    assert get_all([path])[0].status_code == 404
+    assert index.breaker.fallbacks == 1
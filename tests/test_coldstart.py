@@ -0,0 +1,26 @@
+"""
+Guard cold start: bench/bench_coldstart.py (proses Python baru per run) harus lolos batas absolut
+dan tidak lebih lambat dari baseline yang di-commit lebih dari toleransi. Baseline diukur di satu
+mesin; di runner yang jauh lebih lambat naikkan ANICHIN_COLDSTART_TOLERANCE atau simpan ulang
+baseline-nya (python bench/bench_coldstart.py --save bench/baselines/coldstart.json).
+"""
+import os
+import subprocess
+import sys
+
+from tests.conftest import ROOT
+
+BASELINE = os.path.join(ROOT, "bench", "baselines", "coldstart.json")
+
+
+def test_coldstart_within_baseline():
+    cmd = [
+        sys.executable, os.path.join(ROOT, "bench", "bench_coldstart.py"),
+        "--runs", "3",
+        "--compare", BASELINE,
+        "--tolerance", os.environ.get("ANICHIN_COLDSTART_TOLERANCE", "1.0"),
+        "--max-import-ms", "1500",
+        "--max-first-ms", "1000",
+    ]
+    res = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, timeout=600)
+    assert res.returncode == 0, res.stdout + res.stderr
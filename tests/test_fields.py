@@ -0,0 +1,16 @@
+"""fields=: proyeksi disimpan di kuncinya sendiri, request yang sama memakai objek (dan bytes) yang sama."""
+from tests.conftest import get_all, index
+
+
+def test_repeated_fields_reuse_projection(upstream, monkeypatch):
+    encoded = index.EncodedCache()
+    monkeypatch.setattr(index, "encoded_cache", encoded)
+    full = "/api/series?url=/seri/a/"
+    assert get_all([full])[0].status_code == 200
+    before = len(encoded._data)
+    res = [get_all([full + "&fields=episodes_list"])[0] for _ in range(50)]
+    assert {r.status_code for r in res} == {200}
+    assert len({r.content for r in res}) == 1
+    assert len(encoded._data) == before + 1
+    assert encoded.hits == 49
+    assert upstream.hits == 1
@@ -0,0 +1,39 @@
+"""Upstream governor: tidak menolak di latency normal, yang ditolak dijawab 503 (bukan 404)."""
+from tests.conftest import get_all, index
+
+
+def test_normal_latency_not_shed(upstream, monkeypatch):
+    # upstream normal 1.5 s +- 0.8 s, 150 request cold serentak, governor nyala dengan default
+    upstream.latency, upstream.jitter = 0.7, 1.6
+    monkeypatch.setattr(index.governor, "enabled", True)
+    res = get_all([f"/api/episode?url=/cold-{i}-episode-1/" for i in range(150)])
+    assert [r.status_code for r in res] == [200] * 150
+    assert index.governor.shed == 0
+    assert upstream.hits == 150
+
+
+def test_shed_is_503(upstream, monkeypatch):
+    upstream.latency = 0.3
+    gov = index.UpstreamGovernor(initial=1, lo=1, hi=1, queue_timeout=0.05)
+    gov.enabled = True
+    monkeypatch.setattr(index, "governor", gov)
+    res = get_all([f"/api/episode?url=/busy-{i}-episode-1/" for i in range(4)])
+    codes = sorted(r.status_code for r in res)
+    assert codes == [200, 503, 503, 503]
+    busy = [r for r in res if r.status_code == 503]
+    assert all(r.headers["retry-after"] == "1" for r in busy)
+    assert upstream.hits == 1 and gov.shed == 3
+
+
+def test_shed_uses_last_parse(upstream, monkeypatch):
+    # halaman yang pernah diparse tetap dijawab dari hasil terakhir walau cache-nya lewat
+    path = "/api/episode?url=/seen-episode-1/"
+    assert get_all([path])[0].status_code == 200
+    index.response_cache.clear()
+    gov = index.UpstreamGovernor(initial=1, lo=1, hi=1, queue_timeout=0.05)
+    gov.enabled = True
+    gov.in_flight = 1  # slot satu-satunya sedang dipakai
+    monkeypatch.setattr(index, "governor", gov)
+    r = get_all([path])[0]
+    assert r.status_code == 200 and gov.shed == 1
+    assert upstream.hits == 1
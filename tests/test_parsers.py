@@ -0,0 +1,34 @@
+"""Semua backend parser yang terpasang menghasilkan JSON yang sama dengan html.parser."""
+import json
+
+import pytest
+
+from fixtures import fixtures
+from tests.conftest import index
+
+REFERENCE = "html.parser"
+BACKENDS = [b for b in index.PARSER_BACKENDS if b != REFERENCE and index.backend_available(b)]
+FIXTURES = fixtures()
+
+
+def dump(data) -> str:
+    return json.dumps(data, sort_keys=True, default=index.json_default)
+
+
+@pytest.mark.skipif(not BACKENDS, reason="cuma html.parser yang terpasang")
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_backend_parity(name, backend):
+    kind, html, url = FIXTURES[name]
+    assert dump(index.parse_page(kind, html, url, backend)) == dump(index.parse_page(kind, html, url, REFERENCE))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_card_parity(backend):
+    _, html, _ = FIXTURES["list"]
+
+    def first_card(b):
+        el = index.make_soup(html, b).select_one("div.listupd article.bs, div.listupd div.bs")
+        return index.parse_card(el)
+
+    assert first_card(backend) == first_card(REFERENCE)
@@ -0,0 +1,70 @@
+"""?pages=lo-hi: lebih dari RANGE_MAX_PAGES ditolak 400, bukan dipotong diam-diam."""
+import json
+
+from tests.conftest import get_all, index
+
+
+def test_range_over_limit_is_400(upstream):
+    r = get_all([f"/api/update?pages=1-{index.RANGE_MAX_PAGES + 1}"])[0]
+    assert r.status_code == 400
+    assert str(index.RANGE_MAX_PAGES) in r.json()["detail"]
+    assert upstream.hits == 0
+
+
+def test_range_within_limit(upstream):
+    r = get_all(["/api/update?pages=2-4"])[0]
+    assert r.status_code == 200
+    pages = {line.split(b'"page":')[1].split(b",")[0] for line in r.content.splitlines()}
+    assert pages == {b"2", b"3", b"4"}
+
+
+def lines(r):
+    return [json.loads(line) for line in r.content.splitlines()]
+
+
+def fail_page(monkeypatch, page: int, fail):
+    orig = index.scrape_async
+
+    async def flaky(kind, url, params=None, fields=None):
+        if params and str(params.get("page")) == str(page):
+            return fail()
+        return await orig(kind, url, params, fields)
+
+    monkeypatch.setattr(index, "scrape_async", flaky)
+
+
+def test_range_all_failed_is_not_empty_200(upstream):
+    upstream.error_rate = 1.0
+    r = get_all(["/api/update?pages=1-5"])[0]
+    assert r.status_code == 502
+    assert "list 1" in r.json()["detail"]
+
+
+def test_range_failed_page_mid_stream(upstream, monkeypatch):
+    fail_page(monkeypatch, 3, lambda: None)
+    r = get_all(["/api/update?pages=2-5"])[0]
+    assert r.status_code == 200
+    rows = lines(r)
+    assert {row["page"] for row in rows[:-1]} == {2}
+    assert rows[-1] == {"page": 3, "status": "error", "error": "Gagal akses halaman dari upstream"}
+
+
+def test_range_busy_mid_stream(upstream, monkeypatch):
+    def busy():
+        raise index.UpstreamBusy(3)
+
+    fail_page(monkeypatch, 3, busy)
+    r = get_all(["/api/update?pages=2-5"])[0]
+    assert r.status_code == 200
+    rows = lines(r)
+    assert {row["page"] for row in rows[:-1]} == {2}
+    assert rows[-1] == {"page": 3, "status": "error", "error": "Upstream sedang sibuk, coba lagi nanti"}
+
+
+def test_range_busy_first_page_is_503(upstream, monkeypatch):
+    def busy():
+        raise index.UpstreamBusy(3)
+
+    fail_page(monkeypatch, 2, busy)
+    r = get_all(["/api/update?pages=2-5"])[0]
+    assert r.status_code == 503 and r.headers["retry-after"] == "3"
@@ -0,0 +1,44 @@
+"""Search lokal: query luas (> SEARCH_MAX_CANDIDATES kandidat) tetap mengambil yang skornya terbaik."""
+from tests.conftest import index
+
+
+def card(title: str, rating: str):
+    slug = title.lower().replace(" ", "-")
+    return slug, {"title": title, "slug": slug, "rating": rating}
+
+
+def broad_index():
+    idx = index.SearchIndex()
+    for i in range(300):
+        slug, c = card(f"Martial Legend {i} Chronicles", "7.0")
+        idx.add(slug, c)
+    slug, c = card("Martial", "9.9")
+    idx.add(slug, c)
+    return idx
+
+
+def test_broad_query_keeps_best_match():
+    idx = broad_index()
+    assert len(idx.docs) > index.SEARCH_MAX_CANDIDATES
+    for q in ("martial", "mart", "Martial"):
+        assert idx.search(q, 5)[0]["title"] == "Martial"
+
+
+def test_broad_query_prefers_title_over_other_fields():
+    idx = broad_index()
+    for i in range(200):
+        slug, c = card(f"Sword Saga {i}", "9.5")
+        idx.add(slug, c, {"alt_title": "Martial Arts"})
+    got = idx.search("martial", 24)
+    assert got[0]["title"] == "Martial"
+    assert all(c["title"].startswith("Martial") for c in got)
+
+
+def test_broad_query_after_update():
+    # judul/rating berubah: bitmap ranks lama ikut dibuang
+    idx = broad_index()
+    idx.add("martial", {"title": "Martial Gods", "slug": "martial", "rating": "3.0"})
+    assert idx.rating_buckets == [7.0, 3.0]
+    assert ("title", "gods") in idx.ranks and ("rating", 9.9) not in idx.ranks
+    assert idx.search("martial gods", 1)[0]["title"] == "Martial Gods"
+    assert idx.search("martial", 1)[0]["title"] == "Martial Legend 0 Chronicles"
@@ -0,0 +1,46 @@
+"""N caller serentak untuk satu URL -> satu hit ke upstream (sync, async, dan lintas fields=)."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.conftest import index
+
+CALLERS = 50
+
+
+def test_sync_callers_share_one_fetch(upstream):
+    upstream.latency = 0.2
+    url = upstream.url + "/anime/"
+    with ThreadPoolExecutor(max_workers=CALLERS) as ex:
+        results = list(ex.map(lambda _: index.scrape("list", url, {"order": "update"}), range(CALLERS)))
+    assert upstream.hits == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_async_callers_share_one_fetch(upstream):
+    upstream.latency = 0.2
+    url = upstream.url + "/some-episode-1/"
+
+    async def run():
+        return await asyncio.gather(*(index.scrape_async("episode", url) for _ in range(CALLERS)))
+
+    results = asyncio.run(run())
+    assert upstream.hits == 1
+    assert results[0] and all(r is results[0] for r in results)
+
+
+def test_fields_variants_share_one_fetch(upstream):
+    upstream.latency = 0.2
+    url = upstream.url + "/seri/x/"
+    specs = ["title", "poster", "info", None]
+
+    async def run():
+        return await asyncio.gather(
+            *(index.scrape_async("series", url, fields=index.parse_fields(s, "series")) for s in specs)
+        )
+
+    results = asyncio.run(run())
+    assert upstream.hits == 1
+    full = results[-1]
+    for spec, got in zip(specs, results):
+        if spec:
+            assert got == index.project_fields(full, index.parse_fields(spec, "series"))